@@ -3,42 +3,107 @@ IMU Analyzer main entry point
 """
 
 import sys
-import argparse
+import signal
+import socket
 import logging
 import traceback
 from pathlib import Path
+from types import SimpleNamespace
 from PyQt6.QtWidgets import QApplication, QMessageBox
-from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import QTimer, QSocketNotifier
 from src.core.engine import Engine
 from src.core.config_loader import ConfigLoader
 from src.utils.logger import setup_logger
 
 
-def parse_arguments():
+USAGE = """usage: main.py [-h] [-c CONFIG] [--debug] [--version]
+
+IMU Analyzer Application
+
+options:
+  -h, --help            show this help message and exit
+  -c CONFIG, --config CONFIG
+                        Path to configuration directory
+  --debug               Enable debug mode
+  --version             show program's version number and exit
+"""
+
+
+def parse_arguments(argv=None):
     """
     Parse command line arguments
     
+    Chỉ có vài cờ nên duyệt sys.argv trực tiếp thay vì dựng ArgumentParser.
+    
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
+    
     Returns:
-        argparse.Namespace: Parsed arguments
+        SimpleNamespace: Parsed arguments (config, debug)
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    args = SimpleNamespace(config="config", debug=False)
+
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ('-h', '--help'):
+            print(USAGE, end="")
+            sys.exit(0)
+        elif arg == '--version':
+            print('IMU Analyzer 1.0.0')
+            sys.exit(0)
+        elif arg == '--debug':
+            args.debug = True
+        elif arg in ('-c', '--config'):
+            if i + 1 >= len(argv):
+                print(USAGE.splitlines()[0], file=sys.stderr)
+                print(f"main.py: error: argument {arg}: expected one argument", file=sys.stderr)
+                sys.exit(2)
+            i += 1
+            args.config = argv[i]
+        elif arg.startswith('--config='):
+            args.config = arg.split('=', 1)[1]
+        else:
+            print(USAGE.splitlines()[0], file=sys.stderr)
+            print(f"main.py: error: unrecognized arguments: {arg}", file=sys.stderr)
+            sys.exit(2)
+        i += 1
+
+    return args
+
+
+def install_sigint_handler(app):
     """
-    parser = argparse.ArgumentParser(description="IMU Analyzer Application")
-    parser.add_argument(
-        '-c', '--config',
-        type=str,
-        default="config",
-        help='Path to configuration directory'
-    )
-    parser.add_argument(
-        '--debug',
-        action='store_true',
-        help='Enable debug mode'
-    )
-    parser.add_argument(
-        '--version',
-        action='version',
-        version='IMU Analyzer 1.0.0'
-    )
-    return parser.parse_args()
+    Quit the Qt event loop promptly on Ctrl+C.
+    
+    Khi app.exec() đang chạy, Python chỉ xử lý tín hiệu khi có code Python được gọi.
+    Ghi tín hiệu vào một socketpair qua signal.set_wakeup_fd để QSocketNotifier
+    đánh thức event loop ngay lập tức thay vì chờ sự kiện kế tiếp.
+    
+    Args:
+        app: QApplication instance
+    """
+    if not hasattr(signal, 'SIGINT') or not hasattr(signal, 'set_wakeup_fd'):
+        return
+
+    signal.signal(signal.SIGINT, lambda signum, frame: app.quit())
+
+    try:
+        read_sock, write_sock = socket.socketpair()
+        read_sock.setblocking(False)
+        write_sock.setblocking(False)
+        signal.set_wakeup_fd(write_sock.fileno())
+    except (OSError, ValueError) as e:
+        logging.debug(f"Could not install signal wakeup fd: {str(e)}")
+        return
+
+    notifier = QSocketNotifier(read_sock.fileno(), QSocketNotifier.Type.Read, app)
+    # Đọc hết dữ liệu đánh thức; handler Python chạy ngay sau khi slot này được gọi
+    notifier.activated.connect(lambda *args: read_sock.recv(64))
+    # Giữ tham chiếu để socket không bị thu hồi khi app còn chạy
+    app._sigint_wakeup = (read_sock, write_sock, notifier)
 
 
 def show_error_message(parent, message):
@@ -58,6 +123,7 @@ def main():
     Main entry point of the IMU Analyzer application
     """
     app = QApplication(sys.argv)
+    install_sigint_handler(app)
     engine = None # Khởi tạo engine là None
     main_window = None # Khởi tạo main_window là None
 
@@ -115,18 +115,8 @@ class Engine:
         ]
         
         # In thông tin debug về các đường dẫn
+        # (PluginManager.discover_plugins tự kiểm tra và liệt kê từng thư mục, không quét lại ở đây)
         self.logger.info(f"Project root: {project_root}")
-        for p_dir in plugin_dirs:
-            if os.path.exists(p_dir):
-                self.logger.info(f"Plugin directory exists: {p_dir}")
-                # Liệt kê các tệp trong thư mục
-                try:
-                    files = os.listdir(p_dir)
-                    self.logger.info(f"  Files: {files}")
-                except Exception as e:
-                    self.logger.error(f"  Error listing files: {str(e)}")
-            else:
-                self.logger.warning(f"Plugin directory does not exist: {p_dir}")
         
         # Khởi tạo plugin manager
         self.plugin_manager = PluginManager(plugin_dirs)
@@ -200,15 +190,11 @@ class Engine:
 
             # Kiểm tra MainWindow đã được tạo chưa trước khi tiếp tục
             if self.main_window:
-                self.logger.debug("Setting up dashboard...")
-                self.main_window.setup_dashboard()
-                self.logger.debug("Dashboard setup called.")
-
-                # Kết nối DataBridge SAU KHI dashboard đã setup
+                # Dashboard được MainWindow dựng sau khi cửa sổ hiển thị (_deferred_init);
+                # DataBridge được kết nối ở đó, SAU KHI dashboard đã setup
                 if self.data_bridge:
-                    self.logger.debug("Connecting DataBridge to UI...")
-                    self.data_bridge.connect_to_ui(self.main_window)
-                    self.logger.debug("DataBridge connected.")
+                    self.main_window.set_data_bridge(self.data_bridge)
+                    self.logger.debug("DataBridge will connect once the dashboard is built.")
                 else:
                     self.logger.warning("DataBridge is None, cannot connect to UI.")
 
@@ -421,12 +407,8 @@ class Engine:
         """
         try:
             # Tìm pipeline liên quan đến sensor_id
-            pipeline_id = None
-            for p_id, pipeline in self.pipelines.items():
-                if hasattr(pipeline, 'config') and 'id' in pipeline.config:
-                    if pipeline.config['id'] == sensor_id:
-                        pipeline_id = p_id
-                        break
+            # self.pipelines được đánh khóa theo config['id'], tra trực tiếp thay vì duyệt tuyến tính
+            pipeline_id = sensor_id if sensor_id in self.pipelines else None
             
             if not pipeline_id:
                 # Không tìm thấy pipeline cụ thể, sử dụng pipeline đầu tiên
@@ -437,16 +419,10 @@ class Engine:
                     self.logger.error(f"Không có pipeline nào để cấu hình cảm biến {sensor_id}")
                     return
             
-            # Lấy thông tin configurator từ pipeline config
-            pipeline_config = self.config.get("pipelines", [])
-            configurator_config = None
-            configurator_type = None
-            
-            for p_config in pipeline_config:
-                if p_config.get("id") == pipeline_id and "configurator" in p_config:
-                    configurator_config = p_config["configurator"]
-                    configurator_type = configurator_config.get("type")
-                    break
+            # Lấy thông tin configurator từ config của chính pipeline đó
+            pipeline_config = getattr(self.pipelines[pipeline_id], 'config', None) or {}
+            configurator_config = pipeline_config.get("configurator")
+            configurator_type = configurator_config.get("type") if configurator_config else None
             
             if not configurator_type:
                 self.logger.error(f"Không tìm thấy loại configurator trong pipeline {pipeline_id}")
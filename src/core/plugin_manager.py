@@ -80,36 +80,42 @@ class PluginManager:
                     
                 self.logger.info(f"Directory {plugin_dir} identified as {plugin_type} plugin type")
                     
-                # Quét tất cả các file Python trong thư mục
-                for file_name in os.listdir(plugin_dir):
-                    if file_name.endswith('.py') and not file_name.startswith('__'):
-                        plugin_path = os.path.join(plugin_dir, file_name)
-                        self.logger.info(f"Found plugin file: {plugin_path}")
+                # Quét tất cả các file Python trong thư mục (một lần scandir, không stat lại từng file)
+                with os.scandir(plugin_dir) as entries:
+                    plugin_entries = sorted(
+                        (entry for entry in entries
+                         if entry.is_file() and entry.name.endswith('.py') and not entry.name.startswith('__')),
+                        key=lambda entry: entry.name
+                    )
+                for entry in plugin_entries:
+                    file_name = entry.name
+                    plugin_path = entry.path
+                    self.logger.info(f"Found plugin file: {plugin_path}")
+                    
+                    # Thử tải module để tìm lớp plugin
+                    try:
+                        # Tạo tên module
+                        module_name = f"{plugin_type}.{file_name[:-3]}"
                         
-                        # Thử tải module để tìm lớp plugin
-                        try:
-                            # Tạo tên module
-                            module_name = f"{plugin_type}.{file_name[:-3]}"
-                            
-                            # Tải module
-                            spec = importlib.util.spec_from_file_location(module_name, plugin_path)
-                            module = importlib.util.module_from_spec(spec)
-                            spec.loader.exec_module(module)
-                            
-                            # Tìm các lớp plugin trong module
-                            base_class_name = self.base_classes.get(plugin_type)
-                            found_plugins = self._find_plugin_classes(module, base_class_name)
+                        # Tải module
+                        spec = importlib.util.spec_from_file_location(module_name, plugin_path)
+                        module = importlib.util.module_from_spec(spec)
+                        spec.loader.exec_module(module)
+                        
+                        # Tìm các lớp plugin trong module
+                        base_class_name = self.base_classes.get(plugin_type)
+                        found_plugins = self._find_plugin_classes(module, base_class_name)
+                        
+                        for plugin_class_name, plugin_class in found_plugins:
+                            self.plugins[plugin_type][plugin_class_name] = {
+                                'file_path': plugin_path,
+                                'module': module,
+                                'class': plugin_class
+                            }
+                            self.logger.info(f"Discovered {plugin_type} plugin: {plugin_class_name}")
                             
-                            for plugin_class_name, plugin_class in found_plugins:
-                                self.plugins[plugin_type][plugin_class_name] = {
-                                    'file_path': plugin_path,
-                                    'module': module,
-                                    'class': plugin_class
-                                }
-                                self.logger.info(f"Discovered {plugin_type} plugin: {plugin_class_name}")
-                                
-                        except Exception as e:
-                            self.logger.error(f"Error loading plugin from {plugin_path}: {str(e)}")
+                    except Exception as e:
+                        self.logger.error(f"Error loading plugin from {plugin_path}: {str(e)}")
                             
             except Exception as e:
                 self.logger.error(f"Error scanning directory {plugin_dir}: {str(e)}")
@@ -6,22 +6,28 @@
 Classes to implement:
 - SensorData: Raw data from sensors
 - ProcessedData: Processed data from raw sensor data
+- ProcessedDataBatch: Columnar batch of processed data (one array per field)
 - AnalysisResult: Results from data analysis
 """
 
+import sys
 import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional, Union
-import numpy as np
+from typing import ClassVar, Dict, List, Any, Optional, Union
 
+# dataclass(slots=True) chỉ có từ Python 3.10; bản cũ hơn giữ __dict__ như trước
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class SensorData:
     """
     Container for raw sensor data.
     
     Represents the raw, unprocessed data coming directly from sensors.
-    Includes timestamp and sensor metadata.
+    Includes timestamp and sensor metadata. Instances use __slots__ (no
+    per-instance __dict__), so only the declared fields can be set.
     """
     # Unique ID for this data point
     id: str = field(default_factory=lambda: f"data_{time.time()}")
@@ -111,6 +117,30 @@ class ProcessedData:
     # Processing metadata (e.g., filter settings used)
     processing_metadata: Dict[str, Any] = field(default_factory=dict)
     
+    def reset(self):
+        """
+        Restore default values, with a new id and timestamp, so the object can be
+        filled again instead of allocating a new one.
+        
+        Attributes set outside the declared fields (e.g. by a decoder field
+        mapping) are removed.
+        """
+        now = time.time()
+        self.id = f"proc_{now}"
+        self.sensor_data_id = ""
+        self.sensor_id = ""
+        self.timestamp = now
+        self.roll = self.pitch = self.yaw = 0.0
+        self.accel_x = self.accel_y = self.accel_z = 0.0
+        self.gyro_x = self.gyro_y = self.gyro_z = 0.0
+        self.mag_x = self.mag_y = self.mag_z = 0.0
+        self.additional_values.clear()
+        self.processing_metadata.clear()
+        
+        extra = self.__dict__.keys() - self.__dataclass_fields__.keys()
+        for name in extra:
+            delattr(self, name)
+    
     def __str__(self):
         """String representation of processed data"""
         return (f"ProcessedData(id={self.id}, sensor_id={self.sensor_id}, "
@@ -148,6 +178,73 @@ class ProcessedData:
         }
 
 
+def _to_serializable(value):
+    """
+    Convert nested result values to plain dicts and lists for serialization.
+    
+    Objects with a to_dict() method (e.g. per-field anomaly records) are
+    converted through it.
+    
+    Args:
+        value: Value from AnalysisResult.results
+        
+    Returns:
+        The value with dicts, lists and to_dict() objects converted
+    """
+    if isinstance(value, dict):
+        return {key: _to_serializable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_to_serializable(item) for item in value)
+    to_dict = getattr(value, "to_dict", None)
+    return to_dict() if callable(to_dict) else value
+
+
+def _empty_array():
+    """Empty numpy array; numpy is imported here so importing the models does not load it"""
+    import numpy
+    return numpy.empty(0)
+
+
+@dataclass
+class ProcessedDataBatch:
+    """
+    Columnar container for a batch of processed data.
+    
+    Holds one numpy array per field instead of one ProcessedData object per
+    sample, so batch stages (filters, FFT, plotting) can work on whole arrays.
+    """
+    # Sensor identification
+    sensor_id: str = ""
+    
+    # Timestamps of the samples (seconds since epoch), a numpy array
+    timestamps: Any = field(default_factory=lambda: _empty_array())
+    
+    # Field name (ProcessedData attribute name) -> numpy array with one value per sample.
+    # Numeric fields are float64, fields with non-numeric values are object arrays.
+    values: Dict[str, Any] = field(default_factory=dict)
+    
+    def __len__(self):
+        """Number of samples in the batch"""
+        return len(self.timestamps)
+    
+    def to_processed_data(self) -> List[ProcessedData]:
+        """Convert to one ProcessedData object per sample"""
+        results = [ProcessedData(sensor_id=self.sensor_id, timestamp=timestamp)
+                   for timestamp in self.timestamps.tolist()]
+        for name, column in self.values.items():
+            for result, value in zip(results, column.tolist()):
+                setattr(result, name, value)
+        return results
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for serialization"""
+        return {
+            "sensor_id": self.sensor_id,
+            "timestamps": self.timestamps.tolist(),
+            "values": {name: column.tolist() for name, column in self.values.items()}
+        }
+
+
 @dataclass
 class AnalysisResult:
     """
@@ -183,6 +280,44 @@ class AnalysisResult:
     # Analysis metadata (e.g., model version, parameters)
     analysis_metadata: Dict[str, Any] = field(default_factory=dict)
     
+    # Free-list các đối tượng đã release() để rent() dùng lại (không phải field của dataclass)
+    _pool: ClassVar[deque] = deque(maxlen=256)
+    
+    @classmethod
+    def rent(cls):
+        """
+        Get a reset AnalysisResult from the free-list, or a new one if it is empty.
+        
+        Returns:
+            AnalysisResult: Result with default values, a new id and the current timestamp
+        """
+        try:
+            result = cls._pool.pop()
+        except IndexError:
+            return cls()
+        result.reset()
+        return result
+    
+    def release(self):
+        """
+        Return this result to the free-list. It must not be used after release.
+        """
+        self._pool.append(self)
+    
+    def reset(self):
+        """Restore default values, with a new id and timestamp"""
+        now = time.time()
+        self.id = f"analysis_{now}"
+        self.processed_data_id = ""
+        self.sensor_id = ""
+        self.timestamp = now
+        self.anomaly_score = 0.0
+        self.prediction = None
+        self.confidence = 0.0
+        self.results.clear()
+        # Metadata có thể là dict dùng chung của analyzer nên chỉ thay, không clear()
+        self.analysis_metadata = {}
+    
     def __str__(self):
         """String representation of analysis result"""
         result_str = f"AnalysisResult(id={self.id}, sensor_id={self.sensor_id}, timestamp={self.timestamp}"
@@ -206,7 +341,7 @@ class AnalysisResult:
             "anomaly_score": self.anomaly_score,
             "prediction": self.prediction,
             "confidence": self.confidence,
-            "results": self.results,
+            "results": _to_serializable(self.results),
             "analysis_metadata": self.analysis_metadata
         }
 
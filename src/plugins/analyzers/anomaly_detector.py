@@ -6,15 +6,196 @@
 Methods to implement:
 - __init__(self, config=None): Initialize with optional configuration
 - analyze(self, data): Analyze data and detect anomalies
+- analyze_batch(self, samples): Analyze a recorded sequence in one vectorized pass
 - reset(self): Reset the anomaly detector state
+- _push(self, sample, valid): Add the valid values of a sample to the windows in O(1)
+- _push_scalar(self, sample, valid): Scalar variant of _push for a few fields
+- _resync_stats(self, columns): Recompute running statistics from full windows
 - update_config(self, new_config): Update analyzer configuration
 """
 
 import logging
-import numpy as np
-from collections import deque
+import math
+import sys
+from collections.abc import Mapping
 from src.plugins.analyzers.base_analyzer import BaseAnalyzer
-from src.data.models import AnalysisResult
+from src.data.models import ProcessedData
+
+# NumPy và Numba chỉ được import khi detector được dùng lần đầu (xem _load_backends),
+# để việc nạp plugin không phải trả chi phí khởi tạo của chúng
+np = None
+prange = range
+NUMBA_AVAILABLE = None
+_update_window_stats_jit = None
+_batch_window_stats_jit = None
+
+
+def _load_backends():
+    """
+    Import NumPy, and Numba if it is installed, on first use.
+    """
+    global np, prange, NUMBA_AVAILABLE, _update_window_stats_jit, _batch_window_stats_jit
+    if np is not None:
+        return
+
+    import numpy
+
+    # Use try/except for numba import to handle cases where it's not installed
+    try:
+        from numba import njit, prange as numba_prange
+        NUMBA_AVAILABLE = True
+    except ImportError:
+        NUMBA_AVAILABLE = False
+
+    if NUMBA_AVAILABLE:
+        prange = numba_prange
+        _update_window_stats_jit = njit(cache=True, fastmath=True)(_update_window_stats)
+        # Không dùng fastmath: kernel batch không được giả định dữ liệu không có NaN/inf
+        _batch_window_stats_jit = njit(parallel=True, cache=True)(_batch_window_stats)
+
+    np = numpy
+
+
+def _update_window_stats(window, heads, counts, sample, valid, means, m2, stds):
+    """
+    Push the valid values of a sample into the per-field ring buffers and update statistics.
+    
+    Each field (column) has its own head and count, so a missing or invalid
+    value leaves that field's window and statistics untouched. Uses Welford's
+    update for the running mean and M2 (sum of squared deviations); when a
+    field's window is full the evicted value is replaced in a single
+    sliding-window step. Written with scalar loops so Numba can compile it to
+    native code; the arrays are updated in place.
+    
+    Args:
+        window (np.ndarray): (window_size, n_fields) ring buffers, one column per field
+        heads (np.ndarray): Next row to write, per field
+        counts (np.ndarray): Number of values currently in the window, per field
+        sample (np.ndarray): New values for all fields
+        valid (np.ndarray): True for the fields whose value is pushed
+        means, m2 (np.ndarray): Running mean and M2 per field
+        stds (np.ndarray): Output std per field
+    """
+    size, n_fields = window.shape
+
+    for j in range(n_fields):
+        if not valid[j]:
+            continue
+        value = sample[j]
+        mean = means[j]
+        head = heads[j]
+        count = counts[j]
+        if count == size:
+            # Thay giá trị cũ bằng giá trị mới, số phần tử không đổi
+            old = window[head, j]
+        else:
+            # Chưa đầy: old = mean đưa công thức thay thế về bước Welford thêm phần tử
+            old = mean
+            count += 1
+            counts[j] = count
+        new_mean = mean + (value - old) / count
+        m2[j] += (value - old) * (value - new_mean + old - mean)
+        means[j] = new_mean
+        window[head, j] = value
+
+        head = (head + 1) % size
+        heads[j] = head
+
+        # Mỗi vòng buffer tính lại thống kê từ cửa sổ (hai lượt) để loại bỏ sai số tích lũy
+        if head == 0:
+            s = 0.0
+            for i in range(size):
+                s += window[i, j]
+            mean = s / size
+            acc = 0.0
+            for i in range(size):
+                d = window[i, j] - mean
+                acc += d * d
+            means[j] = mean
+            m2[j] = acc
+
+        variance = m2[j] / count
+        stds[j] = math.sqrt(variance) if variance > 0.0 else 0.0
+
+
+def _batch_window_stats(values, size):
+    """
+    Rolling mean and std over every full window of a sample matrix.
+    
+    Fields are independent, so the outer loop uses prange and Numba spreads
+    the fields across cores when compiled with parallel=True. Compiled
+    without fastmath, so a NaN in a window gives NaN statistics, as with
+    the sliding_window_view path; analyze_batch only passes valid values.
+    
+    Args:
+        values (np.ndarray): (N, n_fields) samples
+        size (int): Window size
+        
+    Returns:
+        tuple: (means, stds), each (N - size + 1, n_fields)
+    """
+    n_samples, n_fields = values.shape
+    n_windows = n_samples - size + 1
+    means = np.empty((n_windows, n_fields))
+    stds = np.empty((n_windows, n_fields))
+
+    for j in prange(n_fields):
+        for i in range(n_windows):
+            s = 0.0
+            for k in range(size):
+                s += values[i + k, j]
+            mean = s / size
+            acc = 0.0
+            for k in range(size):
+                d = values[i + k, j] - mean
+                acc += d * d
+            means[i, j] = mean
+            stds[i, j] = math.sqrt(acc / size)
+
+    return means, stds
+
+
+class FieldAnomaly(Mapping):
+    """
+    Per-field anomaly record stored in AnalysisResult.results['anomalies'].
+    
+    Uses __slots__ instead of a dict per field. As a read-only Mapping it
+    supports record['z_score'], .get(), `in` and keys() like the dicts it
+    replaces, and is serialized through to_dict() at export time.
+    """
+    __slots__ = ('value', 'mean', 'std', 'z_score', 'anomaly_score', 'is_anomaly')
+
+    def __init__(self, value, mean, std, z_score, anomaly_score, is_anomaly):
+        self.value = value
+        self.mean = mean
+        self.std = std
+        self.z_score = z_score
+        self.anomaly_score = anomaly_score
+        self.is_anomaly = is_anomaly
+
+    def __getitem__(self, key):
+        """Dict-style access kept for consumers reading record['key']"""
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __repr__(self):
+        return (f"FieldAnomaly(value={self.value}, mean={self.mean}, std={self.std}, "
+                f"z_score={self.z_score}, anomaly_score={self.anomaly_score}, is_anomaly={self.is_anomaly})")
+
+    def to_dict(self):
+        """Convert to dictionary for serialization"""
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
+# Với ít field, phép toán vô hướng Python nhanh hơn overhead của các lời gọi NumPy
+SCALAR_MAX_FIELDS = 16
 
 
 class AnomalyDetector(BaseAnalyzer):
@@ -23,6 +204,13 @@ class AnomalyDetector(BaseAnalyzer):
     
     Uses a sliding window approach to calculate mean and standard deviation,
     then flags values that exceed a threshold as anomalies.
+    
+    All fields share one preallocated (window_size, n_fields) array, with one
+    ring buffer (head and count) per column plus a running mean and M2 per
+    field (sliding-window Welford update), so window statistics are updated in
+    O(1) per sample without losing precision when values are large compared to
+    their variance. A field that is missing from a sample is not pushed, so
+    each window only holds real values of its field.
     """
     
     def __init__(self, config=None):
@@ -35,6 +223,9 @@ class AnomalyDetector(BaseAnalyzer):
                 - window_size (int): Size of sliding window for statistics (default: 100)
                 - fields (list): List of fields to monitor for anomalies (default: ['accel_x', 'accel_y', 'accel_z'])
                 - min_window_size (int): Minimum window size before detection starts (default: 10)
+                - use_numba (bool): Use the Numba-compiled window update if numba is installed (default: True)
+                - use_result_pool (bool): Reuse pooled AnalysisResult objects; a result is only
+                  valid until the next analyze() call (default: False)
         """
         super().__init__(config)
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -48,9 +239,19 @@ class AnomalyDetector(BaseAnalyzer):
         self.fields = ['accel_x', 'accel_y', 'accel_z'] # Default fields
 
         # Data windows và statistics (sẽ được khởi tạo trong reset/update_config)
-        self.data_windows = {}
-        self.means = {}
-        self.stds = {}
+        self.window = None
+        self.window_heads = None
+        self.window_counts = None
+        self.field_index = {}
+        self._fields_tuple = ()
+        self.m2 = None
+        self.means = None
+        self.stds = None
+        self._kernel = None
+        self._sample = None
+        self._valid = None
+        self._ready = None
+        self._metadata = {}
 
         # Gọi update_config để xử lý config ban đầu và khởi tạo state
         # self.config được lấy từ lớp cha
@@ -124,28 +325,194 @@ class AnomalyDetector(BaseAnalyzer):
         Reset the anomaly detector state.
         ...
         """
-        # Initialize data windows for each field (sử dụng self.fields đã cập nhật)
-        self.data_windows = {field: deque(maxlen=self.window_size) for field in self.fields}
-        self.means = {field: 0.0 for field in self.fields}
-        self.stds = {field: 0.0 for field in self.fields}
+        _load_backends()
+
+        # Initialize data window for all fields (sử dụng self.fields đã cập nhật)
+        n_fields = len(self.fields)
+        self.window = np.zeros((self.window_size, n_fields), dtype=np.float64)
+        # Mỗi field có vị trí ghi và số phần tử riêng trong cột của nó
+        self.window_heads = np.zeros(n_fields, dtype=np.int64)
+        self.window_counts = np.zeros(n_fields, dtype=np.int64)
+        # Tuple bất biến các tên field đã intern, cùng bảng chỉ số field -> cột
+        self._fields_tuple = tuple(sys.intern(str(field)) for field in self.fields)
+        self.field_index = {field: i for i, field in enumerate(self._fields_tuple)}
+        self.means = np.zeros(n_fields, dtype=np.float64)
+        self.m2 = np.zeros(n_fields, dtype=np.float64)
+        self.stds = np.zeros(n_fields, dtype=np.float64)
+        # Buffer tạm cho mẫu hiện tại, dùng lại qua các lần analyze()
+        self._sample = np.zeros(n_fields, dtype=np.float64)
+        self._valid = np.ones(n_fields, dtype=bool)
+        self._ready = np.zeros(n_fields, dtype=bool)
+        self._deviations = np.zeros(n_fields, dtype=np.float64)
+        self._z_scores = np.zeros(n_fields, dtype=np.float64)
+        self._anomaly_scores = np.zeros(n_fields, dtype=np.float64)
+        self._is_anomaly = np.zeros(n_fields, dtype=bool)
+
+        # Metadata không đổi giữa các lần analyze() nên được tạo một lần và dùng chung
+        # cho mọi AnalysisResult (chỉ đọc)
+        self._metadata = {
+            'analyzer_type': 'statistical', 'window_size': self.window_size,
+            'fields_analyzed': list(self._fields_tuple), 'threshold': self.threshold
+        }
+
+        # Chọn kernel Numba nếu có; gọi thử một lần để biên dịch trước khi dữ liệu đến
+        self._kernel = None
+        if _update_window_stats_jit is not None and self.config.get('use_numba', True):
+            try:
+                dummy = np.zeros((2, n_fields), dtype=np.float64)
+                positions = np.zeros((2, n_fields), dtype=np.int64)
+                stats = np.zeros((3, n_fields), dtype=np.float64)
+                _update_window_stats_jit(dummy, positions[0], positions[1], dummy[0],
+                                         np.ones(n_fields, dtype=bool), stats[0], stats[1], stats[2])
+                self._kernel = _update_window_stats_jit
+            except Exception as e:
+                self.logger.warning(f"Numba kernel unavailable, using NumPy path: {e}")
         self.analyze_count = 0 # Reset counter
         self.analyze_errors = 0
         self.logger.debug("Anomaly detector state reset.")
         self.clear_error()
         return True
     
+    def _push(self, sample, valid):
+        """
+        Add the valid values of a sample to the window and update the running means, M2 and stds.
+        
+        Only the fields marked valid are pushed; the others keep their window
+        and statistics. When a field's window is full its oldest value is
+        replaced in one Welford step, so no window scan is needed. Uses the
+        Numba kernel when available, scalar Python math for a few fields,
+        otherwise NumPy ufuncs.
+        
+        Args:
+            sample (np.ndarray): Values for all fields, in self.fields order
+            valid (np.ndarray): True for the fields to push
+        """
+        if self._kernel is not None:
+            self._kernel(self.window, self.window_heads, self.window_counts, sample, valid,
+                         self.means, self.m2, self.stds)
+            return
+
+        if len(sample) <= SCALAR_MAX_FIELDS:
+            self._push_scalar(sample, valid)
+            return
+
+        size = self.window_size
+        index = np.flatnonzero(valid)
+        rows = self.window_heads[index]
+        counts = self.window_counts[index]
+        means = self.means[index]
+        values = sample[index]
+
+        # Cột chưa đầy: old = mean đưa công thức thay thế về bước Welford thêm phần tử
+        full = counts == size
+        counts = np.where(full, counts, counts + 1)
+        old = np.where(full, self.window[rows, index], means)
+        new_means = means + (values - old) / counts
+        self.m2[index] += (values - old) * (values - new_means + old - means)
+
+        self.means[index] = new_means
+        self.window[rows, index] = values
+        self.window_counts[index] = counts
+        rows = (rows + 1) % size
+        self.window_heads[index] = rows
+
+        # Mỗi vòng buffer của một cột tính lại thống kê của cột đó để loại bỏ sai số tích lũy
+        wrapped = index[rows == 0]
+        if wrapped.size:
+            self._resync_stats(wrapped)
+
+        self.stds[index] = np.sqrt(np.maximum(self.m2[index] / counts, 0.0))
+    
+    def _push_scalar(self, sample, valid):
+        """
+        Same as _push(), with the per-field arithmetic done on Python floats.
+        
+        With only a few fields each NumPy ufunc call costs more in dispatch
+        than the arithmetic itself, so the running means, M2 and stds are
+        updated in a plain loop and written back to the arrays once.
+        
+        Args:
+            sample (np.ndarray): Values for all fields, in self.fields order
+            valid (np.ndarray): True for the fields to push
+        """
+        size = self.window_size
+        window = self.window
+        heads = self.window_heads.tolist()
+        counts = self.window_counts.tolist()
+        means = self.means.tolist()
+        m2 = self.m2.tolist()
+        stds = self.stds.tolist()
+        wrapped = []
+
+        for j, (value, is_valid) in enumerate(zip(sample.tolist(), valid.tolist())):
+            if not is_valid:
+                continue
+            head = heads[j]
+            count = counts[j]
+            mean = means[j]
+            if count == size:
+                # Thay giá trị cũ bằng giá trị mới, số phần tử không đổi
+                old = float(window[head, j])
+            else:
+                old = mean
+                count += 1
+                counts[j] = count
+            new_mean = mean + (value - old) / count
+            m2[j] += (value - old) * (value - new_mean + old - mean)
+            means[j] = new_mean
+            window[head, j] = value
+            heads[j] = (head + 1) % size
+            if heads[j] == 0:
+                wrapped.append(j)
+            stds[j] = math.sqrt(m2[j] / count) if m2[j] > 0.0 else 0.0
+
+        self.window_heads[:] = heads
+        self.window_counts[:] = counts
+        self.means[:] = means
+        self.m2[:] = m2
+        self.stds[:] = stds
+
+        if wrapped:
+            self._resync_stats(wrapped)
+            for j in wrapped:
+                self.stds[j] = math.sqrt(self.m2[j] / size) if self.m2[j] > 0.0 else 0.0
+    
+    def _resync_stats(self, columns):
+        """
+        Recompute the running means and M2 of full columns from the window contents.
+        
+        Uses the two-pass form (mean, then squared deviations) so the
+        recomputed values are numerically stable.
+        
+        Args:
+            columns (sequence): Indices of fields whose window is full
+        """
+        window = self.window[:, columns]
+        means = window.mean(axis=0)
+        deviations = window - means
+        self.means[columns] = means
+        self.m2[columns] = np.einsum('ij,ij->j', deviations, deviations)
+    
     def analyze(self, data):
         """
         Analyze data to detect anomalies.
         ...
         """
         # --- SỬA ĐỔI BẮT ĐẦU: Xử lý ProcessedData ---
-        # Kiểm tra xem data có phải là ProcessedData không
-        original_data_dict = {}
+        # ProcessedData được đọc trực tiếp qua thuộc tính, không tạo dict bằng to_dict()
         if isinstance(data, ProcessedData):
-             original_data_dict = data.to_dict() # Chuyển đổi thành dict nếu cần
+             additional_values = data.additional_values
+             def get_value(field):
+                 value = getattr(data, field, None)
+                 return additional_values.get(field) if value is None else value
+             processed_data_id = data.id
+             sensor_id = data.sensor_id
+             timestamp = data.timestamp
         elif isinstance(data, dict):
-             original_data_dict = data
+             get_value = data.get
+             processed_data_id = data.get('id', None)
+             sensor_id = data.get('sensor_id', None)
+             timestamp = data.get('timestamp', None)
         else:
              self.set_error(f"Invalid data type for analysis: {type(data)}")
              return None
@@ -157,68 +524,76 @@ class AnomalyDetector(BaseAnalyzer):
         # --- SỬA ĐỔI KẾT THÚC ---
 
         # Create base analysis result
-        result = AnalysisResult()
-        result.processed_data_id = original_data_dict.get('id', None) # Lấy ID từ dict
-        result.sensor_id = original_data_dict.get('sensor_id', None)
-        result.timestamp = original_data_dict.get('timestamp', None) # Thêm timestamp
+        result = self._new_result()
+        result.processed_data_id = processed_data_id
+        result.sensor_id = sensor_id
+        result.timestamp = timestamp
 
         anomalies = {}
         max_anomaly_score = 0.0
 
-        # Check each field for anomalies
-        for field in self.fields:
-            # --- SỬA ĐỔI BẮT ĐẦU: Lấy giá trị từ dict ---
-            if field not in original_data_dict or original_data_dict[field] is None:
-                # self.logger.debug(f"Field '{field}' not found or is None in data, skipping.")
-                continue # Bỏ qua nếu field không có hoặc là None
-
-            value = original_data_dict[field]
-            # --- SỬA ĐỔI KẾT THÚC ---
-
-            try:
-                value_float = float(value)
-
-                # Add value to window (đảm bảo field tồn tại trong data_windows)
-                if field not in self.data_windows:
-                     self.data_windows[field] = deque(maxlen=self.window_size)
-                     self.means[field] = 0.0
-                     self.stds[field] = 0.0
-
-                self.data_windows[field].append(value_float)
-
-                # Skip analysis if not enough data
-                if len(self.data_windows[field]) < self.min_window_size:
-                    continue
-
-                # Calculate statistics
-                window_array = np.array(self.data_windows[field])
-                current_mean = np.mean(window_array)
-                current_std = np.std(window_array)
-                self.means[field] = current_mean # Lưu lại mean/std hiện tại
-                self.stds[field] = current_std
-
-                if current_std == 0:
-                    z_score = 0.0 # Nếu std là 0, z_score là 0
+        # Gán các thuộc tính dùng trong vòng lặp vào biến cục bộ
+        threshold = self.threshold
+        fields = self._fields_tuple
+        means = self.means
+        stds = self.stds
+        sample = self._sample
+        valid = self._valid
+
+        # Gom giá trị của tất cả các field thành một vector; NumPy ép kiểu cả vector một lần,
+        # giá trị thiếu thành NaN thay vì try/except float() cho từng field
+        raw_values = [get_value(field) for field in fields]
+        try:
+            sample[:] = [math.nan if value is None else value for value in raw_values]
+        except (ValueError, TypeError):
+            # Chỉ khi có giá trị không phải số mới chuyển đổi từng field
+            for i, (field, value) in enumerate(zip(fields, raw_values)):
+                try:
+                    sample[i] = math.nan if value is None else float(value)
+                except (ValueError, TypeError) as e:
+                    self.logger.warning(f"Field '{field}' has non-numeric value '{value}'. Cannot analyze. Error: {e}")
+                    sample[i] = math.nan
+        np.isfinite(sample, out=valid)
+
+        if valid.any():
+            # Field thiếu hoặc không phải số không được đưa vào cửa sổ của nó
+            self._push(sample, valid)
+
+            # Chỉ phân tích field hợp lệ có đủ dữ liệu; bỏ qua khi mọi field đó có std == 0
+            # (cảm biến đứng yên, cửa sổ hằng): không thể có bất thường, bỏ qua chuẩn hóa
+            ready = np.greater_equal(self.window_counts, self.min_window_size, out=self._ready)
+            ready &= valid
+            if ready.any() and stds.any():
+                # Không rẽ nhánh theo từng field: std == 0 (cửa sổ hằng) cho z_score = 0 qua mask
+                # Kết quả ghi vào các buffer tạm có sẵn thay vì cấp phát mảng mới mỗi lần
+                deviations = np.subtract(sample, means, out=self._deviations)
+                np.abs(deviations, out=deviations)
+                z_scores = self._z_scores
+                z_scores.fill(0.0)
+                np.divide(deviations, stds, out=z_scores, where=stds > 0)
+                anomaly_scores = np.divide(z_scores, threshold, out=self._anomaly_scores)
+                np.minimum(anomaly_scores, 1.0, out=anomaly_scores)
+                is_anomaly = np.greater(z_scores, threshold, out=self._is_anomaly)
+
+                # Chỉ giữ các field sẵn sàng bằng chỉ số, không kiểm tra từng field trong Python
+                if ready.all():
+                    selected = fields
                 else:
-                    z_score = abs(value_float - current_mean) / current_std
-
-                anomaly_score = min(z_score / self.threshold, 1.0) if self.threshold > 0 else (1.0 if z_score > 0 else 0.0)
-                max_anomaly_score = max(max_anomaly_score, anomaly_score)
-                is_anomaly = z_score > self.threshold
-
-                anomalies[field] = {
-                    'value': value_float, 'mean': current_mean, 'std': current_std,
-                    'z_score': z_score, 'anomaly_score': anomaly_score, 'is_anomaly': is_anomaly
-                }
-
-            except (ValueError, TypeError) as e:
-                self.logger.warning(f"Field '{field}' has non-numeric value '{value}'. Cannot analyze. Error: {e}")
-            except Exception as e:
-                 self.logger.error(f"Unexpected error analyzing field {field}: {e}", exc_info=True)
-
+                    index = np.flatnonzero(ready)
+                    selected = [fields[i] for i in index]
+                    sample, means, stds = sample[index], means[index], stds[index]
+                    z_scores, anomaly_scores, is_anomaly = z_scores[index], anomaly_scores[index], is_anomaly[index]
+
+                # Ghép các mảng kết quả thành bản ghi, chỉ tạo dict một lần ở cuối
+                records = list(zip(
+                    selected, sample.tolist(), means.tolist(), stds.tolist(),
+                    z_scores.tolist(), anomaly_scores.tolist(), is_anomaly.tolist()
+                ))
+                max_anomaly_score = float(anomaly_scores.max(initial=0.0))
+                anomalies = {record[0]: FieldAnomaly(*record[1:]) for record in records}
 
         result.anomaly_score = max_anomaly_score
-        result.results['threshold'] = self.threshold
+        result.results['threshold'] = threshold
         result.results['anomalies'] = anomalies
 
         # ... (phần còn lại của logic dự đoán và metadata như cũ) ...
@@ -229,10 +604,7 @@ class AnomalyDetector(BaseAnalyzer):
             result.prediction = "Possible Anomaly"
             result.confidence = max_anomaly_score
 
-        result.analysis_metadata = {
-            'analyzer_type': 'statistical', 'window_size': self.window_size,
-            'fields_analyzed': self.fields, 'threshold': self.threshold
-        }
+        result.analysis_metadata = self._metadata
 
 
         # Cập nhật số lượt phân tích thành công
@@ -240,6 +612,136 @@ class AnomalyDetector(BaseAnalyzer):
 
         return result
 
+    def analyze_batch(self, samples):
+        """
+        Analyze a recorded sequence of samples in one vectorized pass.
+        
+        Rolling statistics over every full window are computed with the
+        parallel Numba kernel when available, otherwise with sliding_window_view,
+        instead of calling analyze() once per sample.
+        The streaming window state is not modified.
+        
+        Values are converted as in analyze(): a missing, non-numeric or NaN
+        value is skipped, so it is neither scored nor part of any window, and
+        each field's window holds its last window_size valid values.
+        
+        Args:
+            samples (list or np.ndarray): Sample dicts / ProcessedData objects,
+                or an (N, n_fields) array in self.fields order
+            
+        Returns:
+            dict: Results for samples window_size-1 .. N-1 (each scored against
+                the window ending at it), with keys 'fields', 'start_index',
+                'means', 'stds', 'z_scores', 'anomaly_scores', 'is_anomaly',
+                'scored' ((N - window_size + 1, n_fields) arrays) and
+                'max_anomaly_scores'. 'scored' is False where the value was
+                skipped or its field had fewer than window_size valid values;
+                those entries have NaN means/stds and zero scores.
+        """
+        values = self._sample_matrix(samples)
+        n_samples, n_fields = values.shape
+        size = self.window_size
+        n_windows = max(n_samples - size + 1, 0)
+        valid = np.isfinite(values)
+
+        if n_windows == 0:
+            empty = np.empty((0, n_fields), dtype=np.float64)
+            means, stds = empty, empty
+        elif valid.all():
+            means, stds = self._rolling_stats(values)
+        else:
+            # Có giá trị bị bỏ qua: mỗi field lăn cửa sổ trên các giá trị hợp lệ của nó,
+            # như cửa sổ của analyze(); kết quả đặt vào dòng của mẫu kết thúc cửa sổ
+            means = np.full((n_windows, n_fields), np.nan)
+            stds = np.full((n_windows, n_fields), np.nan)
+            for j in range(n_fields):
+                rows = np.flatnonzero(valid[:, j])
+                if len(rows) < size:
+                    continue
+                column_means, column_stds = self._rolling_stats(values[rows, j].reshape(-1, 1))
+                ends = rows[size - 1:] - (size - 1)
+                means[ends, j] = column_means[:, 0]
+                stds[ends, j] = column_stds[:, 0]
+
+        current = values[size - 1:]
+        z_scores = np.divide(np.abs(current - means), stds,
+                             out=np.zeros_like(stds), where=stds > 0)
+        anomaly_scores = np.minimum(z_scores / self.threshold, 1.0)
+
+        return {
+            'fields': self._fields_tuple,
+            'start_index': size - 1,
+            'means': means,
+            'stds': stds,
+            'z_scores': z_scores,
+            'anomaly_scores': anomaly_scores,
+            'is_anomaly': z_scores > self.threshold,
+            'scored': ~np.isnan(stds),
+            'max_anomaly_scores': anomaly_scores.max(axis=1, initial=0.0)
+        }
+
+    def _rolling_stats(self, values):
+        """
+        Mean and std of every full window of a matrix without missing values.
+        
+        Args:
+            values (np.ndarray): (N, n_fields) samples, N >= window_size
+            
+        Returns:
+            tuple: (means, stds), each (N - window_size + 1, n_fields)
+        """
+        if _batch_window_stats_jit is not None and self.config.get('use_numba', True):
+            # Kernel Numba song song theo field
+            return _batch_window_stats_jit(np.ascontiguousarray(values), self.window_size)
+        # (N - W + 1, n_fields, W): mỗi hàng là một cửa sổ, không sao chép dữ liệu
+        windows = np.lib.stride_tricks.sliding_window_view(values, self.window_size, axis=0)
+        return windows.mean(axis=-1), windows.std(axis=-1)
+
+    def _sample_matrix(self, samples):
+        """
+        Stack samples into an (N, n_fields) float64 array.
+        
+        Values are read as in analyze(), including additional_values of
+        ProcessedData objects.
+        
+        Args:
+            samples (list or np.ndarray): Sample dicts, ProcessedData objects or a 2-D array
+            
+        Returns:
+            np.ndarray: Values in self.fields order (missing or non-numeric values become NaN)
+        """
+        if isinstance(samples, np.ndarray):
+            return np.asarray(samples, dtype=np.float64).reshape(-1, len(self._fields_tuple))
+
+        fields = self._fields_tuple
+        nan = math.nan
+        rows = []
+        for sample in samples:
+            if isinstance(sample, ProcessedData):
+                additional_values = sample.additional_values
+                row = [getattr(sample, field, None) for field in fields]
+                row = [additional_values.get(field) if value is None else value
+                       for field, value in zip(fields, row)]
+            else:
+                row = [sample.get(field) for field in fields]
+            rows.append([nan if value is None else value for value in row])
+
+        try:
+            return np.array(rows, dtype=np.float64).reshape(-1, len(fields))
+        except (ValueError, TypeError):
+            pass
+
+        # Chỉ khi có giá trị không phải số mới chuyển đổi từng giá trị
+        matrix = np.empty((len(rows), len(fields)), dtype=np.float64)
+        for i, row in enumerate(rows):
+            for j, value in enumerate(row):
+                try:
+                    matrix[i, j] = float(value)
+                except (ValueError, TypeError):
+                    self.logger.warning(f"Field '{fields[j]}' has non-numeric value '{value}'. Cannot analyze.")
+                    matrix[i, j] = nan
+        return matrix
+
 
 
 # How to extend and modify:
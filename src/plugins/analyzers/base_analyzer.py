@@ -12,6 +12,7 @@ Methods to implement in derived classes:
 
 from abc import ABC, abstractmethod
 import logging
+from src.data.models import AnalysisResult
 
 
 class BaseAnalyzer(ABC):
@@ -37,6 +38,9 @@ class BaseAnalyzer(ABC):
         self.error_message = None
         self.analyze_count = 0
         self.analyze_errors = 0
+        # Dùng lại AnalysisResult qua pool; kết quả trước được release ở lần analyze() sau
+        self.use_result_pool = bool(self.config.get('use_result_pool', False))
+        self._pooled_result = None
 
         # --- SỬA ĐỔI BẮT ĐẦU ---
         # Không gọi update_config từ đây nữa.
@@ -89,10 +93,30 @@ class BaseAnalyzer(ABC):
             bool: True if successful, False otherwise
         """
         self.config.update(new_config)
-        self.config.update(new_config)
+        if 'use_result_pool' in new_config:
+            self.use_result_pool = bool(new_config['use_result_pool'])
         self.logger.info(f"{self.__class__.__name__} configuration updated.")
         return True
     
+    def _new_result(self):
+        """
+        Create the AnalysisResult for an analyze() call.
+        
+        With use_result_pool the previous result is released back to the
+        AnalysisResult pool and a pooled object is rented instead, so consumers
+        must be done with a result before the next analyze() call.
+        
+        Returns:
+            AnalysisResult: Empty analysis result
+        """
+        if not self.use_result_pool:
+            return AnalysisResult()
+        
+        if self._pooled_result is not None:
+            self._pooled_result.release()
+        self._pooled_result = AnalysisResult.rent()
+        return self._pooled_result
+    
     def get_status(self):
         """
         Get the current status of the analyzer.
@@ -9,15 +9,42 @@ Methods to implement:
 - reset(self): Reset the analyzer state
 - update_config(self, new_config): Update analyzer configuration
 - _load_model(self, model_path): Load ML model from file
+- _allocate_feature_buffer(self): (Re)allocate the reusable feature buffer
+- _bind_model(self, model): Set the model and cache its capabilities
+- _quantize_features(self, features): Quantize features to int8
+- _run_quantized(self, features): Run inference through the model's int8 entry point
 """
 
 import logging
 import numpy as np
 import pickle
 import os
+import sys
 from collections import deque
 from src.plugins.analyzers.base_analyzer import BaseAnalyzer
-from src.data.models import AnalysisResult
+
+# joblib (tùy chọn) cho phép memory-map các mảng NumPy của model thay vì copy vào RAM
+try:
+    import joblib
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
+
+def _safe_float(value):
+    """
+    Convert a non-numeric field value to float, falling back to 0.0.
+
+    Args:
+        value: Field value (string, bool, None, ...)
+
+    Returns:
+        float: Converted value, or 0.0 if it cannot be converted
+    """
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
 
 
 class MLInferenceAnalyzer(BaseAnalyzer):
@@ -34,12 +61,22 @@ class MLInferenceAnalyzer(BaseAnalyzer):
         
         Args:
             config (dict, optional): Configuration with the following keys:
-                - model_path (str): Path to the ML model file (pickle format)
+                - model_path (str): Path to the ML model file (pickle or joblib format)
                 - input_fields (list): List of fields to use as model input
                 - batch_size (int): Number of samples to process at once (default: 1)
                 - mode (str): "classification" or "regression" (default: "classification")
                 - output_labels (list): List of class labels for classification (optional)
                 - threshold (float): Confidence threshold for classification (default: 0.5)
+                - include_probabilities (bool): Add the per-class probabilities to the
+                  classification result (default: False)
+                - use_result_pool (bool): Reuse pooled AnalysisResult objects; a result is only
+                  valid until the next analyze() call (default: False)
+                - trusted_numeric_inputs (bool): Input fields are always numeric, so rows
+                  are converted without per-value checks (default: False)
+                - feature_dtype (str): "float32" or "float64" feature buffer (default: "float32")
+                - quant_scale (float or list): int8 quantization scale, per field if a list
+                  (optional; int8 inference is used only if the model has predict_int8)
+                - quant_zero_point (int or list): int8 quantization zero point (default: 0)
         """
         super().__init__(config)
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -52,9 +89,28 @@ class MLInferenceAnalyzer(BaseAnalyzer):
         self.mode = "classification"
         self.output_labels = []
         self.threshold = 0.5
+        self.include_probabilities = False
+        self.trusted_numeric_inputs = False
+        self.feature_dtype = np.float32
+        self.quant_scale = None
+        self.quant_zero_point = 0
+        
+        # Khả năng của model (predict_proba, classes_) được tra cứu một lần khi nạp model
+        self._predict_proba = None
+        self._class_labels = None
+        self._predict_int8 = None
+        self._output_labels = []
+        
+        # Buffer đặc trưng (batch_size, n_fields) float32, C-order, dùng lại giữa các lần suy luận
+        self._fields_tuple = ()
+        self._nfields = 0
+        self._feat_buf = None
         
-        # Data buffer for batch processing
-        self.data_buffer = deque(maxlen=100)
+        # Metadata dùng chung (chỉ đọc) cho mọi AnalysisResult, tạo lại khi cấu hình đổi
+        self._metadata = {}
+        
+        # Data buffer for batch processing, chứa đúng batch_size mẫu gần nhất
+        self.data_buffer = deque(maxlen=self.batch_size)
         
         # Update with provided configuration
         if config:
@@ -111,6 +167,7 @@ class MLInferenceAnalyzer(BaseAnalyzer):
         # Update output labels
         if 'output_labels' in new_config and isinstance(new_config['output_labels'], list):
             self.output_labels = new_config['output_labels']
+            self._output_labels = [str(label) for label in self.output_labels]
         
         # Update threshold
         if 'threshold' in new_config:
@@ -123,6 +180,63 @@ class MLInferenceAnalyzer(BaseAnalyzer):
             except (ValueError, TypeError):
                 self.logger.warning("Invalid threshold, using default")
         
+        if 'include_probabilities' in new_config:
+            self.include_probabilities = bool(new_config['include_probabilities'])
+        
+        if 'use_result_pool' in new_config:
+            self.use_result_pool = bool(new_config['use_result_pool'])
+        
+        if 'trusted_numeric_inputs' in new_config:
+            self.trusted_numeric_inputs = bool(new_config['trusted_numeric_inputs'])
+        
+        # Update feature dtype
+        if 'feature_dtype' in new_config:
+            if new_config['feature_dtype'] in ("float32", "float64"):
+                self.feature_dtype = np.dtype(new_config['feature_dtype']).type
+            else:
+                self.logger.warning(f"Invalid feature dtype: {new_config['feature_dtype']}, using 'float32'")
+                self.feature_dtype = np.float32
+        
+        # Update int8 quantization parameters
+        if 'quant_scale' in new_config:
+            if new_config['quant_scale'] is None:
+                self.quant_scale = None
+            else:
+                try:
+                    scale = np.asarray(new_config['quant_scale'], dtype=np.float32)
+                    if np.all(scale > 0):
+                        self.quant_scale = scale
+                    else:
+                        self.logger.warning("Quantization scale must be positive, int8 inference disabled")
+                        self.quant_scale = None
+                except (ValueError, TypeError):
+                    self.logger.warning("Invalid quantization scale, int8 inference disabled")
+                    self.quant_scale = None
+        if 'quant_zero_point' in new_config:
+            try:
+                self.quant_zero_point = np.asarray(new_config['quant_zero_point'], dtype=np.float32)
+            except (ValueError, TypeError):
+                self.logger.warning("Invalid quantization zero point, using 0")
+                self.quant_zero_point = 0
+        
+        # Tuple các tên field đã intern: tra cứu dict trong vòng lặp đặc trưng so sánh theo id
+        self._fields_tuple = tuple(sys.intern(str(field)) for field in self.input_fields)
+        self._nfields = len(self._fields_tuple)
+        # Cấp phát lại buffer đặc trưng khi batch_size, input_fields hoặc dtype thay đổi
+        if (self._feat_buf is None or self._feat_buf.shape != (self.batch_size, self._nfields)
+                or self._feat_buf.dtype != self.feature_dtype):
+            self._allocate_feature_buffer()
+        if self.data_buffer.maxlen != self.batch_size:
+            self.data_buffer = deque(self.data_buffer, maxlen=self.batch_size)
+        
+        self._metadata = {
+            'analyzer_type': 'ml_inference',
+            'model_path': self.model_path,
+            'mode': self.mode,
+            'batch_size': self.batch_size,
+            'input_fields': list(self._fields_tuple)
+        }
+        
         # Load model if path is provided and changed
         if self.model_path and model_changed:
             try:
@@ -135,10 +249,34 @@ class MLInferenceAnalyzer(BaseAnalyzer):
         self.clear_error()
         return True
     
+    def _allocate_feature_buffer(self):
+        """
+        (Re)allocate the reusable feature buffer for the current batch size and fields.
+        """
+        self._feat_buf = np.zeros((self.batch_size, self._nfields), dtype=self.feature_dtype, order='C')
+    
+    def _bind_model(self, model):
+        """
+        Set the model and cache the capabilities used on every inference.
+        
+        Args:
+            model: Loaded ML model
+        """
+        self.model = model
+        self._predict_proba = getattr(model, 'predict_proba', None)
+        self._predict_int8 = getattr(model, 'predict_int8', None)
+        # Nhãn lớp được chuyển sang chuỗi một lần thay vì str() mỗi lần suy luận
+        classes = getattr(model, 'classes_', None)
+        self._class_labels = [str(label) for label in classes] if classes is not None else None
+    
     def _load_model(self, model_path):
         """
         Load the ML model from a file.
         
+        With joblib installed the model's NumPy arrays are memory-mapped read-only
+        (mmap_mode='r'), sharing the OS page cache instead of copying them. The model
+        file must not be overwritten while the model is loaded.
+        
         Args:
             model_path (str): Path to the model file
             
@@ -150,8 +288,11 @@ class MLInferenceAnalyzer(BaseAnalyzer):
             raise FileNotFoundError(f"Model file not found: {model_path}")
         
         try:
-            with open(model_path, 'rb') as f:
-                self.model = pickle.load(f)
+            if JOBLIB_AVAILABLE:
+                self._bind_model(joblib.load(model_path, mmap_mode='r'))
+            else:
+                with open(model_path, 'rb') as f:
+                    self._bind_model(pickle.load(f))
             self.logger.info(f"Loaded model from {model_path}")
         except Exception as e:
             self.logger.error(f"Error loading model: {str(e)}")
@@ -195,7 +336,7 @@ class MLInferenceAnalyzer(BaseAnalyzer):
             return None
         
         # Create base analysis result
-        result = AnalysisResult()
+        result = self._new_result()
         result.processed_data_id = data.get('id', '')
         result.sensor_id = data.get('sensor_id', '')
         
@@ -213,12 +354,13 @@ class MLInferenceAnalyzer(BaseAnalyzer):
             return result
         
         try:
-            # Extract features from the most recent batch
-            batch_data = list(self.data_buffer)[-self.batch_size:]
-            features = self._extract_features(batch_data)
+            # Buffer chỉ giữ batch_size mẫu gần nhất nên dùng trực tiếp, không cần copy/slice
+            features = self._extract_features(self.data_buffer)
             
             # Run inference
-            if self.mode == "classification":
+            if self.quant_scale is not None and self._predict_int8 is not None:
+                prediction_result = self._run_quantized(features)
+            elif self.mode == "classification":
                 prediction_result = self._run_classification(features)
             else:  # regression
                 prediction_result = self._run_regression(features)
@@ -234,13 +376,7 @@ class MLInferenceAnalyzer(BaseAnalyzer):
             result.results['error'] = str(e)
         
         # Add metadata about the analysis
-        result.analysis_metadata = {
-            'analyzer_type': 'ml_inference',
-            'model_path': self.model_path,
-            'mode': self.mode,
-            'batch_size': self.batch_size,
-            'input_fields': self.input_fields
-        }
+        result.analysis_metadata = self._metadata
         
         # Update counters
         super().analyze(data)
@@ -252,31 +388,79 @@ class MLInferenceAnalyzer(BaseAnalyzer):
         Extract features from the batch data.
         
         Args:
-            batch_data (list): List of data dictionaries
+            batch_data (iterable): Data dictionaries (at most batch_size)
             
         Returns:
-            numpy.ndarray: Features array
+            numpy.ndarray: Features array (the reused (batch_size, n_fields) buffer)
         """
-        # Create feature matrix
-        features = []
-        
-        for data_point in batch_data:
-            # Extract features for this data point
-            point_features = []
-            for field in self.input_fields:
-                if field in data_point:
-                    try:
-                        point_features.append(float(data_point[field]))
-                    except (ValueError, TypeError):
-                        # Use 0 for missing or invalid values
-                        point_features.append(0.0)
+        # Ghi trực tiếp vào buffer cấp phát sẵn, không tạo list-of-lists trung gian
+        buf = self._feat_buf
+        fields = self._fields_tuple
+        
+        if self.trusted_numeric_inputs:
+            # Dữ liệu chắc chắn là số: NumPy chuyển cả hàng trong một lần gán
+            for i, data_point in enumerate(batch_data):
+                get = data_point.get
+                buf[i] = [get(field, 0.0) for field in fields]
+            return buf
+        
+        for i, data_point in enumerate(batch_data):
+            get = data_point.get
+            for j, field in enumerate(fields):
+                # Missing fields use 0; only non-numeric values go through try/except
+                value = get(field)
+                value_type = type(value)
+                if value_type is float or value_type is int:
+                    buf[i, j] = value
+                elif value is None:
+                    buf[i, j] = 0.0
                 else:
-                    # Use 0 for missing fields
-                    point_features.append(0.0)
+                    buf[i, j] = _safe_float(value)
+        
+        return buf
+    
+    def _quantize_features(self, features):
+        """
+        Quantize features to int8 with the configured scale and zero point.
+        
+        Args:
+            features (numpy.ndarray): Features array
             
-            features.append(point_features)
+        Returns:
+            numpy.ndarray: int8 features, round(features / scale + zero_point) clipped to [-128, 127]
+        """
+        quantized = np.rint(features / self.quant_scale + self.quant_zero_point)
+        return np.clip(quantized, -128, 127).astype(np.int8)
+    
+    def _run_quantized(self, features):
+        """
+        Run inference on int8-quantized features through the model's predict_int8.
         
-        return np.array(features)
+        Args:
+            features (numpy.ndarray): Features array
+            
+        Returns:
+            dict: Classification or regression results for the latest sample
+        """
+        try:
+            prediction = self._predict_int8(self._quantize_features(features[-1:]))[0]
+            
+            if self.mode == "classification":
+                return {
+                    'prediction': str(prediction),
+                    'confidence': 1.0,  # No confidence available
+                    'above_threshold': True
+                }
+            
+            value = float(prediction)
+            return {
+                'prediction': str(value),
+                'value': value,
+                'confidence': 1.0  # No confidence for regression
+            }
+        except Exception as e:
+            self.logger.error(f"Quantized inference error: {str(e)}")
+            raise
     
     def _run_classification(self, features):
         """
@@ -290,30 +474,34 @@ class MLInferenceAnalyzer(BaseAnalyzer):
         """
         try:
             # Get raw prediction probabilities
-            if hasattr(self.model, 'predict_proba'):
-                proba = self.model.predict_proba(features)
+            predict_proba = self._predict_proba
+            if predict_proba is not None:
+                proba = predict_proba(features)[-1]
                 # Get the highest probability class
-                max_proba_idx = np.argmax(proba[-1])
-                confidence = proba[-1][max_proba_idx]
+                max_proba_idx = int(proba.argmax())
+                confidence = float(proba[max_proba_idx])
                 
                 # Get class labels
-                if hasattr(self.model, 'classes_'):
-                    classes = self.model.classes_
-                    prediction = str(classes[max_proba_idx])
-                elif self.output_labels and max_proba_idx < len(self.output_labels):
-                    prediction = self.output_labels[max_proba_idx]
+                if self._class_labels is not None:
+                    prediction = self._class_labels[max_proba_idx]
+                elif max_proba_idx < len(self._output_labels):
+                    prediction = self._output_labels[max_proba_idx]
                 else:
                     prediction = str(max_proba_idx)
                 
-                return {
+                classification = {
                     'prediction': prediction,
-                    'confidence': float(confidence),
-                    'probabilities': {str(i): float(p) for i, p in enumerate(proba[-1])},
+                    'confidence': confidence,
                     'above_threshold': confidence >= self.threshold
                 }
+                # Dict xác suất từng lớp chỉ tạo khi được yêu cầu
+                if self.include_probabilities:
+                    classification['probabilities'] = {str(i): p for i, p in enumerate(proba.tolist())}
+                return classification
             else:
                 # For models without probability support
-                prediction = self.model.predict(features)[-1]
+                # Chỉ kết quả của mẫu mới nhất được dùng nên chỉ dự đoán hàng cuối
+                prediction = self.model.predict(features[-1:])[0]
                 
                 # Convert to string for consistent output
                 prediction = str(prediction)
@@ -338,8 +526,8 @@ class MLInferenceAnalyzer(BaseAnalyzer):
             dict: Regression results
         """
         try:
-            # Get prediction
-            prediction = float(self.model.predict(features)[-1])
+            # Get prediction for the latest sample only
+            prediction = float(self.model.predict(features[-1:])[0])
             
             return {
                 'prediction': str(prediction),
@@ -8,12 +8,32 @@ Methods to implement in derived classes:
 - configure(): Send configuration to the sensor
 - reset(): Reset sensor to default settings
 - get_status(): Get current status of the configurator
+- set_connection(connection): Use a connection opened and owned by the caller
 """
 
 from abc import ABC, abstractmethod
 import logging
 
 
+def _status_property(key):
+    """
+    Create a property stored in the configurator's status dictionary.
+    
+    Args:
+        key (str): Status key
+        
+    Returns:
+        property: Property reading and writing self._status[key]
+    """
+    def getter(self):
+        return self._status[key]
+    
+    def setter(self, value):
+        self._status[key] = value
+    
+    return property(getter, setter)
+
+
 class BaseConfigurator(ABC):
     """
     Abstract base class for all sensor configurators.
@@ -22,18 +42,36 @@ class BaseConfigurator(ABC):
     initialization sequences, sampling rates, and other settings.
     """
     
+    _logger = logging.getLogger("BaseConfigurator")
+    
+    # Trạng thái lưu thẳng trong dict của get_status, cập nhật tại chỗ khi gán
+    is_configured = _status_property("is_configured")
+    error_state = _status_property("error_state")
+    error_message = _status_property("error_message")
+    
+    def __init_subclass__(cls, **kwargs):
+        """Cache one logger per configurator class instead of looking it up per instance."""
+        super().__init_subclass__(**kwargs)
+        cls._logger = logging.getLogger(cls.__name__)
+    
     def __init__(self, config):
         """
         Initialize the configurator with configuration.
         
         Args:
-            config (dict): Configuration dictionary for the configurator
+            config (dict): Configuration dictionary for the configurator.
+                An optional "connection" entry is an already-open connection
+                owned by the caller (see set_connection).
         """
         self.config = config
-        self.logger = logging.getLogger(self.__class__.__name__)
-        self.is_configured = False
-        self.error_state = False
-        self.error_message = None
+        self.logger = type(self)._logger
+        # Kết nối do bên gọi mở và quản lý; configurator không mở/đóng nó
+        self.external_connection = config.get("connection")
+        self._status = {
+            "is_configured": False,
+            "error_state": False,
+            "error_message": None
+        }
     
     @abstractmethod
     def configure(self):
@@ -71,11 +109,21 @@ class BaseConfigurator(ABC):
                 - error_state (bool): Whether there's an error
                 - error_message (str): Error message, if any
         """
-        return {
-            "is_configured": self.is_configured,
-            "error_state": self.error_state,
-            "error_message": self.error_message
-        }
+        # Sao chép dict có sẵn (một lệnh C) thay vì dựng lại từ các thuộc tính
+        return self._status.copy()
+    
+    def set_connection(self, connection):
+        """
+        Use an already-open connection owned by the caller.
+        
+        configure() and reset() then write through it without opening or
+        closing a connection themselves. Pass None to go back to opening a
+        connection per operation.
+        
+        Args:
+            connection: Open connection object (e.g. serial.Serial), or None
+        """
+        self.external_connection = connection
     
     def set_error(self, message):
         """
@@ -7,14 +7,71 @@ Methods to implement:
 - __init__(self, config): Initialize with configuration
 - configure(): Send configuration to the MPU6050 sensor
 - reset(): Reset MPU6050 sensor to default settings
+- session(): Context manager keeping the interface open across several operations
+- _configure_locked() / _reset_locked(): Register writes, interface already open
+- _config_plan(): Materialize CONFIG_PLAN_TEMPLATE with the configured values
+- _run_plan(plan): Execute a register-write plan, coalescing adjacent registers
 - _send_register(register, value): Send register/value pair to sensor
+- _send_block(start_register, values): Send values to consecutive registers
 """
 
 import serial
 import time
 import logging
+from contextlib import contextmanager
+from functools import partial
 from src.plugins.configurators.base_configurator import BaseConfigurator
 
+# Bước "sleep" trong plan ghi thanh ghi: ("sleep", seconds)
+SLEEP = "sleep"
+
+
+def _coalesce_plan(plan):
+    """
+    Group a register-write plan into block writes and sleeps.
+    
+    Consecutive (register, value) entries with contiguous addresses become one
+    ("write", start_register, values) step; ("sleep", seconds) entries are kept.
+    
+    Args:
+        plan (list): (register, value) and ("sleep", seconds) tuples
+        
+    Returns:
+        list: ("write", start_register, values) and ("sleep", seconds) steps
+    """
+    steps = []
+    run = None
+    for target, value in plan:
+        if target == SLEEP:
+            run = None
+            steps.append((SLEEP, value))
+        elif run is not None and target == run[1] + len(run[2]):
+            run[2].append(value)
+        else:
+            run = ("write", target, [value])
+            steps.append(run)
+    return steps
+
+
+def _register_frame(start_register, values):
+    """
+    Build a serial frame of register/value pairs for consecutive registers.
+    
+    Args:
+        start_register (int): Address of the first register
+        values (list): Values to write, one per register
+        
+    Returns:
+        bytearray: Interleaved register/value bytes
+    """
+    # Điền thẳng vào một bytearray thay vì tạo một bytes cho mỗi cặp rồi join
+    count = len(values)
+    frame = bytearray(2 * count)
+    frame[0::2] = range(start_register, start_register + count)
+    frame[1::2] = values
+    return frame
+
+
 class MPU6050Configurator(BaseConfigurator):
     """
     Configurator for MPU6050 IMU sensors.
@@ -29,6 +86,23 @@ class MPU6050Configurator(BaseConfigurator):
     SMPLRT_DIV = 0x19
     CONFIG = 0x1A
     
+    # Trình tự cấu hình dạng khai báo; None được thay bằng giá trị từ config.
+    # SMPLRT_DIV..ACCEL_CONFIG (0x19-0x1C) liền kề nên được ghi thành một block.
+    CONFIG_PLAN_TEMPLATE = (
+        (PWR_MGMT_1, 0x80),     # Reset device
+        (SLEEP, 0.1),
+        (PWR_MGMT_1, 0x00),     # Wake up
+        (SLEEP, 0.01),
+        (SMPLRT_DIV, None),     # Sample Rate = 8kHz / (1 + sample_rate)
+        (CONFIG, 0x03),         # DLPF_CFG = 3: 44Hz Gyro, 42Hz Accel
+        (GYRO_CONFIG, None),
+        (ACCEL_CONFIG, None),
+    )
+    RESET_PLAN = (
+        (PWR_MGMT_1, 0x80),
+        (SLEEP, 0.1),
+    )
+    
     def __init__(self, config):
         """
         Initialize the MPU6050 configurator with configuration.
@@ -42,12 +116,17 @@ class MPU6050Configurator(BaseConfigurator):
                 - gyro_range (int): Gyroscope range (0-3, default: 0)
                 - accel_range (int): Accelerometer range (0-3, default: 0)
                 - sample_rate (int): Sample rate divider (0-255, default: 0)
+                - batch_serial (bool): Send consecutive register writes in one serial frame
+                  (default: True; disable for adapters that answer each command)
+                - connection: Already-open SMBus or serial.Serial object owned by the
+                  caller; it is used as is and never closed (optional)
         """
         super().__init__(config)
         self.interface = config.get("interface", "i2c")
         self.address = config.get("address", 0x68 if self.interface == "i2c" else "COM3")
         self.baudrate = config.get("baudrate", 9600) if self.interface == "serial" else None
         self.timeout = config.get("timeout", 1.0) if self.interface == "serial" else None
+        self.batch_serial = config.get("batch_serial", True)
         
         # Configuration values
         self.gyro_range = config.get("gyro_range", 0)  # 0: ±250°/s, 1: ±500°/s, 2: ±1000°/s, 3: ±2000°/s
@@ -57,6 +136,10 @@ class MPU6050Configurator(BaseConfigurator):
         # Communication handle
         self.i2c_bus = None
         self.serial_conn = None
+        
+        # Hàm ghi thanh ghi gắn sẵn với interface đang mở (xác định một lần khi mở)
+        self._write_fn = None
+        self._write_block_fn = None
     
     def configure(self):
         """
@@ -69,31 +152,8 @@ class MPU6050Configurator(BaseConfigurator):
             RuntimeError: If there's an error configuring the sensor
         """
         try:
-            # Open communication interface
-            if self.interface == "i2c":
-                self._open_i2c()
-            else:  # serial
-                self._open_serial()
-            
-            # Reset device first
-            self._send_register(self.PWR_MGMT_1, 0x80)  # Reset MPU6050
-            time.sleep(0.1)
-            
-            # Wake up device
-            self._send_register(self.PWR_MGMT_1, 0x00)  # Wake up
-            time.sleep(0.01)
-            
-            # Configure gyroscope range
-            self._send_register(self.GYRO_CONFIG, self.gyro_range << 3)
-            
-            # Configure accelerometer range
-            self._send_register(self.ACCEL_CONFIG, self.accel_range << 3)
-            
-            # Configure sample rate
-            self._send_register(self.SMPLRT_DIV, self.sample_rate)
-            
-            # Configure DLPF
-            self._send_register(self.CONFIG, 0x03)  # DLPF_CFG = 3: 44Hz Gyro, 42Hz Accel
+            with self.session():
+                self._configure_locked()
             
             # Set configured flag
             self.is_configured = True
@@ -104,9 +164,6 @@ class MPU6050Configurator(BaseConfigurator):
         except Exception as e:
             self.set_error(f"Configuration error: {str(e)}")
             return False
-        finally:
-            # Close communication interface
-            self._close_interface()
     
     def reset(self):
         """
@@ -119,15 +176,8 @@ class MPU6050Configurator(BaseConfigurator):
             RuntimeError: If there's an error resetting the sensor
         """
         try:
-            # Open communication interface
-            if self.interface == "i2c":
-                self._open_i2c()
-            else:  # serial
-                self._open_serial()
-            
-            # Reset device
-            self._send_register(self.PWR_MGMT_1, 0x80)  # Reset MPU6050
-            time.sleep(0.1)
+            with self.session():
+                self._reset_locked()
             
             self.is_configured = False
             self.clear_error()
@@ -137,18 +187,107 @@ class MPU6050Configurator(BaseConfigurator):
         except Exception as e:
             self.set_error(f"Reset error: {str(e)}")
             return False
+    
+    @contextmanager
+    def session(self):
+        """
+        Keep the communication interface open for the duration of the block.
+        
+        configure() and reset() called inside a session reuse the open interface
+        instead of opening and closing it themselves, e.g.:
+        
+            with configurator.session():
+                configurator.reset()
+                configurator.configure()
+        
+        Yields:
+            MPU6050Configurator: This configurator
+        """
+        # Session lồng nhau dùng lại interface đã mở
+        if self._write_fn is not None:
+            yield self
+            return
+        
+        # Open communication interface
+        if self.interface == "i2c":
+            self._open_i2c()
+        else:  # serial
+            self._open_serial()
+        try:
+            yield self
         finally:
             # Close communication interface
             self._close_interface()
     
+    def _configure_locked(self):
+        """
+        Write the configuration registers. The interface must already be open.
+        
+        Raises:
+            RuntimeError: If communication fails
+        """
+        self._run_plan(self._config_plan())
+    
+    def _config_plan(self):
+        """
+        Build the configuration plan from CONFIG_PLAN_TEMPLATE.
+        
+        Returns:
+            list: (register, value) and ("sleep", seconds) tuples
+        """
+        values = {
+            self.SMPLRT_DIV: self.sample_rate,
+            self.GYRO_CONFIG: self.gyro_range << 3,
+            self.ACCEL_CONFIG: self.accel_range << 3,
+        }
+        return [(target, values[target] if value is None else value)
+                for target, value in self.CONFIG_PLAN_TEMPLATE]
+    
+    def _run_plan(self, plan):
+        """
+        Execute a register-write plan on the open interface.
+        
+        Writes to contiguous registers are coalesced into one block write
+        (an I2C burst or one serial frame); single registers use _send_register.
+        
+        Args:
+            plan (list): (register, value) and ("sleep", seconds) tuples
+            
+        Raises:
+            RuntimeError: If communication fails
+        """
+        for step in _coalesce_plan(plan):
+            if step[0] == SLEEP:
+                time.sleep(step[1])
+            else:
+                _, start_register, values = step
+                if len(values) == 1:
+                    self._send_register(start_register, values[0])
+                else:
+                    self._send_block(start_register, values)
+    
+    def _reset_locked(self):
+        """
+        Reset the device. The interface must already be open.
+        
+        Raises:
+            RuntimeError: If communication fails
+        """
+        self._run_plan(self.RESET_PLAN)
+    
     def _open_i2c(self):
         """Open I2C communication interface."""
         try:
             # For now, let's assume SMBus is available
             # This would need to be adjusted based on the actual I2C library used
-            import smbus
-            self.i2c_bus = smbus.SMBus(1)  # 1 indicates /dev/i2c-1
-            self.logger.debug(f"Opened I2C interface to MPU6050 at address 0x{self.address:02X}")
+            if self.external_connection is not None:
+                self.i2c_bus = self.external_connection
+            else:
+                import smbus
+                self.i2c_bus = smbus.SMBus(1)  # 1 indicates /dev/i2c-1
+            self._write_fn = partial(self.i2c_bus.write_byte_data, self.address)
+            self._write_block_fn = partial(self.i2c_bus.write_i2c_block_data, self.address)
+            self.logger.debug("Opened I2C interface to MPU6050 at address 0x%02X", self.address)
         except ImportError:
             raise RuntimeError("smbus module not available for I2C communication")
         except Exception as e:
@@ -157,12 +296,25 @@ class MPU6050Configurator(BaseConfigurator):
     def _open_serial(self):
         """Open serial communication interface."""
         try:
-            self.serial_conn = serial.Serial(
-                port=self.address,
-                baudrate=self.baudrate,
-                timeout=self.timeout
-            )
-            self.logger.debug(f"Opened serial interface to MPU6050 at {self.address}")
+            if self.external_connection is not None:
+                # Kết nối đã mở sẵn: bỏ qua chi phí mở cổng ở mỗi lần configure/reset
+                self.serial_conn = self.external_connection
+            else:
+                self.serial_conn = serial.Serial(
+                    port=self.address,
+                    baudrate=self.baudrate,
+                    timeout=self.timeout
+                )
+            # Simple protocol: first byte is register, second is value
+            # This would need to be adjusted based on the actual protocol used by the serial adapter
+            serial_conn = self.serial_conn
+            self._write_fn = lambda register, value: serial_conn.write(bytes((register, value)))
+            if self.batch_serial:
+                # Các cặp register/value liên tiếp gộp thành một frame, một lần ghi USB
+                self._write_block_fn = lambda start, values: serial_conn.write(_register_frame(start, values))
+            else:
+                self._write_block_fn = None
+            self.logger.debug("Opened serial interface to MPU6050 at %s", self.address)
         except Exception as e:
             raise RuntimeError(f"Failed to open serial interface: {str(e)}")
     
@@ -178,27 +330,51 @@ class MPU6050Configurator(BaseConfigurator):
             RuntimeError: If communication fails
         """
         try:
-            if self.interface == "i2c" and self.i2c_bus:
-                self.i2c_bus.write_byte_data(self.address, register, value)
-            elif self.interface == "serial" and self.serial_conn:
-                # Simple protocol: first byte is register, second is value
-                # This would need to be adjusted based on the actual protocol used by the serial adapter
-                command = bytes([register, value])
-                self.serial_conn.write(command)
-            else:
+            if self._write_fn is None:
                 raise RuntimeError("No communication interface open")
+            self._write_fn(register, value)
                 
-            self.logger.debug(f"Sent register 0x{register:02X} = 0x{value:02X}")
+            # Định dạng %-style: chuỗi chỉ được dựng khi log debug thực sự được ghi
+            self.logger.debug("Sent register 0x%02X = 0x%02X", register, value)
         except Exception as e:
             raise RuntimeError(f"Failed to send register: {str(e)}")
     
+    def _send_block(self, start_register, values):
+        """
+        Send values to consecutive registers starting at start_register.
+        
+        Over I2C this is a single burst transfer (the MPU6050 auto-increments the
+        register address). Over serial the register/value pairs are sent in one
+        frame with batch_serial, otherwise one pair at a time.
+        
+        Args:
+            start_register (int): Address of the first register
+            values (list): Values to write, one per register
+            
+        Raises:
+            RuntimeError: If communication fails
+        """
+        if self._write_block_fn is not None:
+            try:
+                self._write_block_fn(start_register, list(values))
+            except Exception as e:
+                raise RuntimeError(f"Failed to send register block: {str(e)}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Sent registers 0x%02X.. = %s", start_register, bytes(values).hex(' ').upper())
+        else:
+            for offset, value in enumerate(values):
+                self._send_register(start_register + offset, value)
+    
     def _close_interface(self):
         """Close the communication interface."""
+        self._write_fn = None
+        self._write_block_fn = None
         if self.interface == "i2c" and self.i2c_bus:
             # SMBus doesn't have a close method, but if using another I2C library, close here
             self.i2c_bus = None
         elif self.interface == "serial" and self.serial_conn:
-            if self.serial_conn.is_open:
+            # Kết nối do bên gọi sở hữu thì không đóng
+            if self.serial_conn is not self.external_connection and self.serial_conn.is_open:
                 self.serial_conn.close()
             self.serial_conn = None
 
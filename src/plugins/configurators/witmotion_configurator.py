@@ -8,7 +8,9 @@ Methods to implement:
 - configure(): Send configuration to the WitMotion sensor
 - reset(): Reset WitMotion sensor to default settings
 - _parse_init_sequence(): Convert hex strings to bytes
+- _build_init_groups(): Group the init sequence into (payload, delay) writes
 - _send_command(command): Send command bytes to sensor
+- _open_serial() / _close_serial(): Open a connection unless one was injected
 """
 
 import serial
@@ -33,14 +35,29 @@ class WitMotionConfigurator(BaseConfigurator):
                 - port (str): Serial port (e.g., "COM3")
                 - baudrate (int): Baud rate (default: 9600)
                 - timeout (float): Serial timeout in seconds (default: 1.0)
-                - init_sequence (list): List of hex strings to send during configuration
+                - init_sequence (list): Hex strings to send during configuration. A nested
+                  list of hex strings is a group sent in one write with a single delay after it
+                - batch_init (bool): Send the whole init sequence in one write (default: False)
+                - inter_command_delay_ms (int): Delay after each init command or group in ms (default: 100)
         """
         super().__init__(config)
         self.port = config.get("port")
         self.baudrate = config.get("baudrate", 9600)
         self.timeout = config.get("timeout", 1.0)
         self.init_sequence = config.get("init_sequence", [])
+        self.batch_init = config.get("batch_init", False)
+        self.inter_command_delay = config.get("inter_command_delay_ms", 100) / 1000.0
         self.serial_conn = None
+        
+        # Init sequence được parse và nhóm một lần, không lặp lại ở mỗi lần configure();
+        # chuỗi hex sai được ghi lỗi ở đây và configure() trả về False
+        self._init_error = None
+        try:
+            self._init_groups = self._build_init_groups()
+        except (ValueError, TypeError, AttributeError) as e:
+            self._init_groups = None
+            self._init_error = f"Invalid init_sequence: {str(e)}"
+            self.set_error(self._init_error)
     
     def configure(self):
         """
@@ -52,23 +69,23 @@ class WitMotionConfigurator(BaseConfigurator):
         Raises:
             RuntimeError: If there's an error configuring the sensor
         """
-        if not self.port:
+        if not self.port and self.external_connection is None:
             self.set_error("No port specified in configuration")
             return False
         
+        if self._init_groups is None:
+            self.set_error(self._init_error)
+            return False
+        
         try:
             # Open serial connection
-            self.serial_conn = serial.Serial(
-                port=self.port,
-                baudrate=self.baudrate,
-                timeout=self.timeout
-            )
+            self._open_serial()
             
-            # Send initialization sequence
-            for cmd in self.init_sequence:
-                command_bytes = self._parse_init_sequence(cmd)
-                self._send_command(command_bytes)
-                time.sleep(0.1)  # Small delay between commands
+            # Send initialization sequence: one write per group, flushed before the delay
+            for payload, delay in self._init_groups:
+                self._send_command(payload)
+                self.serial_conn.flush()
+                time.sleep(delay)
             
             # Set configured flag
             self.is_configured = True
@@ -84,9 +101,7 @@ class WitMotionConfigurator(BaseConfigurator):
             return False
         finally:
             # Close serial connection if open
-            if self.serial_conn and self.serial_conn.is_open:
-                self.serial_conn.close()
-                self.serial_conn = None
+            self._close_serial()
     
     def reset(self):
         """
@@ -100,11 +115,7 @@ class WitMotionConfigurator(BaseConfigurator):
         """
         try:
             # Open serial connection
-            self.serial_conn = serial.Serial(
-                port=self.port,
-                baudrate=self.baudrate,
-                timeout=self.timeout
-            )
+            self._open_serial()
             
             # Send reset command (FF AA 00 for WitMotion)
             self._send_command(b'\xFF\xAA\x00')
@@ -122,9 +133,7 @@ class WitMotionConfigurator(BaseConfigurator):
             return False
         finally:
             # Close serial connection if open
-            if self.serial_conn and self.serial_conn.is_open:
-                self.serial_conn.close()
-                self.serial_conn = None
+            self._close_serial()
     
     def _parse_init_sequence(self, hex_string):
         """
@@ -140,6 +149,47 @@ class WitMotionConfigurator(BaseConfigurator):
         clean_hex = hex_string.replace(" ", "")
         return bytes.fromhex(clean_hex)
     
+    def _open_serial(self):
+        """Open the serial connection, or use the injected one."""
+        if self.external_connection is not None:
+            # Kết nối đã mở sẵn: bỏ qua chi phí mở cổng COM ở mỗi lần configure/reset
+            self.serial_conn = self.external_connection
+        else:
+            self.serial_conn = serial.Serial(
+                port=self.port,
+                baudrate=self.baudrate,
+                timeout=self.timeout
+            )
+    
+    def _close_serial(self):
+        """Close the serial connection unless it is owned by the caller."""
+        if (self.serial_conn is not self.external_connection
+                and self.serial_conn and self.serial_conn.is_open):
+            self.serial_conn.close()
+        self.serial_conn = None
+    
+    def _build_init_groups(self):
+        """
+        Group the init sequence into writes.
+        
+        A hex string is a group of its own, a nested list of hex strings is one
+        group, and with batch_init the whole sequence is a single group.
+        
+        Returns:
+            list: (payload bytes, delay in seconds) tuples
+        """
+        groups = []
+        for item in self.init_sequence:
+            commands = [item] if isinstance(item, str) else item
+            groups.append([self._parse_init_sequence(cmd) for cmd in commands])
+        
+        if self.batch_init and groups:
+            # Một lần ghi cho cả chuỗi lệnh, chờ một lần cho tổng thời gian xử lý
+            return [(b"".join(b"".join(group) for group in groups),
+                     self.inter_command_delay * len(groups))]
+        
+        return [(b"".join(group), self.inter_command_delay) for group in groups if group]
+    
     def _send_command(self, command):
         """
         Send command bytes to the sensor.
@@ -156,7 +206,9 @@ class WitMotionConfigurator(BaseConfigurator):
         
         try:
             bytes_written = self.serial_conn.write(command)
-            self.logger.debug(f"Sent command: {command.hex(' ').upper()}, {bytes_written} bytes written")
+            # hex() chỉ chạy khi mức DEBUG đang bật
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Sent command: %s, %s bytes written", command.hex(' ').upper(), bytes_written)
             return True
         except Exception as e:
             self.set_error(f"Error sending command: {str(e)}")
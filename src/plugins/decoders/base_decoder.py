@@ -6,14 +6,94 @@
 Methods to implement:
 - __init__(self, config=None): Initialize with optional configuration
 - init(self, config): Initialize or re-initialize with new configuration
-- decode(self, data): Abstract method to decode raw data
+- decode(self, data): Update statistics and decode raw data via _decode_impl
+- decode_all(self, data): Decode raw data into a list of all decoded records
+- _decode_impl(self, data): Abstract method doing the actual decoding
+- _cached_parse(self, data, parse): Parse raw data, reusing the result for repeated input
+- _feed / _rx_available / _consume / _rx_clear: Receive buffer for packets split across reads
+- _peek(self, offset, count): Zero-copy view of bytes in the receive buffer
+- _acquire_buf() / _release_buf(buf): Shared pool of receive buffers
 - get_status(self): Get status information
 - destroy(self): Clean up resources
 """
 
 import logging
+import queue
 import time
 from abc import ABC, abstractmethod
+from array import array
+from collections import deque
+
+
+def _str_byte_length(data):
+    """
+    Get the UTF-8 size of a string without encoding it when it is ASCII.
+
+    Args:
+        data (str): Text data
+
+    Returns:
+        int: Size in bytes
+    """
+    # Chuỗi ASCII: số ký tự bằng số byte UTF-8, không cần encode() chỉ để đếm
+    return len(data) if data.isascii() else len(data.encode('utf-8'))
+
+
+# Hàm tính kích thước theo kiểu dữ liệu thô: một lần tra dict thay cho chuỗi isinstance
+_SIZE_DISPATCH = {
+    bytes: len,
+    bytearray: len,
+    memoryview: lambda data: data.nbytes,
+    str: _str_byte_length,
+}
+
+# Chỉ số các bộ đếm trong BaseDecoder._stats
+_PACKETS_RECEIVED = 0
+_BYTES_RECEIVED = 1
+_PACKETS_DECODED = 2
+
+# Dung lượng cấp sẵn của bộ đệm nhận; bộ đệm chỉ lớn thêm khi dữ liệu chưa đọc vượt quá
+RX_BUFFER_SIZE = 1 << 16
+
+# Bộ đệm lớn hơn mức này không được giữ lại trong pool
+RX_POOL_MAX_BUFFER = 1 << 20
+
+# Số bộ đệm nhận tối đa được giữ lại trong pool dùng chung
+RX_POOL_SIZE = 32
+
+# Pool bộ đệm nhận dùng chung giữa các decoder (LIFO: bộ đệm vừa trả lại được dùng trước)
+_BUFFER_POOL = queue.LifoQueue(maxsize=RX_POOL_SIZE)
+
+
+def _acquire_buf():
+    """
+    Take a pre-sized receive buffer from the shared pool.
+
+    Returns:
+        bytearray: Pooled buffer, or a new one of RX_BUFFER_SIZE bytes when the pool is empty
+    """
+    try:
+        return _BUFFER_POOL.get_nowait()
+    except queue.Empty:
+        return bytearray(RX_BUFFER_SIZE)
+
+
+def _release_buf(buf):
+    """
+    Return a receive buffer to the shared pool.
+
+    The buffer keeps its size (its content is stale and overwritten by the
+    next owner); buffers that grew beyond RX_POOL_MAX_BUFFER are not kept.
+
+    Args:
+        buf (bytearray): Buffer that is no longer used by its decoder
+    """
+    if len(buf) > RX_POOL_MAX_BUFFER:
+        return
+    try:
+        _BUFFER_POOL.put_nowait(buf)
+    except queue.Full:
+        pass  # Pool đầy: để bộ đệm được thu hồi bình thường
 
 
 class BaseDecoder(ABC):
@@ -24,6 +104,17 @@ class BaseDecoder(ABC):
     and defines the interface for decoding data.
     """
     
+    _logger = logging.getLogger("BaseDecoder")
+    
+    def __init_subclass__(cls, **kwargs):
+        """Cache one logger per decoder class instead of looking it up per instance."""
+        super().__init_subclass__(**kwargs)
+        cls._logger = logging.getLogger(cls.__name__)
+        # Plugin theo API cũ override decode() và gọi super().decode() chỉ để cập nhật
+        # thống kê: cho chúng một _decode_impl không giải mã để vẫn khởi tạo được
+        if "decode" in cls.__dict__ and getattr(cls._decode_impl, "__isabstractmethod__", False):
+            cls._decode_impl = BaseDecoder._legacy_decode_impl
+    
     def __init__(self, config=None):
         """
         Initialize the base decoder with optional configuration.
@@ -32,15 +123,23 @@ class BaseDecoder(ABC):
             config (dict, optional): Configuration dictionary for the decoder
         """
         self.config = config if config is not None else {}
-        self.logger = logging.getLogger(self.__class__.__name__)
+        self.logger = type(self)._logger
         
-        # Statistics
-        self.packets_received = 0
-        self.bytes_received = 0
-        self.packets_decoded = 0
-        self.last_decode_time = None
-        self.errors = []
+        # Statistics: packets_received, bytes_received, packets_decoded
+        self._stats = array('Q', (0, 0, 0))
+        self._last_decode_ns = None
+        # Danh sách lỗi có giới hạn: deque(maxlen) bỏ lỗi cũ nhất với chi phí O(1)
+        self.errors = deque(maxlen=self.config.get("max_error_log", 100))
+        # Dict trạng thái dựng lại chỉ khi có thay đổi; None nghĩa là cần dựng lại
+        self._status_cache = None
         self.is_initialized = False
+        self._setup_dedup_cache()
+        # Bộ đệm nhận cho gói tin bị chia qua nhiều lần đọc, lấy từ pool ở lần _feed đầu tiên
+        # (decoder không nhận bytes thô thì không giữ bộ đệm); dữ liệu chưa đọc nằm
+        # trong _rx_buf[_rx_pos:_rx_len]
+        self._rx_buf = bytearray()
+        self._rx_pos = 0
+        self._rx_len = 0
 
         # --- SỬA ĐỔI BẮT ĐẦU ---
         # Không gọi self.init(config) từ đây nữa.
@@ -65,15 +164,62 @@ class BaseDecoder(ABC):
         self.config = config if config is not None else {}
         self.logger.info(f"Re-initializing {self.__class__.__name__} with new config.")
         # Reset stats or other relevant states if needed
-        self.packets_received = 0
-        self.bytes_received = 0
-        self.packets_decoded = 0
-        self.errors = []
+        self._stats = array('Q', (0, 0, 0))
+        self._last_decode_ns = None
+        self.errors = deque(maxlen=self.config.get("max_error_log", 100))
+        self._setup_dedup_cache()
         self.is_initialized = True
         return True
 
-    @abstractmethod
+    def _setup_dedup_cache(self):
+        """Read the enable_dedup_cache option and empty the parse cache."""
+        self.dedup_cache = bool(self.config.get("enable_dedup_cache", False))
+        self._last_raw = None
+        self._last_parse = None
+        self._last_parsed = None
+
     def decode(self, data):
+        """
+        Decode raw data into a structured format.
+
+        Updates the decoder statistics and delegates the actual decoding to
+        _decode_impl(), so subclasses cannot skip the bookkeeping. A list
+        result counts one decoded packet per item.
+
+        Args:
+            data (bytes, str, or dict): Raw data to decode
+
+        Returns:
+            ProcessedData or list[ProcessedData]: Decoded data, or None if decoding fails
+        """
+        self._update_stats(data)
+        result = self._decode_impl(data)
+        if result is not None:
+            self._stats[_PACKETS_DECODED] += len(result) if type(result) is list else 1
+            self._status_cache = None
+        return result
+
+    def decode_all(self, data):
+        """
+        Decode raw data and return every decoded record as one list.
+
+        Callers that consume all records at once get a list directly instead
+        of checking for None, a single object or a list. Subclasses can
+        override this to decode a whole chunk in one pass.
+
+        Args:
+            data (bytes, str, or dict): Raw data to decode
+
+        Returns:
+            list: Decoded records (empty if nothing could be decoded)
+        """
+        result = self.decode(data)
+        if result is None:
+            return []
+        return result if type(result) is list else [result]
+
+    @abstractmethod
+    def _decode_impl(self, data):
         """
         Decode raw data into a structured format. Must be implemented by subclasses.
 
@@ -83,32 +229,214 @@ class BaseDecoder(ABC):
         Returns:
             ProcessedData or list[ProcessedData]: Decoded data, or None if decoding fails
         """
-        # Basic tracking common to all decoders
-        self.packets_received += 1
-        if isinstance(data, (bytes, bytearray)):
-            self.bytes_received += len(data)
-        elif isinstance(data, str):
-             self.bytes_received += len(data.encode('utf-8')) # Ước tính
 
-        self.last_decode_time = time.time()
-        # Subclasses should implement the actual decoding logic
+    def _legacy_decode_impl(self, data):
+        """
+        _decode_impl for decoders that override decode() (older plugin API).
+
+        Such decoders call super().decode(data) for the statistics and decode
+        the data themselves, so nothing is decoded here.
+
+        Args:
+            data: Raw data
+
+        Returns:
+            None
+        """
+        return None
+
+    def _cached_parse(self, data, parse):
+        """
+        Parse raw data, reusing the previous result when the same input repeats.
+
+        Sensor streams often repeat identical idle frames. With the
+        enable_dedup_cache option, parse(data) is skipped when data equals the
+        previous input given to the same parse function. Only immutable inputs
+        (bytes, str) are cached, and the parsed value is shared between calls
+        so callers must not modify it.
+
+        Args:
+            data: Raw input
+            parse (callable): Function parsing the raw input
+
+        Returns:
+            Any: parse(data), possibly from the cache
+        """
+        data_type = type(data)
+        if not self.dedup_cache or (data_type is not bytes and data_type is not str):
+            return parse(data)
+
+        if data == self._last_raw and parse == self._last_parse:
+            return self._last_parsed
+
+        parsed = parse(data)
+        self._last_raw, self._last_parse, self._last_parsed = data, parse, parsed
+        return parsed
+
+    def _feed(self, data):
+        """
+        Copy raw bytes into the receive buffer at the write position.
+
+        The first call takes a pre-sized buffer from the shared pool, so no
+        allocation happens while the data fits.
+        When it does not, the unread bytes are first moved to the front, and
+        only if that is not enough the buffer grows to at least twice its size.
+
+        Args:
+            data (bytes or bytearray): Raw bytes
+        """
+        size = len(data)
+        end = self._rx_len + size
+        buf = self._rx_buf
+        if not buf:
+            buf = self._rx_buf = _acquire_buf()
+        if end > len(buf):
+            # Dồn phần chưa đọc về đầu bộ đệm
+            unread = self._rx_len - self._rx_pos
+            if self._rx_pos:
+                buf[:unread] = buf[self._rx_pos:self._rx_len]
+                self._rx_pos = 0
+                self._rx_len = unread
+                end = unread + size
+            if end > len(buf):
+                buf.extend(bytes(max(len(buf), end - len(buf))))
+        buf[self._rx_len:end] = data
+        self._rx_len = end
+
+    def _rx_available(self):
+        """
+        Get the number of unread bytes in the receive buffer.
+
+        Returns:
+            int: Unread byte count, starting at self._rx_pos
+        """
+        return self._rx_len - self._rx_pos
+
+    def _consume(self, count):
+        """
+        Mark bytes at the read position as processed.
+
+        Only the read position moves; once everything is read both positions go
+        back to the start. The space of the consumed prefix is reused by _feed.
+
+        Args:
+            count (int): Number of bytes consumed
+        """
+        self._rx_pos += count
+        if self._rx_pos >= self._rx_len:
+            self._rx_pos = self._rx_len = 0
+
+    def _peek(self, offset, count):
+        """
+        Get a zero-copy view of bytes in the receive buffer.
+
+        The buffer cannot be resized while a view exists, so release the view
+        (e.g. use it in a with block) before calling _feed or _consume.
+        For fixed-size fields prefer struct.unpack_from(fmt, self._rx_buf, offset).
+        Bytes past _rx_len are stale: searches in _rx_buf must stop at _rx_len.
+
+        Args:
+            offset (int): Absolute offset in the receive buffer
+            count (int): Number of bytes
+
+        Returns:
+            memoryview: View of the requested bytes
+        """
+        return memoryview(self._rx_buf)[offset:offset + count]
+
+    def _rx_clear(self):
+        """Discard everything in the receive buffer, keeping its capacity."""
+        self._rx_pos = self._rx_len = 0
+
+    def _update_stats(self, data):
+        """
+        Update the statistics common to all decoders for one decode() call.
+
+        Args:
+            data (bytes, str, or dict): Raw data passed to decode()
+        """
+        stats = self._stats
+        stats[_PACKETS_RECEIVED] += 1
+        # Other types (e.g. dict) are not counted in bytes_received
+        size_fn = _SIZE_DISPATCH.get(type(data))
+        if size_fn is not None:
+            stats[_BYTES_RECEIVED] += size_fn(data)
+
+        # Đồng hồ monotonic dạng int; chỉ đổi sang thời gian thực khi đọc last_decode_time
+        self._last_decode_ns = time.monotonic_ns()
+        self._status_cache = None
+
+    @property
+    def packets_received(self):
+        """int: Number of packets passed to decode()"""
+        return self._stats[_PACKETS_RECEIVED]
+
+    @packets_received.setter
+    def packets_received(self, value):
+        self._stats[_PACKETS_RECEIVED] = value
+        self._status_cache = None
+
+    @property
+    def bytes_received(self):
+        """int: Number of bytes passed to decode()"""
+        return self._stats[_BYTES_RECEIVED]
+
+    @bytes_received.setter
+    def bytes_received(self, value):
+        self._stats[_BYTES_RECEIVED] = value
+        self._status_cache = None
+
+    @property
+    def packets_decoded(self):
+        """int: Number of successfully decoded packets"""
+        return self._stats[_PACKETS_DECODED]
+
+    @packets_decoded.setter
+    def packets_decoded(self, value):
+        self._stats[_PACKETS_DECODED] = value
+        self._status_cache = None
+
+    @property
+    def is_initialized(self):
+        """bool: Whether the decoder is initialized"""
+        return self._is_initialized
+
+    @is_initialized.setter
+    def is_initialized(self, value):
+        self._is_initialized = value
+        self._status_cache = None
+
+    @property
+    def last_decode_time(self):
+        """float: Wall-clock time of the last decode() call, or None"""
+        if self._last_decode_ns is None:
+            return None
+        return time.time() - (time.monotonic_ns() - self._last_decode_ns) / 1e9
 
     def get_status(self):
         """
         Get the current status and statistics of the decoder.
 
+        The status is rebuilt only after the statistics, errors or
+        initialization state change; each call returns a shallow copy of it,
+        so callers may modify the result.
+
         Returns:
-            dict: Status information
-        """
-        return {
-            'decoder_type': self.__class__.__name__,
-            'packets_received': self.packets_received,
-            'bytes_received': self.bytes_received,
-            'packets_decoded': self.packets_decoded,
-            'last_decode_time': self.last_decode_time,
-            'is_initialized': self.is_initialized,
-            'errors': self.errors
-        }
+            dict: Status information ('errors' is a list)
+        """
+        status = self._status_cache
+        if status is None:
+            packets_received, bytes_received, packets_decoded = self._stats
+            status = self._status_cache = {
+                'decoder_type': self.__class__.__name__,
+                'packets_received': packets_received,
+                'bytes_received': bytes_received,
+                'packets_decoded': packets_decoded,
+                'last_decode_time': self.last_decode_time,
+                'is_initialized': self.is_initialized,
+                'errors': tuple(self.errors)
+            }
+        return {**status, 'errors': list(status['errors'])}
 
     def set_error(self, error_message):
         """
@@ -118,15 +446,14 @@ class BaseDecoder(ABC):
             error_message (str): The error message to log
         """
         self.logger.error(error_message)
+        # The deque drops the oldest error once max_error_log is reached
         self.errors.append(error_message)
-        # Optionally limit the size of the error list
-        max_errors = self.config.get("max_error_log", 100)
-        if len(self.errors) > max_errors:
-            self.errors.pop(0)
+        self._status_cache = None
 
     def clear_errors(self):
         """Clear the list of recorded errors."""
-        self.errors = []
+        self.errors.clear()
+        self._status_cache = None
 
     def destroy(self):
         """
@@ -136,6 +463,11 @@ class BaseDecoder(ABC):
             bool: True if successful, False otherwise
         """
         self.logger.info(f"Destroying {self.__class__.__name__}.")
+        # Trả bộ đệm nhận về pool; lần _feed kế tiếp (nếu có) lấy lại một bộ đệm
+        if self._rx_buf:
+            _release_buf(self._rx_buf)
+            self._rx_buf = bytearray()
+        self._rx_pos = self._rx_len = 0
         self.is_initialized = False
         # Subclasses can override to add specific cleanup logic
         return True
\ No newline at end of file
@@ -0,0 +1,273 @@
+# File: src/plugins/decoders/csv_batch.py
+# Purpose: Batch (multi-line) CSV parsing used by CustomDecoder.decode_batch/decode_columns
+
+"""
+Methods to implement:
+- column_plan(field_mapping, names): (column index, result field) pairs of the mapped columns
+- parse_columns(lines, plan, delimiter, split_line, quoted_fields): Extract the mapped columns of CSV lines
+- build_results(plan, columns, count, timestamp_format): One ProcessedData per row
+- build_batch(plan, columns, count, timestamp_format): One ProcessedDataBatch for all rows
+- timestamp_seconds(column, timestamp_format): Timestamp column -> epoch seconds
+- parse_timestamps(column, timestamp_format): Date/time strings -> epoch seconds
+"""
+
+import io
+import threading
+import time
+import logging
+import numpy as np
+from src.data.models import ProcessedData, ProcessedDataBatch
+
+# pandas (tùy chọn) cung cấp bộ parse CSV viết bằng C cho decode_batch
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+# StringIO riêng cho từng luồng, dùng lại cho mỗi lần đưa dữ liệu vào pandas
+_thread_local = threading.local()
+
+
+def _text_stream(text):
+    """
+    Get this thread's reusable StringIO holding the given text.
+    
+    Args:
+        text (str): Text to expose as a file object
+    
+    Returns:
+        io.StringIO: Stream positioned at the start of text
+    """
+    sio = getattr(_thread_local, "sio", None)
+    if sio is None:
+        sio = _thread_local.sio = io.StringIO()
+    sio.seek(0)
+    sio.truncate(0)
+    sio.write(text)
+    sio.seek(0)
+    return sio
+
+
+def column_plan(field_mapping, names):
+    """
+    Get the (column index, result field) pairs of the mapped CSV columns.
+    
+    Args:
+        field_mapping (dict): CSV column name -> ProcessedData field
+        names (list): Column names of the CSV data
+    
+    Returns:
+        list: (column index, result field) tuples
+    """
+    index = {name: i for i, name in enumerate(names)}
+    return [(index[csv_field], result_field)
+            for csv_field, result_field in field_mapping.items()
+            if csv_field in index and isinstance(result_field, str)]
+
+
+def parse_columns(lines, plan, delimiter, split_line, quoted_fields=False):
+    """
+    Extract the mapped columns from complete CSV lines.
+    
+    Uses the pandas C parser when available, then numpy.loadtxt for all-numeric
+    unquoted blocks, then a Python split of each line.
+    
+    Args:
+        lines (list): CSV lines without line endings
+        plan (list): (column index, result field) tuples from column_plan
+        delimiter (str): Field delimiter
+        split_line (callable): Quote-aware splitter, called as split_line(line, max_split)
+        quoted_fields (bool): Split every line with split_line, not only lines with a quote
+    
+    Returns:
+        list: One float64 array per numeric column, or a list of values
+              (numbers or strings) for other columns, per plan entry
+    """
+    indices = [index for index, _ in plan]
+    if not indices:
+        return []
+    
+    if PANDAS_AVAILABLE:
+        try:
+            # Bộ parse C của pandas tách và chuyển kiểu cả khối một lần, chỉ các cột cần
+            frame = pd.read_csv(_text_stream("\n".join(lines)), sep=delimiter, header=None,
+                                usecols=sorted(set(indices)), engine="c", na_filter=False,
+                                skipinitialspace=True)
+            return [frame[index].to_numpy(dtype=np.float64) if frame[index].dtype.kind in "fiu"
+                    else frame[index].tolist() for index in indices]
+        except Exception as e:
+            logging.debug("pandas CSV parse failed, using the Python parser: %s", e)
+    
+    # Khối có dấu ngoặc kép cần tách theo ngữ nghĩa CSV (như csv.reader trước đây)
+    quoted = quoted_fields or any('"' in line for line in lines)
+    if not quoted:
+        try:
+            # Không có pandas: bộ parse C của numpy.loadtxt cho khối toàn số;
+            # gặp giá trị không phải số hoặc dòng thiếu cột thì dùng parser Python
+            used = sorted(set(indices))
+            table = np.loadtxt(lines, delimiter=delimiter, usecols=used,
+                               dtype=np.float64, ndmin=2, comments=None)
+            position = {index: i for i, index in enumerate(used)}
+            return [table[:, position[index]] for index in indices]
+        except ValueError:
+            pass
+    
+    # Chỉ tách tới cột cần dùng cuối cùng; hàm dùng trong vòng lặp được gán vào
+    # biến cục bộ để tránh tra cứu lặp lại ở mỗi dòng
+    max_split = max(indices) + 1
+    if quoted:
+        rows = [split_line(line, max_split) for line in lines]
+    else:
+        split = str.split
+        rows = [split(line, delimiter, max_split) for line in lines]
+    strip = str.strip
+    columns = []
+    for index in indices:
+        column = [strip(row[index]) if index < len(row) else None for row in rows]
+        try:
+            # Chuyển cả cột chuỗi sang số trong một lần gọi C thay cho float() từng ô
+            column = np.asarray(column, dtype=np.float64)
+        except (ValueError, TypeError):
+            pass  # Cột có giá trị không phải số hoặc thiếu: giữ nguyên chuỗi
+        columns.append(column)
+    return columns
+
+
+def build_results(plan, columns, count, timestamp_format=None):
+    """
+    Build ProcessedData objects from parsed CSV columns.
+    
+    Args:
+        plan (list): (column index, result field) tuples
+        columns (list): One sequence of values per plan entry
+        count (int): Number of rows
+        timestamp_format (str, optional): strftime format of date/time timestamps
+    
+    Returns:
+        list[ProcessedData]: One object per row
+    """
+    results = [ProcessedData() for _ in range(count)]
+    
+    # Duyệt theo cột: mỗi field được ánh xạ một lần cho cả khối
+    to_float, set_value = float, setattr
+    for (_, result_field), column in zip(plan, columns):
+        if result_field == "timestamp" and not isinstance(column, np.ndarray):
+            # Cột thời gian có ô không phải số: ô số giữ nguyên, ô còn lại được phân
+            # tích như ngày giờ; ô lỗi giữ timestamp mặc định của ProcessedData
+            for result, value in zip(results, timestamp_seconds(column, timestamp_format).tolist()):
+                if value == value:
+                    result.timestamp = value
+            continue
+        if isinstance(column, np.ndarray):
+            # Cột đã chuyển sang float64: gán trực tiếp, không cần float() từng ô
+            for result, value in zip(results, column.tolist()):
+                set_value(result, result_field, value)
+            continue
+        for result, value in zip(results, column):
+            try:
+                set_value(result, result_field, to_float(value))
+            except (ValueError, TypeError):
+                # If not a number, store as string in additional_values
+                result.additional_values[result_field] = value
+    
+    return results
+
+
+def build_batch(plan, columns, count, timestamp_format=None):
+    """
+    Build a columnar batch from parsed CSV columns.
+    
+    Args:
+        plan (list): (column index, result field) tuples
+        columns (list): One sequence of values per plan entry
+        count (int): Number of rows
+        timestamp_format (str, optional): strftime format of date/time timestamps
+    
+    Returns:
+        ProcessedDataBatch: One array per mapped field
+    """
+    values = {}
+    for (_, result_field), column in zip(plan, columns):
+        try:
+            values[result_field] = np.asarray(column, dtype=np.float64)
+        except (ValueError, TypeError):
+            # Cột có giá trị không phải số được giữ nguyên dạng object
+            values[result_field] = np.asarray(column, dtype=object)
+    
+    timestamps = values.pop("timestamp", None)
+    if timestamps is None:
+        timestamps = np.full(count, time.time())
+    elif timestamps.dtype != np.float64:
+        # Cột thời gian có ô không phải số; chỉ dòng lỗi (NaN) lấy giờ hiện tại
+        timestamps = timestamp_seconds(timestamps, timestamp_format)
+        missing = np.isnan(timestamps)
+        if missing.any():
+            timestamps[missing] = time.time()
+    
+    return ProcessedDataBatch(timestamps=timestamps, values=values)
+
+
+def timestamp_seconds(column, timestamp_format=None):
+    """
+    Convert a timestamp column holding non-numeric cells into epoch seconds.
+    
+    Cells that float() accepts keep their numeric value; only the other
+    cells are parsed as date/time strings with parse_timestamps, so a
+    blank or bad cell does not turn the numeric rows into parse failures.
+    
+    Args:
+        column (sequence): Timestamp values (numbers or strings)
+        timestamp_format (str, optional): strftime format of date/time timestamps
+    
+    Returns:
+        numpy.ndarray: float64 seconds, NaN where a value cannot be parsed
+    """
+    seconds = np.full(len(column), np.nan)
+    pending = []
+    for i, value in enumerate(column):
+        try:
+            seconds[i] = float(value)
+        except (ValueError, TypeError):
+            pending.append(i)
+    
+    if pending:
+        seconds[pending] = parse_timestamps([column[i] for i in pending], timestamp_format)
+    return seconds
+
+
+def parse_timestamps(column, timestamp_format=None):
+    """
+    Parse a column of date/time strings into epoch seconds in one pass.
+    
+    pandas.to_datetime is used when available (with timestamp_format if it
+    is set); otherwise numpy parses ISO 8601 strings as datetime64. Times
+    without a zone are taken as UTC.
+    
+    Args:
+        column (sequence): Timestamp strings
+        timestamp_format (str, optional): strftime format for pandas
+    
+    Returns:
+        numpy.ndarray: float64 seconds since epoch, NaN where a value cannot be parsed
+    """
+    if PANDAS_AVAILABLE:
+        parsed = pd.to_datetime(pd.Series(column, dtype=object), format=timestamp_format,
+                                errors="coerce", utc=True)
+        return (parsed - pd.Timestamp(0, tz="UTC")).dt.total_seconds().to_numpy(dtype=np.float64)
+    
+    column = np.asarray(column, dtype=object)
+    try:
+        stamps = column.astype("datetime64[ns]")
+    except (ValueError, TypeError):
+        # Có giá trị lỗi: phân tích từng giá trị, giá trị lỗi thành NaT
+        stamps = np.empty(len(column), dtype="datetime64[ns]")
+        for i, value in enumerate(column):
+            try:
+                stamps[i] = np.datetime64(value, "ns")
+            except (ValueError, TypeError):
+                stamps[i] = np.datetime64("NaT")
+    
+    seconds = stamps.astype(np.int64) / 1e9
+    seconds[np.isnat(stamps)] = np.nan
+    return seconds
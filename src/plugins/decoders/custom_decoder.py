@@ -6,17 +6,83 @@
 Methods to implement:
 - __init__(self, config=None): Initialize with optional configuration
 - init(self, config): Initialize or re-initialize with new configuration
-- decode(self, data): Decode raw data into structured format
+- _decode_impl(self, data): Decode raw data into structured format
+- decode_batch(self, data): Decode a chunk of CSV text holding many lines
+- decode_all(self, data): Decode a whole CSV or binary chunk into a list
+- decode_columns(self, data): Decode a chunk of CSV text into a columnar batch
+- decode_binary_columns(self, data): Decode all buffered binary records into a columnar batch
+- _map_fields(self, data, result): Map JSON fields through the pre-flattened mapping plan
 - destroy(self): Clean up resources
 """
 
 import json
-import csv
-import io
+import re
 import struct
+import time
 import logging
+import numpy as np
 from src.plugins.decoders.base_decoder import BaseDecoder
-from src.data.models import ProcessedData
+from src.plugins.decoders import csv_batch
+from src.data.models import ProcessedData, ProcessedDataBatch
+
+# Thứ tự trường mặc định của một bản ghi nhị phân (binary_format)
+BINARY_FIELDS = ("timestamp", "roll", "pitch", "yaw", "accel_x", "accel_y", "accel_z",
+                 "gyro_x", "gyro_y", "gyro_z")
+
+# Loại numpy của các mã struct dạng số
+_STRUCT_KINDS = {code: "i" for code in "bhilqn"}
+_STRUCT_KINDS.update({code: "u" for code in "BHILQN"})
+_STRUCT_KINDS.update({"e": "f", "f": "f", "d": "f", "?": "b"})
+
+
+def _struct_to_dtype(binary_format):
+    """
+    Translate a struct format of numeric fields into a numpy structured dtype.
+    
+    Fields are named f0, f1, ... and keep the struct offsets (including native
+    alignment), so np.frombuffer reads the same values as struct.unpack.
+    
+    Args:
+        binary_format (str): struct format string
+        
+    Returns:
+        numpy.dtype: Structured dtype, or None if the format has non-numeric fields
+    """
+    fmt = binary_format.replace(" ", "")
+    order = fmt[0] if fmt[:1] in ("@", "=", "<", ">", "!") else "@"
+    byteorder = {"<": "<", ">": ">", "!": ">"}.get(order, "=")
+    
+    codes = []
+    for count, code in re.findall(r"(\d*)(\D)", fmt.lstrip("@=<>!")):
+        if code != "x" and code not in _STRUCT_KINDS:
+            return None
+        codes.extend(code * int(count or 1))
+    
+    names, formats, offsets = [], [], []
+    prefix = order
+    for code in codes:
+        size = struct.calcsize(order + code)
+        if code != "x":
+            names.append(f"f{len(names)}")
+            formats.append(f"{byteorder}{_STRUCT_KINDS[code]}{size}")
+            # Vị trí trường = kích thước phần trước (kể cả padding căn chỉnh)
+            offsets.append(struct.calcsize(prefix + code) - size)
+        prefix += code
+    
+    return np.dtype({"names": names, "formats": formats, "offsets": offsets,
+                     "itemsize": struct.calcsize(binary_format)})
+
+
+# orjson (tùy chọn) phân tích JSON bằng C trực tiếp trên bytes UTF-8
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _JSON_ERRORS = (json.JSONDecodeError, orjson.JSONDecodeError)
+    ORJSON_AVAILABLE = True
+except ImportError:
+    _json_loads = json.loads
+    _JSON_ERRORS = (json.JSONDecodeError,)
+    ORJSON_AVAILABLE = False
 
 
 class CustomDecoder(BaseDecoder):
@@ -27,6 +93,13 @@ class CustomDecoder(BaseDecoder):
     Format is specified via configuration.
     """
     
+    # Tên phương thức giải mã theo format, được gắn sẵn bởi _bind_format
+    _DISPATCH = {
+        "csv": "_decode_csv",
+        "json": "_decode_json",
+        "binary": "_decode_binary",
+    }
+    
     def __init__(self, config=None):
         """
         Initialize the custom decoder with optional configuration.
@@ -47,18 +120,38 @@ class CustomDecoder(BaseDecoder):
         self.has_header = True
         self.delimiter = ","
         self.binary_format = "<fffffffff"
-        self.buffer = bytearray()
+        self.binary_batch = False
+        self.quoted_fields = False
+        self.timestamp_format = None
 
         # Đọc config một cách an toàn để cập nhật giá trị mặc định
         self.format = effective_config.get('format', self.format).lower()
+        # format "auto": định dạng được nhận dạng ở lần decode đầu tiên rồi giữ cố định
+        self._auto_format = self.format == "auto"
         self.field_mapping = effective_config.get("field_mapping", self.field_mapping)
         self.has_header = effective_config.get("has_header", self.has_header)
         self.delimiter = effective_config.get("delimiter", self.delimiter)
         self.binary_format = effective_config.get("binary_format", self.binary_format)
+        self.binary_batch = effective_config.get("binary_batch", self.binary_batch)
+        self.quoted_fields = effective_config.get("quoted_fields", self.quoted_fields)
+        self.timestamp_format = effective_config.get("timestamp_format", self.timestamp_format)
+        # Với reuse_result, decode() từng bản ghi điền lại cùng một ProcessedData;
+        # kết quả chỉ hợp lệ tới lần decode() kế tiếp
+        self._reused_result = ProcessedData() if effective_config.get("reuse_result", False) else None
+        self._delim_b = self.delimiter.encode()
+        self._bind_format()
+        # binary_format sai chỉ được ghi lỗi; decode nhị phân sau đó trả None
+        self._compile_binary_format()
+        self._csv_token_re = None
+        self._csv_token_delimiter = None
+
+        # Trạng thái luồng của decode_batch: header đã đọc và dữ liệu chưa hoàn chỉnh
+        self._reset_csv_stream()
 
         # Thiết lập mapping mặc định nếu cần
         if not self.field_mapping and self.format in ["csv", "json"]:
             self._setup_default_field_mapping()
+        self._mapping_plan = self._compile_mapping(self.field_mapping)
 
         self.logger.info(f"Custom decoder initialized with format={self.format}")
 
@@ -81,19 +174,103 @@ class CustomDecoder(BaseDecoder):
 
         # Update parameters from config
         # Giá trị mặc định giờ lấy từ self.<attribute> đã được gán trong __init__
-        self.format = effective_config.get("format", self.format).lower()
+        # Định dạng đã tự nhận dạng không phải là cấu hình: nếu config không có
+        # "format" thì quay lại chế độ auto và nhận dạng lại ở lần decode kế tiếp
+        default_format = "auto" if self._auto_format else self.format
+        self.format = effective_config.get("format", default_format).lower()
+        self._auto_format = self.format == "auto"
         self.field_mapping = effective_config.get("field_mapping", self.field_mapping)
         self.has_header = effective_config.get("has_header", self.has_header)
         self.delimiter = effective_config.get("delimiter", self.delimiter)
         self.binary_format = effective_config.get("binary_format", self.binary_format)
+        self.binary_batch = effective_config.get("binary_batch", self.binary_batch)
+        self.quoted_fields = effective_config.get("quoted_fields", self.quoted_fields)
+        self.timestamp_format = effective_config.get("timestamp_format", self.timestamp_format)
+        # Với reuse_result, decode() từng bản ghi điền lại cùng một ProcessedData;
+        # kết quả chỉ hợp lệ tới lần decode() kế tiếp
+        self._reused_result = ProcessedData() if effective_config.get("reuse_result", False) else None
+        self._delim_b = self.delimiter.encode()
+        self._bind_format()
+        binary_ok = self._compile_binary_format()
+        self._reset_csv_stream()
 
         # Cập nhật lại field mapping mặc định nếu cần
         if not self.field_mapping and self.format in ["csv", "json"]:
              self._setup_default_field_mapping()
+        self._mapping_plan = self._compile_mapping(self.field_mapping)
 
         self.logger.info(f"Custom decoder re-initialized with format={self.format}")
+        return binary_ok
+
+    def _compile_binary_format(self):
+        """
+        Compile binary_format once instead of parsing it on every record.
+        
+        Only done when the format is binary; an invalid binary_format is
+        recorded with set_error instead of raising.
+        
+        Returns:
+            bool: False if the format is binary and binary_format is invalid
+        """
+        self._binary_struct = None
+        self._record_size = 0
+        self._binary_dtype = None
+        if self.format != "binary":
+            return True
+        
+        try:
+            self._binary_struct = struct.Struct(self.binary_format)
+        except struct.error as e:
+            self.set_error(f"Invalid binary_format {self.binary_format!r}: {str(e)}")
+            return False
+        self._record_size = self._binary_struct.size
+        self._binary_dtype = _struct_to_dtype(self.binary_format)
         return True
 
+    def _split_csv_line(self, line, max_split=-1):
+        """
+        Split one CSV line into fields.
+        
+        Plain str.split is used for lines without a double quote; a line with
+        one (or every line with quoted_fields set) goes through a regex
+        tokenizer, compiled once per delimiter, that handles double-quoted
+        fields containing the delimiter and "" escapes, as csv.reader did.
+        
+        Args:
+            line (str): CSV line without line ending
+            max_split (int): Maximum number of splits for the plain split (default: all)
+            
+        Returns:
+            list: Field strings
+        """
+        if not self.quoted_fields and '"' not in line:
+            return line.split(self.delimiter, max_split)
+        
+        if self._csv_token_delimiter != self.delimiter:
+            delimiter = re.escape(self.delimiter)
+            # Mỗi match: một delimiter rồi một trường (trong ngoặc kép hoặc không)
+            self._csv_token_re = re.compile(f'{delimiter}(?:"((?:[^"]|"")*)"|([^{delimiter}]*))')
+            self._csv_token_delimiter = self.delimiter
+        
+        return [quoted.replace('""', '"') if quoted is not None else plain
+                for quoted, plain in (match.groups() for match in
+                                      self._csv_token_re.finditer(self.delimiter + line))]
+    
+    def _reset_csv_stream(self):
+        """Forget the CSV header and the buffered incomplete data of the stream."""
+        self._csv_header = None
+        self._rx_clear()
+        # Kế hoạch đọc cột của decode_batch, dựng lại khi header/số cột thay đổi
+        self._csv_plan_key = None
+        self._csv_plan = []
+        # Header của decode() từng dòng, lưu theo chính dòng header để khỏi tách lại
+        self._row_header_line = None
+        self._row_header = None
+        # Với dữ liệu bytes: dòng header dạng bytes và (chỉ số cột, tên cột) của các cột được ánh xạ
+        self._row_header_bytes = None
+        self._row_fields = []
+        self._headerless_names = []
+
     def _setup_default_field_mapping(self):
         """Helper to set default field mapping based on format."""
         if self.format == "csv":
@@ -112,7 +289,7 @@ class CustomDecoder(BaseDecoder):
                 "magnetometer": {"x": "mag_x", "y": "mag_y", "z": "mag_z"}
             }
     
-    def decode(self, data):
+    def _decode_impl(self, data):
         """
         Decode raw data into a structured format based on the configured format.
         
@@ -126,28 +303,57 @@ class CustomDecoder(BaseDecoder):
             ValueError: If the data cannot be decoded
         """
         try:
-            # Call parent's decode method for counting and validation
-            super().decode(data)
-            
-            # Auto-detect format if set to "auto"
-            if self.format == "auto":
-                self._auto_detect_format(data)
-            
-            # Decode based on format
-            if self.format == "csv":
-                return self._decode_csv(data)
-            elif self.format == "json":
-                return self._decode_json(data)
-            elif self.format == "binary":
-                return self._decode_binary(data)
-            else:
-                self.set_error(f"Unsupported format: {self.format}")
-                return None
-                
+            # Hàm giải mã đã được chọn theo format khi cấu hình (xem _bind_format)
+            return self._decode_format(data)
         except Exception as e:
             self.set_error(f"Error decoding data: {str(e)}")
             return None
     
+    def _bind_format(self):
+        """
+        Bind the decode method for the current format.
+        
+        Called whenever self.format changes, so decoding a message needs no
+        comparison of format strings.
+        """
+        method = self._DISPATCH.get(self.format)
+        if method is not None:
+            self._decode_format = getattr(self, method)
+        elif self.format == "auto":
+            self._decode_format = self._decode_auto
+        else:
+            self._decode_format = self._decode_unsupported
+    
+    def _decode_auto(self, data):
+        """
+        Detect the format from the data, then decode it with the matching method.
+        
+        Args:
+            data (bytes, str, or dict): Raw data to decode
+            
+        Returns:
+            ProcessedData: Decoded data, or None if the format cannot be detected
+        """
+        self._auto_detect_format(data)
+        if self.format == "auto":
+            return self._decode_unsupported(data)
+        self._compile_binary_format()
+        self._bind_format()
+        return self._decode_format(data)
+    
+    def _decode_unsupported(self, data):
+        """
+        Report data in a format that cannot be decoded.
+        
+        Args:
+            data: Raw data
+            
+        Returns:
+            None
+        """
+        self.set_error(f"Unsupported format: {self.format}")
+        return None
+    
     def _auto_detect_format(self, data):
         """
         Attempt to auto-detect the data format.
@@ -162,7 +368,8 @@ class CustomDecoder(BaseDecoder):
             self.format = "json"
         elif isinstance(data, str):
             # Check if it's a JSON string
-            if data.strip().startswith("{") and data.strip().endswith("}"):
+            text = data.strip()
+            if text[:1] == "{" and text[-1:] == "}":
                 self.format = "json"
             else:
                 # Assume CSV if it contains commas or tabs
@@ -173,11 +380,25 @@ class CustomDecoder(BaseDecoder):
                         self.delimiter = "\t"
                     else:
                         self.delimiter = ","
+                    self._delim_b = self.delimiter.encode()
         elif isinstance(data, (bytes, bytearray)):
             self.format = "binary"
         
         self.logger.debug(f"Auto-detected format: {self.format}")
     
+    def _new_result(self):
+        """
+        Get the ProcessedData object to fill for a single decoded record.
+        
+        Returns:
+            ProcessedData: The reset shared object with reuse_result, otherwise a new one
+        """
+        result = self._reused_result
+        if result is None:
+            return ProcessedData()
+        result.reset()
+        return result
+    
     def _decode_csv(self, data):
         """
         Decode CSV data into a ProcessedData object.
@@ -188,59 +409,251 @@ class CustomDecoder(BaseDecoder):
         Returns:
             ProcessedData: Decoded data
         """
-        # Convert bytes to string if necessary
-        if isinstance(data, (bytes, bytearray)):
-            data = data.decode('utf-8')
-        
-        # Process CSV data
-        csv_reader = csv.DictReader(io.StringIO(data), delimiter=self.delimiter) if self.has_header else None
-        
-        if csv_reader:
-            # Get the first row if header exists
-            row = next(csv_reader, None)
-        else:
-            # Split the line and create a dictionary
-            fields = data.strip().split(self.delimiter)
-            fieldnames = [f"field{i}" for i in range(len(fields))]
-            row = dict(zip(fieldnames, fields))
+        # Dòng giống hệt dòng trước (khung idle lặp lại) dùng lại kết quả phân tích
+        row = self._cached_parse(data, self._parse_csv_row)
         
         if not row:
             return None
         
         # Create ProcessedData object and map fields
-        result = ProcessedData()
+        result = self._new_result()
+        additional_values = result.additional_values
+        to_float = float
         
         for csv_field, result_field in self.field_mapping.items():
-            if csv_field in row:
+            value = row.get(csv_field)
+            if value is not None:
                 try:
-                    value = float(row[csv_field])
-                    setattr(result, result_field, value)
+                    setattr(result, result_field, to_float(value))
                 except (ValueError, TypeError):
                     # If not a number, store as string in additional_values
-                    if not hasattr(result, "additional_values"):
-                        result.additional_values = {}
-                    result.additional_values[result_field] = row[csv_field]
+                    additional_values[result_field] = value
         
         return result
     
-    def _decode_json(self, data):
+    def _parse_csv_row(self, data):
         """
-        Decode JSON data into a ProcessedData object.
+        Parse CSV data into a row dictionary.
+        
+        With has_header the first line is the header and the second line the
+        row. Fields are split with _split_csv_line (quote-aware when the line
+        contains a double quote), and the split header is reused while the
+        header line stays the same.
         
         Args:
-            data (str or dict): JSON data
+            data (str or bytes): CSV data
             
         Returns:
-            ProcessedData: Decoded data
+            dict: Field name -> string value, or None if there is no row
         """
-        # Parse JSON if it's a string
         if isinstance(data, (bytes, bytearray)):
+            if self.has_header and not self.quoted_fields and b'"' not in data:
+                return self._parse_csv_row_bytes(data)
+            # Convert bytes to string if necessary
             data = data.decode('utf-8')
         
+        if self.has_header:
+            lines = [line for line in data.splitlines() if line]
+            if len(lines) < 2:
+                return None
+            header_line = lines[0]
+            if header_line != self._row_header_line:
+                self._row_header_line = header_line
+                self._row_header = self._split_csv_line(header_line)
+            return dict(zip(self._row_header, self._split_csv_line(lines[1])))
+        
+        # Split the line and create a dictionary; field names are built once and reused
+        fields = self._split_csv_line(data.strip())
+        if len(self._headerless_names) < len(fields):
+            self._headerless_names = [f"field{i}" for i in range(len(fields))]
+        return dict(zip(self._headerless_names, fields))
+    
+    def _parse_csv_row_bytes(self, data):
+        """
+        Parse a header line and a row from bytes without decoding the payload.
+        
+        The lines are split as bytes and only the fields named in field_mapping
+        are decoded. The header is split again only when its line changes.
+        
+        Args:
+            data (bytes): CSV data with a header line
+            
+        Returns:
+            dict: Mapped field name -> string value, or None if there is no row
+        """
+        lines = [line for line in data.splitlines() if line]
+        if len(lines) < 2:
+            return None
+        
+        header_line = lines[0]
+        if header_line != self._row_header_bytes:
+            self._row_header_bytes = header_line
+            mapping = self.field_mapping
+            self._row_fields = [(index, name) for index, name in
+                                enumerate(header_line.decode('utf-8').split(self.delimiter))
+                                if name in mapping]
+        
+        fields = lines[1].split(self._delim_b)
+        count = len(fields)
+        return {name: fields[index].decode('utf-8') for index, name in self._row_fields if index < count}
+    
+    def decode_batch(self, data):
+        """
+        Decode a chunk of CSV text holding any number of lines.
+        
+        All complete lines of the chunk are parsed in one pass, with the pandas
+        C parser when it is available. An incomplete last line is kept and
+        completed by the next chunk. With has_header, the first line of the
+        stream is the header for all later chunks.
+        
+        Args:
+            data (str or bytes): CSV text chunk
+            
+        Returns:
+            list[ProcessedData]: One object per complete data line
+        """
+        return self._decode_csv_lines(self._take_csv_lines(data), self._csv_header)
+    
+    def _decode_csv_lines(self, lines, header):
+        """
+        Decode complete CSV data lines into ProcessedData objects.
+        
+        Args:
+            lines (list): CSV data lines without line endings
+            header (list): Column names, or None to name columns field0, field1, ...
+            
+        Returns:
+            list[ProcessedData]: One object per line
+        """
+        if not lines:
+            return []
+        
+        try:
+            plan = self._csv_batch_plan(header, lines[0])
+            columns = self._parse_csv_columns(lines, plan)
+            results = csv_batch.build_results(plan, columns, len(lines), self.timestamp_format)
+        except Exception as e:
+            self.set_error(f"Error decoding CSV batch: {str(e)}")
+            return []
+        
+        self.packets_decoded += len(results)
+        return results
+    
+    def decode_columns(self, data):
+        """
+        Decode a chunk of CSV text into a columnar batch.
+        
+        Same input handling as decode_batch, but the result holds one numpy
+        array per mapped field instead of one ProcessedData object per line.
+        
+        Args:
+            data (str or bytes): CSV text chunk
+            
+        Returns:
+            ProcessedDataBatch: Decoded columns, or None if no line is complete
+        """
+        lines = self._take_csv_lines(data)
+        if not lines:
+            return None
+        
+        try:
+            plan = self._csv_batch_plan(self._csv_header, lines[0])
+            columns = self._parse_csv_columns(lines, plan)
+            batch = csv_batch.build_batch(plan, columns, len(lines), self.timestamp_format)
+        except Exception as e:
+            self.set_error(f"Error decoding CSV batch: {str(e)}")
+            return None
+        
+        self.packets_decoded += len(batch)
+        return batch
+    
+    def _take_csv_lines(self, data):
+        """
+        Buffer a CSV chunk and return its complete data lines.
+        
+        Args:
+            data (str or bytes): CSV text chunk
+            
+        Returns:
+            list: Non-empty complete lines, without the stream header
+        """
+        self._update_stats(data)
+        
         if isinstance(data, str):
+            data = data.encode('utf-8')
+        
+        # Dữ liệu nối vào bộ đệm nhận; chỉ phần tới ký tự xuống dòng cuối cùng được
+        # giải mã, phần đuôi chưa hoàn chỉnh nằm yên trong bộ đệm (không sao chép lại)
+        self._feed(data)
+        start = self._rx_pos
+        end = self._rx_buf.rfind(b"\n", start, self._rx_len)
+        if end < 0:
+            return []
+        with self._peek(start, end - start) as view:
+            text = str(view, 'utf-8')
+        self._consume(end + 1 - start)
+        lines = [line for line in text.splitlines() if line.strip()]
+        
+        if self.has_header and self._csv_header is None and lines:
+            self._csv_header = [name.strip() for name in self._split_csv_line(lines.pop(0))]
+        
+        return lines
+    
+    def _csv_batch_plan(self, header, first_line):
+        """
+        Get the (column index, result field) pairs of the mapped CSV columns.
+        
+        The plan is built once per header (or per column count without a
+        header) and reused, so rows are read by index without name lookups.
+        
+        Args:
+            header (list): Column names, or None for a headerless stream
+            first_line (str): First data line of the batch
+            
+        Returns:
+            list: (column index, result field) tuples
+        """
+        key = header
+        if key is None:
+            key = len(self._split_csv_line(first_line))
+        
+        if key != self._csv_plan_key:
+            names = key if isinstance(key, list) else [f"field{i}" for i in range(key)]
+            self._csv_plan = csv_batch.column_plan(self.field_mapping, names)
+            self._csv_plan_key = key
+        
+        return self._csv_plan
+    
+    def _parse_csv_columns(self, lines, plan):
+        """
+        Extract the mapped columns from complete CSV lines (see csv_batch.parse_columns).
+        
+        Args:
+            lines (list): CSV lines without line endings
+            plan (list): (column index, result field) tuples from _csv_batch_plan
+            
+        Returns:
+            list: One float64 array or list of values per plan entry
+        """
+        return csv_batch.parse_columns(lines, plan, self.delimiter, self._split_csv_line,
+                                       self.quoted_fields)
+    
+    def _decode_json(self, data):
+        """
+        Decode JSON data into a ProcessedData object.
+        
+        Args:
+            data (str or dict): JSON data
+            
+        Returns:
+            ProcessedData: Decoded data
+        """
+        # Parse JSON if it's a string (orjson and json.loads both accept UTF-8 bytes directly)
+        if isinstance(data, (bytes, bytearray, str)):
             try:
-                data = json.loads(data)
-            except json.JSONDecodeError as e:
+                # Chuỗi JSON lặp lại dùng lại dict đã phân tích
+                data = self._cached_parse(data, _json_loads)
+            except _JSON_ERRORS as e:
                 self.set_error(f"Invalid JSON: {str(e)}")
                 return None
         
@@ -249,42 +662,175 @@ class CustomDecoder(BaseDecoder):
             return None
         
         # Create ProcessedData object
-        result = ProcessedData()
+        result = self._new_result()
         
         # Map fields from JSON to ProcessedData
-        self._map_fields(data, self.field_mapping, result)
+        self._map_fields(data, result)
         
         return result
     
     def _decode_binary(self, data):
         """
-        Decode binary data into a ProcessedData object.
+        Decode binary data into ProcessedData objects.
+        
+        One record is decoded per call, or with binary_batch every complete
+        record in the buffer is unpacked in one iter_unpack pass.
         
         Args:
             data (bytes): Binary data
             
         Returns:
-            ProcessedData: Decoded data
+            ProcessedData or list[ProcessedData]: Decoded data (a list with binary_batch)
         """
+        if self._binary_struct is None:
+            self.set_error(f"Invalid binary_format: {self.binary_format!r}")
+            return None
+        
         # Add to buffer
         if isinstance(data, (bytes, bytearray)):
-            self.buffer.extend(data)
+            self._feed(data)
         
-        # Calculate expected size based on binary_format
-        expected_size = struct.calcsize(self.binary_format)
+        record_size = self._record_size
+        available = self._rx_available()
         
         # Check if we have enough data
-        if len(self.buffer) < expected_size:
+        if available < record_size:
             return None
         
-        # Extract data from buffer
-        values = struct.unpack(self.binary_format, self.buffer[:expected_size])
+        if self.binary_batch:
+            return self._unpack_binary_records()
+        
+        # Extract data from buffer at the read position
+        values = self._binary_struct.unpack_from(self._rx_buf, self._rx_pos)
         
         # Remove processed data from buffer
-        self.buffer = self.buffer[expected_size:]
+        self._consume(record_size)
+        
+        return self._binary_record_to_result(values, self._new_result())
+    
+    def _unpack_binary_records(self):
+        """
+        Unpack all complete binary records in the receive buffer.
+        
+        Returns:
+            list[ProcessedData]: One object per record
+        """
+        if self._binary_struct is None:
+            self.set_error(f"Invalid binary_format: {self.binary_format!r}")
+            return []
         
+        record_size = self._record_size
+        available = self._rx_available()
+        size = available - available % record_size
+        if not size:
+            return []
+        
+        # Tất cả bản ghi hoàn chỉnh được giải nén trong một lần gọi C
+        with self._peek(self._rx_pos, size) as view:
+            records = list(self._binary_struct.iter_unpack(view))
+        self._consume(size)
+        return [self._binary_record_to_result(values) for values in records]
+    
+    def decode_all(self, data):
+        """
+        Decode a chunk and return all decoded records as a list.
+        
+        A CSV chunk is decoded on its own like decode(): with has_header its
+        first line is the header, and a last line without a line ending is
+        decoded too. Unlike decode_batch(), no header or partial line is kept
+        between calls. Binary chunks yield every complete record in one pass
+        (as with binary_batch); other formats decode one message.
+        
+        Args:
+            data (str, bytes or dict): Raw data chunk
+            
+        Returns:
+            list[ProcessedData]: Decoded records
+        """
+        if self.format == "csv":
+            self._update_stats(data)
+            if isinstance(data, (bytes, bytearray)):
+                data = bytes(data).decode('utf-8')
+            lines = [line for line in data.splitlines() if line.strip()]
+            header = None
+            if self.has_header and lines:
+                header = [name.strip() for name in self._split_csv_line(lines.pop(0))]
+            return self._decode_csv_lines(lines, header)
+        if self.format != "binary":
+            return super().decode_all(data)
+        
+        self._update_stats(data)
+        if isinstance(data, (bytes, bytearray)):
+            self._feed(data)
+        try:
+            results = self._unpack_binary_records()
+        except Exception as e:
+            self.set_error(f"Error decoding binary data: {str(e)}")
+            return []
+        self.packets_decoded += len(results)
+        return results
+    
+    def decode_binary_columns(self, data):
+        """
+        Decode every complete binary record in the buffer into a columnar batch.
+        
+        The records are copied out of the receive buffer with one
+        np.frombuffer call. Values are named after BINARY_FIELDS, extra values
+        value_10, value_11, ...
+        
+        Args:
+            data (bytes): Binary data
+            
+        Returns:
+            ProcessedDataBatch: Decoded columns, or None if no record is complete
+        """
+        self._update_stats(data)
+        if isinstance(data, (bytes, bytearray)):
+            self._feed(data)
+        
+        if self._binary_struct is None:
+            self.set_error(f"Invalid binary_format: {self.binary_format!r}")
+            return None
+        if self._binary_dtype is None:
+            self.set_error(f"binary_format {self.binary_format!r} has non-numeric fields")
+            return None
+        
+        count = self._rx_available() // self._record_size
+        if count == 0:
+            return None
+        
+        size = count * self._record_size
+        with self._peek(self._rx_pos, size) as view:
+            # copy(): mảng không được giữ tham chiếu tới bộ đệm nhận
+            records = np.frombuffer(view, dtype=self._binary_dtype).copy()
+        self._consume(size)
+        
+        names = self._binary_dtype.names
+        values = {}
+        for i, name in enumerate(names):
+            field_name = BINARY_FIELDS[i] if i < len(BINARY_FIELDS) else f"value_{i}"
+            values[field_name] = records[name].astype(np.float64)
+        timestamps = values.pop("timestamp", None)
+        if timestamps is None:
+            timestamps = np.full(count, time.time())
+        
+        self.packets_decoded += count
+        return ProcessedDataBatch(timestamps=timestamps, values=values)
+    
+    def _binary_record_to_result(self, values, result=None):
+        """
+        Convert one unpacked binary record into a ProcessedData object.
+        
+        Args:
+            values (tuple): Values unpacked with binary_format
+            result (ProcessedData, optional): Object to fill instead of a new one
+            
+        Returns:
+            ProcessedData: Decoded data
+        """
         # Create ProcessedData object
-        result = ProcessedData()
+        if result is None:
+            result = ProcessedData()
         
         # Assuming standard format: timestamp, roll, pitch, yaw, ax, ay, az, gx, gy, gz
         # Adjust according to your binary_format
@@ -309,41 +855,58 @@ class CustomDecoder(BaseDecoder):
         
         return result
     
-    def _map_fields(self, data, mapping, result, prefix=""):
+    @staticmethod
+    def _compile_mapping(mapping, path=()):
+        """
+        Flatten a (nested) field mapping into a list of source paths.
+        
+        Args:
+            mapping (dict): Field mapping; a dict value maps the fields of a nested object
+            path (tuple): Keys leading to this mapping level
+            
+        Returns:
+            list: (source key path tuple, destination field) tuples
+        """
+        plan = []
+        for src_field, dst_field in mapping.items():
+            if isinstance(dst_field, dict):
+                plan.extend(CustomDecoder._compile_mapping(dst_field, path + (src_field,)))
+            else:
+                plan.append((path + (src_field,), dst_field))
+        return plan
+    
+    def _map_fields(self, data, result):
         """
-        Recursively map fields from a nested dictionary to a ProcessedData object.
+        Map fields from a (nested) dictionary to a ProcessedData object.
+        
+        Walks the flat plan built from field_mapping by _compile_mapping, so no
+        recursion or per-field type checks of the mapping are needed.
         
         Args:
             data (dict): Source data
-            mapping (dict): Field mapping
             result (ProcessedData): Destination object
-            prefix (str): Prefix for nested fields
         """
-        for src_field, dst_field in mapping.items():
-            # Full field name with prefix
-            full_src_field = f"{prefix}{src_field}"
+        additional_values = result.additional_values
+        number_types = (int, float)
+        
+        for path, dst_field in self._mapping_plan:
+            # Đi theo đường dẫn khóa; thiếu khóa hoặc không phải object thì bỏ qua trường
+            value = data
+            try:
+                for key in path:
+                    value = value[key]
+            except (KeyError, TypeError, IndexError):
+                continue
             
-            # Handle nested dictionaries
-            if isinstance(dst_field, dict) and full_src_field in data and isinstance(data[full_src_field], dict):
-                self._map_fields(data[full_src_field], dst_field, result)
-            # Handle simple field mapping
-            elif full_src_field in data:
+            if not isinstance(value, number_types):
+                # Try to convert to float
                 try:
-                    value = data[full_src_field]
-                    if isinstance(value, (int, float)):
-                        setattr(result, dst_field, value)
-                    else:
-                        # Try to convert to float
-                        try:
-                            value = float(value)
-                            setattr(result, dst_field, value)
-                        except (ValueError, TypeError):
-                            # If not a number, store as string in additional_values
-                            if not hasattr(result, "additional_values"):
-                                result.additional_values = {}
-                            result.additional_values[dst_field] = value
-                except Exception as e:
-                    self.logger.warning(f"Error mapping field {full_src_field} to {dst_field}: {str(e)}")
+                    value = float(value)
+                except (ValueError, TypeError):
+                    # If not a number, store as string in additional_values
+                    additional_values[dst_field] = value
+                    continue
+            setattr(result, dst_field, value)
     
     def destroy(self):
         """
@@ -352,9 +915,8 @@ class CustomDecoder(BaseDecoder):
         Returns:
             bool: True if successful, False otherwise
         """
-        # Clear buffer
-        self.buffer = bytearray()
-        
+        # The receive buffer is returned to the shared pool by BaseDecoder.destroy()
+        self._reset_csv_stream()
         return super().destroy()
 
 
@@ -6,7 +6,7 @@
 Methods to implement:
 - __init__(self, config=None): Initialize with optional configuration
 - init(self, config): Initialize or re-initialize with new configuration
-- decode(self, data): Decode WitMotion raw data into structured format
+- _decode_impl(self, data): Decode WitMotion raw data into structured format
 - destroy(self): Clean up resources
 """
 
@@ -56,9 +56,6 @@ class WitMotionDecoder(BaseDecoder):
             0x54: "magnetometer"
         }
 
-        # Buffer
-        self.buffer = bytearray()
-
         self.logger.info(f"WitMotion decoder initialized with acc_range={self.acc_range}g, "
                          f"gyro_range={self.gyro_range}°/s, angle_range={self.angle_range}°")
 
@@ -89,7 +86,7 @@ class WitMotionDecoder(BaseDecoder):
 
         return True
     
-    def decode(self, data):
+    def _decode_impl(self, data):
         """
         Decode WitMotion raw data into structured format.
         
@@ -103,17 +100,14 @@ class WitMotionDecoder(BaseDecoder):
             ValueError: If the data cannot be decoded
         """
         try:
-            # Call parent's decode method for counting and validation
-            super().decode(data)
-            
             # Add data to buffer
             if isinstance(data, (bytes, bytearray)):
-                self.buffer.extend(data)
+                self._feed(data)
             else:
                 # If data is not bytes or bytearray, try to convert it
                 try:
                     if isinstance(data, dict) and "raw_bytes" in data:
-                        self.buffer.extend(data["raw_bytes"])
+                        self._feed(data["raw_bytes"])
                     else:
                         self.logger.warning(f"Unexpected data type: {type(data)}")
                         return None
@@ -137,65 +131,63 @@ class WitMotionDecoder(BaseDecoder):
         Returns:
             ProcessedData: Decoded data or None if no complete packet
         """
+        buffer = self._rx_buf
+        
         # Need at least 11 bytes for a complete packet (1 header + 1 frame marker + 8 data + 1 checksum)
-        while len(self.buffer) >= 11:
+        while self._rx_available() >= 11:
+            pos = self._rx_pos
+            
             # Find packet start (0x55 is the header byte for WitMotion)
-            if self.buffer[0] != 0x55:
+            if buffer[pos] != 0x55:
                 # Discard bytes until we find a header
-                for i in range(1, len(self.buffer)):
-                    if self.buffer[i] == 0x55:
-                        self.buffer = self.buffer[i:]
-                        break
-                else:
+                start = buffer.find(0x55, pos + 1, self._rx_len)
+                if start < 0:
                     # No header found, clear buffer
-                    self.buffer.clear()
+                    self._rx_clear()
                     return None
-            
-            # Check if we still have enough bytes for a packet
-            if len(self.buffer) < 11:
-                return None
+                self._consume(start - pos)
+                continue
                 
             # Extract frame marker (data type)
-            frame_marker = self.buffer[1]
+            frame_marker = buffer[pos + 1]
             
             # Check if frame marker is valid
             if frame_marker not in self.frame_markers:
                 # Invalid frame marker, discard this byte and continue
-                self.buffer = self.buffer[1:]
+                self._consume(1)
                 continue
             
-            # Extract data bytes (8 bytes)
-            data_bytes = self.buffer[2:10]
-            
-            # Calculate checksum (sum of all bytes except checksum)
-            calculated_checksum = sum(self.buffer[0:10]) & 0xFF
-            received_checksum = self.buffer[10]
+            # Calculate checksum (sum of all bytes except checksum), đọc qua memoryview không sao chép
+            with self._peek(pos, 10) as packet_view:
+                calculated_checksum = sum(packet_view) & 0xFF
+            received_checksum = buffer[pos + 10]
             
             # Verify checksum
             if calculated_checksum != received_checksum:
                 self.logger.warning(f"Checksum mismatch: expected {calculated_checksum}, got {received_checksum}")
                 # Discard this packet and continue
-                self.buffer = self.buffer[11:]
+                self._consume(11)
                 continue
             
-            # Decode data based on frame marker
-            result = self._decode_packet(frame_marker, data_bytes)
+            # Decode data based on frame marker; the 8 data bytes start at pos + 2
+            result = self._decode_packet(frame_marker, buffer, pos + 2)
             
-            # Remove processed packet from buffer
-            self.buffer = self.buffer[11:]
+            # Remove processed packet from buffer (chỉ dời vị trí đọc, không sao chép)
+            self._consume(11)
             
             return result
         
         # Not enough data for a complete packet
         return None
     
-    def _decode_packet(self, frame_marker, data_bytes):
+    def _decode_packet(self, frame_marker, data_bytes, offset=0):
         """
         Decode a single packet based on its frame marker.
         
         Args:
             frame_marker (int): Frame marker indicating data type
-            data_bytes (bytes): Data bytes to decode
+            data_bytes (bytes or bytearray): Buffer holding the data bytes
+            offset (int): Position of the data bytes in data_bytes (default: 0)
             
         Returns:
             ProcessedData: Decoded data
@@ -206,7 +198,7 @@ class WitMotionDecoder(BaseDecoder):
         # Decode based on frame marker
         if frame_marker == 0x51:  # Acceleration
             # WitMotion format: 3 int16 values for ax, ay, az
-            ax, ay, az = struct.unpack('<hhh', data_bytes[0:6])
+            ax, ay, az = struct.unpack_from('<hhh', data_bytes, offset)
             
             # Convert to g (±self.acc_range)
             factor = self.acc_range / 32768.0
@@ -216,7 +208,7 @@ class WitMotionDecoder(BaseDecoder):
             
         elif frame_marker == 0x52:  # Angular velocity
             # WitMotion format: 3 int16 values for gx, gy, gz
-            gx, gy, gz = struct.unpack('<hhh', data_bytes[0:6])
+            gx, gy, gz = struct.unpack_from('<hhh', data_bytes, offset)
             
             # Convert to °/s (±self.gyro_range)
             factor = self.gyro_range / 32768.0
@@ -226,7 +218,7 @@ class WitMotionDecoder(BaseDecoder):
             
         elif frame_marker == 0x53:  # Orientation
             # WitMotion format: 3 int16 values for roll, pitch, yaw
-            roll, pitch, yaw = struct.unpack('<hhh', data_bytes[0:6])
+            roll, pitch, yaw = struct.unpack_from('<hhh', data_bytes, offset)
             
             # Convert to degrees (±self.angle_range)
             factor = self.angle_range / 32768.0
@@ -236,7 +228,7 @@ class WitMotionDecoder(BaseDecoder):
             
         elif frame_marker == 0x54:  # Magnetometer
             # WitMotion format: 3 int16 values for mx, my, mz
-            mx, my, mz = struct.unpack('<hhh', data_bytes[0:6])
+            mx, my, mz = struct.unpack_from('<hhh', data_bytes, offset)
             
             # Magnetometer values already in proper units
             result.mag_x = mx
@@ -252,9 +244,7 @@ class WitMotionDecoder(BaseDecoder):
         Returns:
             bool: True if successful, False otherwise
         """
-        # Clear buffer
-        self.buffer = bytearray()
-        
+        # The receive buffer is returned to the shared pool by BaseDecoder.destroy()
         return super().destroy()
 
 
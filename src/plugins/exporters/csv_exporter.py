@@ -11,6 +11,7 @@ Methods to implement:
 
 import os
 import csv
+import json
 import logging
 import time
 from datetime import datetime
@@ -105,7 +106,9 @@ class CSVExporter(BaseExporter):
             rows = self._prepare_data(data)
             
             # Write data to file
-            with open(export_path, 'w', newline='') as csvfile:
+            # Buffer lớn để giảm số lần ghi khi xuất nhiều dòng; không cần os.fsync
+            # vì file export không yêu cầu ghi xuyên xuống đĩa ngay lập tức
+            with open(export_path, 'w', buffering=1 << 20, newline='') as csvfile:
                 writer = csv.writer(
                     csvfile,
                     delimiter=export_config.get('delimiter', ','),
@@ -113,9 +116,8 @@ class CSVExporter(BaseExporter):
                     quoting=csv.QUOTE_MINIMAL
                 )
                 
-                # Write rows
-                for row in rows:
-                    writer.writerow(row)
+                # Write rows (writerows định dạng toàn bộ trong C, không lặp writerow ở Python)
+                writer.writerows(rows)
             
             # Update export count
             self.export_count += 1
@@ -192,18 +194,16 @@ class CSVExporter(BaseExporter):
         Returns:
             str: Formatted value
         """
+        # Số và chuỗi được csv.writer định dạng trực tiếp
+        if isinstance(value, (int, float, str)):
+            return value
+        
         # Format datetime objects
         if isinstance(value, datetime):
             return value.strftime(self.config.get('datetime_format', "%Y-%m-%d %H:%M:%S.%f"))
         
-        # Convert dictionaries to JSON string
-        if isinstance(value, dict):
-            import json
-            return json.dumps(value)
-        
-        # Convert lists to string
-        if isinstance(value, list):
-            import json
+        # Convert dictionaries and lists to JSON string
+        if isinstance(value, (dict, list)):
             return json.dumps(value)
         
         return value
@@ -208,39 +208,40 @@ class TimeSeriesVisualizer(BaseVisualizer):
         self.timestamps.append(timestamp)
         
         # Process each field
+        # init() đã tạo deque cho mọi field, nên không cần setdefault (vốn tạo một deque
+        # mới mỗi lần gọi) hay kiểm tra `in` riêng trước khi đọc giá trị
+        data_series = self.data_series
         for field in self.fields:
+            series = data_series[field]
+            value = data.get(field)
             # Skip fields not in data
-            if field not in data:
+            if value is None:
                 # Add None to maintain alignment with timestamps
-                self.data_series.setdefault(field, deque(maxlen=self.max_points)).append(None)
+                series.append(None)
                 continue
             
             try:
                 # Get the data value, convert to float
-                value = float(data[field])
+                value = float(value)
                 
                 # Add to data series
-                self.data_series.setdefault(field, deque(maxlen=self.max_points)).append(value)
+                series.append(value)
                 
-                # Update statistics
-                values = [v for v in self.data_series[field] if v is not None]
-                if values:
-                    self.stats[field]['min'] = min(values)
-                    self.stats[field]['max'] = max(values)
-                    self.stats[field]['mean'] = sum(values) / len(values)
-                    
-                    # Calculate standard deviation
-                    if len(values) > 1:
-                        mean = self.stats[field]['mean']
-                        variance = sum((x - mean) ** 2 for x in values) / len(values)
-                        self.stats[field]['std'] = variance ** 0.5
-                    else:
-                        self.stats[field]['std'] = 0.0
+                # Update statistics bằng các phép rút gọn NumPy thay vì vòng lặp Python
+                values = np.array(series, dtype=np.float64)
+                values = values[~np.isnan(values)]
+                if values.size:
+                    field_stats = self.stats[field]
+                    field_stats['min'] = float(values.min())
+                    field_stats['max'] = float(values.max())
+                    field_stats['mean'] = float(values.mean())
+                    # Population standard deviation (ddof=0)
+                    field_stats['std'] = float(values.std()) if values.size > 1 else 0.0
             
             except (ValueError, TypeError) as e:
                 self.logger.debug(f"Error processing field {field}: {str(e)}")
                 # Add None to maintain alignment with timestamps
-                self.data_series.setdefault(field, deque(maxlen=self.max_points)).append(None)
+                series.append(None)
         
         # Prepare visualization data for UI
         viz_data = {
@@ -9,6 +9,8 @@ Methods to implement:
 - start_engine(self): Start the engine
 - stop_engine(self): Stop the engine
 - setup_dashboard(self): Setup dashboard area
+- _deferred_init(self): Setup dashboard after the window is shown
+- set_data_bridge(self, data_bridge): Set the DataBridge connected once the dashboard exists
 - update_dashboard(self, data): Update dashboard with data
 - update_monitor(self, stats): Update system monitor
 """
@@ -16,6 +18,7 @@ Methods to implement:
 import logging
 import os
 import sys
+import threading
 import traceback
 from PyQt6.QtWidgets import (
     QMainWindow, QTabWidget, QWidget, QVBoxLayout,
@@ -23,8 +26,8 @@ from PyQt6.QtWidgets import (
     QPushButton, QMessageBox, QDialog, QListWidget,
     QListWidgetItem, QDialogButtonBox
 )
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QIcon, QAction
+from PyQt6.QtCore import Qt, QTimer, QSettings
+from PyQt6.QtGui import QIcon, QAction, QActionGroup
 
 # Import dashboard components
 from src.ui.dashboard.dashboard_manager import DashboardManager
@@ -65,6 +68,8 @@ class MainWindow(QMainWindow):
         self.update_timer = QTimer(self)
         self.update_timer.timeout.connect(self.update_ui)
         self.engine_adapter = None # Khởi tạo là None
+        self.data_bridge = None
+        self.current_theme = None
 
         # --- THÊM TRY-EXCEPT BAO QUANH _setup_ui ---
         try:
@@ -79,8 +84,54 @@ class MainWindow(QMainWindow):
             # Có thể raise lỗi ở đây để Engine biết init thất bại hoàn toàn
             raise # Re-raise lỗi để Engine bắt được
 
+        # Restore window geometry/state and theme from the previous session
+        self.load_settings()
+
+        # Dashboard (widget factories, visualizer imports) được dựng sau khi
+        # event loop chạy, để cửa sổ chính hiển thị trước
+        QTimer.singleShot(0, self._deferred_init)
+
+        # Import trước các module nặng ở thread nền trong lúc người dùng thao tác
+        threading.Thread(target=self._warm_imports, daemon=True).start()
+
         self.logger.info("MainWindow initialized.")
 
+    def _warm_imports(self):
+        """
+        Import modules used lazily by the visualizers so the first use does not stall the UI.
+        """
+        try:
+            # numpy.fft được numpy nạp lười, FFTWidget cần nó ở lần cập nhật đầu tiên
+            import numpy.fft  # noqa: F401
+        except Exception as e:
+            self.logger.debug(f"Background import failed: {str(e)}")
+
+    def set_data_bridge(self, data_bridge):
+        """
+        Set the DataBridge to connect to this window.
+
+        The bridge is connected by _deferred_init, after the dashboard is built,
+        or right away if the dashboard already exists.
+
+        Args:
+            data_bridge: DataBridge instance
+        """
+        self.data_bridge = data_bridge
+        if self.dashboard_manager is not None:
+            data_bridge.connect_to_ui(self)
+
+    def _deferred_init(self):
+        """
+        Build the parts of the UI that are not needed for the first paint.
+        """
+        if self.dashboard_manager is None:
+            self.setup_dashboard()
+
+        # Kết nối DataBridge SAU KHI dashboard đã setup
+        if self.data_bridge is not None:
+            self.logger.debug("Connecting DataBridge to UI...")
+            self.data_bridge.connect_to_ui(self)
+
     
     def _setup_ui(self):
         """
@@ -240,13 +291,17 @@ class MainWindow(QMainWindow):
         # Add theme options
         theme_menu = view_menu.addMenu("&Theme")
         
-        dark_theme_action = QAction("&Dark", self)
-        dark_theme_action.triggered.connect(lambda: self._apply_theme("dark"))
-        theme_menu.addAction(dark_theme_action)
+        # Một slot duy nhất cho cả nhóm thay vì một lambda cho mỗi action
+        self.theme_group = QActionGroup(self)
+        self.theme_group.setExclusive(True)
+        self.theme_group.triggered.connect(self._on_theme_group_triggered)
         
-        light_theme_action = QAction("&Light", self)
-        light_theme_action.triggered.connect(lambda: self._apply_theme("light"))
-        theme_menu.addAction(light_theme_action)
+        for label, theme_name in (("&Dark", "dark"), ("&Light", "light")):
+            theme_action = QAction(label, self)
+            theme_action.setCheckable(True)
+            theme_action.setData(theme_name)
+            self.theme_group.addAction(theme_action)
+            theme_menu.addAction(theme_action)
         
         # Add refresh action
         refresh_action = QAction("&Refresh", self)
@@ -313,6 +368,9 @@ class MainWindow(QMainWindow):
         Args:
             theme (str): Theme name ('dark' or 'light')
         """
+        self.current_theme = theme
+        for action in self.theme_group.actions():
+            action.setChecked(action.data() == theme)
         # Basic theming
         if theme == 'dark':
             self.setStyleSheet("""
@@ -327,6 +385,50 @@ class MainWindow(QMainWindow):
         else:  # light theme is default
             self.setStyleSheet("")  # Use system default
     
+    def _on_theme_group_triggered(self, action):
+        """
+        Handle selection of a theme action from the theme group.
+        
+        Args:
+            action (QAction): The triggered action, carrying the theme name in its data
+        """
+        theme = action.data()
+        if theme and theme != self.current_theme:
+            self._apply_theme(theme)
+
+    def save_settings(self):
+        """
+        Persist window geometry, window state and theme.
+
+        Window values are grouped under "window" and the store is synced once,
+        so the backing store (the registry on Windows) is written in one pass.
+        """
+        settings = QSettings("IMUAnalyzer", "IMUAnalyzer")
+        settings.beginGroup("window")
+        settings.setValue("geometry", self.saveGeometry())
+        settings.setValue("state", self.saveState())
+        settings.endGroup()
+        settings.setValue("theme", self.current_theme)
+        settings.sync()
+
+    def load_settings(self):
+        """
+        Restore window geometry, window state and theme saved by save_settings().
+        """
+        settings = QSettings("IMUAnalyzer", "IMUAnalyzer")
+        settings.beginGroup("window")
+        geometry = settings.value("geometry")
+        state = settings.value("state")
+        settings.endGroup()
+        theme = settings.value("theme")
+
+        if geometry is not None:
+            self.restoreGeometry(geometry)
+        if state is not None:
+            self.restoreState(state)
+        if theme in ("dark", "light") and theme != self.current_theme:
+            self._apply_theme(theme)
+
     def set_engine_adapter(self, engine_adapter):
         """
         Set the engine adapter for interacting with the backend.
@@ -650,33 +752,7 @@ class MainWindow(QMainWindow):
         
         This method is called when the Export CSV button is clicked.
         """
-        if self.engine_adapter:
-            try:
-                # Default export path
-                export_path = "exports/data.csv"
-                
-                # Make sure directory exists
-                os.makedirs(os.path.dirname(export_path), exist_ok=True)
-                
-                # Call engine adapter to export
-                if hasattr(self.engine_adapter, 'export_data'):
-                    if self.engine_adapter.export_data("csv", export_path):
-                        self.status_label.setText(f"Status: Exported to {export_path}")
-                        self.logger.info(f"Data exported to CSV: {export_path}")
-                        QMessageBox.information(self, "Export Complete", f"Data exported to {export_path}")
-                    else:
-                        self.status_label.setText("Status: Export failed")
-                        self.logger.warning("Failed to export data to CSV")
-                else:
-                    self.status_label.setText("Status: CSV export not implemented")
-                    self.logger.warning("CSV export not implemented in engine adapter")
-            except Exception as e:
-                self.logger.error(f"Error exporting to CSV: {str(e)}")
-                self.status_label.setText("Status: Export failed")
-                QMessageBox.critical(self, "Error", f"Failed to export to CSV: {str(e)}")
-        else:
-            self.logger.warning("No engine adapter available")
-            self.status_label.setText("Status: No engine")
+        self._export_data("csv", "exports/data.csv")
     
     def export_json(self):
         """
@@ -684,30 +760,38 @@ class MainWindow(QMainWindow):
         
         This method is called when the Export JSON button is clicked.
         """
+        self._export_data("json", "exports/data.json")
+    
+    def _export_data(self, export_format, export_path):
+        """
+        Export data through the engine adapter.
+        
+        Args:
+            export_format (str): Export format ('csv' or 'json')
+            export_path (str): Output file path
+        """
+        format_name = export_format.upper()
         if self.engine_adapter:
             try:
-                # Default export path
-                export_path = "exports/data.json"
-                
                 # Make sure directory exists
                 os.makedirs(os.path.dirname(export_path), exist_ok=True)
                 
                 # Call engine adapter to export
                 if hasattr(self.engine_adapter, 'export_data'):
-                    if self.engine_adapter.export_data("json", export_path):
+                    if self.engine_adapter.export_data(export_format, export_path):
                         self.status_label.setText(f"Status: Exported to {export_path}")
-                        self.logger.info(f"Data exported to JSON: {export_path}")
+                        self.logger.info(f"Data exported to {format_name}: {export_path}")
                         QMessageBox.information(self, "Export Complete", f"Data exported to {export_path}")
                     else:
                         self.status_label.setText("Status: Export failed")
-                        self.logger.warning("Failed to export data to JSON")
+                        self.logger.warning(f"Failed to export data to {format_name}")
                 else:
-                    self.status_label.setText("Status: JSON export not implemented")
-                    self.logger.warning("JSON export not implemented in engine adapter")
+                    self.status_label.setText(f"Status: {format_name} export not implemented")
+                    self.logger.warning(f"{format_name} export not implemented in engine adapter")
             except Exception as e:
-                self.logger.error(f"Error exporting to JSON: {str(e)}")
+                self.logger.error(f"Error exporting to {format_name}: {str(e)}")
                 self.status_label.setText("Status: Export failed")
-                QMessageBox.critical(self, "Error", f"Failed to export to JSON: {str(e)}")
+                QMessageBox.critical(self, "Error", f"Failed to export to {format_name}: {str(e)}")
         else:
             self.logger.warning("No engine adapter available")
             self.status_label.setText("Status: No engine")
@@ -738,6 +822,9 @@ class MainWindow(QMainWindow):
         # Stop engine
         self.stop_engine()
         
+        # Persist window settings for the next session
+        self.save_settings()
+        
         # Accept close event
         event.accept()
         
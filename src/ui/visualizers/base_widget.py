@@ -9,6 +9,7 @@ Methods to implement in derived classes:
 - set_position(self, position): Set widget position
 - set_size(self, size): Set widget size
 - get_config(self): Get widget configuration
+- set_sensor_id(self, sensor_id): Set the sensor shown by the widget
 """
 
 from PyQt6.QtWidgets import QFrame, QVBoxLayout, QLabel, QPushButton, QMenu
@@ -29,6 +30,9 @@ class BaseWidget(QFrame):
     config_changed = pyqtSignal(dict)  # Emitted when widget configuration changes
     widget_closed = pyqtSignal()  # Emitted when widget is closed
     
+    # Sensor gắn với widget, khai báo sẵn ở mức class thay vì gán động từ DashboardManager
+    sensor_id = None
+    
     def __init__(self, parent=None, config=None):
         """
         Initialize the base widget.
@@ -159,6 +163,15 @@ class BaseWidget(QFrame):
         """
         return self.config
     
+    def set_sensor_id(self, sensor_id):
+        """
+        Set the sensor this widget displays.
+        
+        Args:
+            sensor_id (str): Sensor ID
+        """
+        self.sensor_id = sensor_id
+    
     def set_config(self, config):
         """
         Set the widget configuration.
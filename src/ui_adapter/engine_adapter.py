@@ -39,10 +39,9 @@ class EngineAdapter:
         """
         self.engine = engine
         
-        # Nếu có main_window, thiết lập dashboard
+        # Nếu có main_window, gắn adapter (dashboard được MainWindow dựng sau khi hiển thị)
         if hasattr(engine, 'main_window') and engine.main_window:
             engine.main_window.set_engine_adapter(self)
-            engine.main_window.setup_dashboard()
         
         self.logger.info("Engine set in adapter")
     
@@ -206,9 +205,12 @@ class EngineAdapter:
             if not isinstance(init_sequence, list):
                 return False
             
-            # Each element must be a string
+            # Each element must be a string or a group (list) of strings
             for cmd in init_sequence:
-                if not isinstance(cmd, str):
+                if isinstance(cmd, list):
+                    if not all(isinstance(part, str) for part in cmd):
+                        return False
+                elif not isinstance(cmd, str):
                     return False
         
         return True
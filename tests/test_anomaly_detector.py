@@ -0,0 +1,251 @@
+# File: tests/test_anomaly_detector.py
+# Purpose: Unit tests for the AnomalyDetector analyzer
+
+import json
+import unittest
+import sys
+import os
+import numpy as np
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.plugins.analyzers.anomaly_detector import AnomalyDetector, _update_window_stats, _batch_window_stats
+from src.data.models import ProcessedData
+
+
+class TestAnomalyDetector(unittest.TestCase):
+    """Tests for the AnomalyDetector class"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.config = {
+            "threshold": 3.0,
+            "window_size": 20,
+            "min_window_size": 10,
+            "fields": ["accel_x", "accel_y", "accel_z"]
+        }
+        self.detector = AnomalyDetector(self.config)
+
+    def _sample(self, x, y=0.0, z=1.0):
+        """Build a raw sample dictionary"""
+        return {"id": "proc_1", "sensor_id": "imu_1", "timestamp": 0.0,
+                "accel_x": x, "accel_y": y, "accel_z": z}
+
+    def test_initialization(self):
+        """Test detector initialization"""
+        self.assertTrue(self.detector.initialized)
+        self.assertEqual(self.detector.window_size, 20)
+        self.assertEqual(self.detector.min_window_size, 10)
+
+    def test_window_statistics_match_numpy(self):
+        """Running statistics should match a full recomputation over the window"""
+        rng = np.random.default_rng(0)
+        values = rng.normal(0.0, 1.0, 55)
+        for value in values:
+            self.detector.analyze(self._sample(float(value)))
+
+        window = values[-20:]
+        index = self.detector.field_index["accel_x"]
+        self.assertAlmostEqual(self.detector.means[index], np.mean(window), places=9)
+        self.assertAlmostEqual(self.detector.stds[index], np.std(window), places=9)
+
+    def test_scalar_kernel_matches_numpy_path(self):
+        """The scalar (Numba-compilable) kernel gives the same statistics as the NumPy path"""
+        detector = AnomalyDetector({**self.config, "use_numba": False})
+        window = np.zeros((20, 3))
+        heads, counts = np.zeros(3, dtype=np.int64), np.zeros(3, dtype=np.int64)
+        stats = np.zeros((3, 3))
+        rng = np.random.default_rng(1)
+        for i, row in enumerate(rng.normal(5.0, 2.0, (47, 3))):
+            valid = np.array([True, i % 3 != 0, True])
+            sample = self._sample(*row.tolist())
+            if not valid[1]:
+                del sample["accel_y"]
+            detector.analyze(sample)
+            _update_window_stats(window, heads, counts, row, valid, *stats)
+
+        np.testing.assert_array_equal(counts, detector.window_counts)
+        np.testing.assert_allclose(stats[0], detector.means, rtol=1e-12)
+        np.testing.assert_allclose(stats[2], detector.stds, rtol=1e-9)
+
+    def test_scalar_and_vector_push_agree(self):
+        """The scalar push used for a few fields matches the vectorized NumPy push"""
+        scalar = AnomalyDetector({**self.config, "use_numba": False})
+        vector = AnomalyDetector({**self.config, "use_numba": False})
+        rng = np.random.default_rng(2)
+        for i, row in enumerate(rng.normal(0.0, 1.0, (45, 3))):
+            valid = np.array([True, True, i % 4 != 0])
+            scalar._push(row.copy(), valid)
+            with patch("src.plugins.analyzers.anomaly_detector.SCALAR_MAX_FIELDS", 0):
+                vector._push(row.copy(), valid)
+
+        np.testing.assert_array_equal(scalar.window_counts, vector.window_counts)
+        np.testing.assert_allclose(scalar.means, vector.means, rtol=1e-12)
+        np.testing.assert_allclose(scalar.stds, vector.stds, rtol=1e-9)
+
+    def test_statistics_stable_with_large_offset(self):
+        """Std stays accurate when values have a large offset and small spread"""
+        rng = np.random.default_rng(3)
+        values = 1e8 + rng.normal(0.0, 1e-3, 75)
+        for value in values:
+            self.detector.analyze(self._sample(float(value)))
+
+        index = self.detector.field_index["accel_x"]
+        self.assertAlmostEqual(self.detector.stds[index] / np.std(values[-20:]), 1.0, places=4)
+
+    def test_no_analysis_before_min_window(self):
+        """No anomalies are reported until the minimum window is filled"""
+        for i in range(9):
+            result = self.detector.analyze(self._sample(float(i % 3)))
+            self.assertEqual(result.results["anomalies"], {})
+
+    def test_detects_spike(self):
+        """A large spike is reported as an anomaly"""
+        for i in range(20):
+            self.detector.analyze(self._sample(0.1 * (i % 2)))
+
+        result = self.detector.analyze(self._sample(50.0))
+        self.assertTrue(result.results["anomalies"]["accel_x"]["is_anomaly"])
+        self.assertEqual(result.anomaly_score, 1.0)
+        self.assertEqual(result.prediction, "Significant Anomaly")
+
+        record = result.results["anomalies"]["accel_x"]
+        self.assertEqual(set(record), {"value", "mean", "std", "z_score", "anomaly_score", "is_anomaly"})
+        self.assertEqual((record.get("value"), record.get("missing")), (50.0, None))
+        self.assertIn("z_score", record)
+        exported = json.loads(json.dumps(result.to_dict()))
+        self.assertEqual(exported["results"]["anomalies"]["accel_x"], dict(record))
+
+    def test_missing_field_is_skipped(self):
+        """A missing field is left out of the result while other fields are analyzed"""
+        for i in range(12):
+            self.detector.analyze(self._sample(float(i % 3), float(i % 2)))
+        sample = self._sample(1.0, 0.0)
+        del sample["accel_z"]
+        result = self.detector.analyze(sample)
+        self.assertIn("accel_x", result.results["anomalies"])
+        self.assertNotIn("accel_z", result.results["anomalies"])
+
+    def test_missing_field_keeps_its_statistics(self):
+        """Samples without a field leave that field's window and std unchanged"""
+        rng = np.random.default_rng(6)
+        for y in rng.normal(0.0, 1.0, 20):
+            self.detector.analyze(self._sample(0.0, float(y)))
+        std = self.detector.stds[1]
+        for i in range(15):
+            sample = self._sample(float(i % 2))
+            del sample["accel_y"]
+            self.detector.analyze(sample)
+
+        self.assertEqual(self.detector.stds[1], std)
+        self.assertEqual(self.detector.window_counts.tolist(), [20, 20, 20])
+        result = self.detector.analyze(self._sample(0.0, self.detector.means[1] + 2.5 * std))
+        self.assertFalse(result.results["anomalies"]["accel_y"]["is_anomaly"])
+
+    def test_processed_data_input(self):
+        """ProcessedData fields are read directly from attributes"""
+        for i in range(20):
+            self.detector.analyze(ProcessedData(sensor_id="imu_1", accel_x=0.1 * (i % 2), accel_z=1.0))
+
+        data = ProcessedData(sensor_id="imu_1", accel_x=50.0, accel_z=1.0)
+        result = self.detector.analyze(data)
+        self.assertEqual(result.sensor_id, "imu_1")
+        self.assertEqual(result.processed_data_id, data.id)
+        self.assertTrue(result.results["anomalies"]["accel_x"]["is_anomaly"])
+        self.assertFalse(result.results["anomalies"]["accel_z"]["is_anomaly"])
+
+    def test_analyze_batch_matches_streaming(self):
+        """Batch analysis gives the same statistics as streaming analysis on full windows"""
+        rng = np.random.default_rng(4)
+        rows = rng.normal(0.0, 1.0, (60, 3))
+        rows[45, 0] = 25.0
+        samples = [self._sample(*row.tolist()) for row in rows]
+
+        batch = self.detector.analyze_batch(samples)
+        self.assertEqual(batch["start_index"], 19)
+        self.assertEqual(batch["z_scores"].shape, (41, 3))
+
+        for i, sample in enumerate(samples):
+            result = self.detector.analyze(sample)
+            if i >= 19:
+                stream = result.results["anomalies"]["accel_x"]
+                self.assertAlmostEqual(batch["z_scores"][i - 19, 0], stream["z_score"], places=9)
+                self.assertEqual(bool(batch["is_anomaly"][i - 19, 0]), stream["is_anomaly"])
+
+        self.assertTrue(batch["is_anomaly"][45 - 19, 0])
+
+    def test_batch_kernel_matches_sliding_window(self):
+        """The (Numba-compilable) batch kernel matches the sliding_window_view path"""
+        rng = np.random.default_rng(5)
+        rows = rng.normal(2.0, 0.5, (50, 3))
+        detector = AnomalyDetector({**self.config, "use_numba": False})
+        batch = detector.analyze_batch(rows)
+        means, stds = _batch_window_stats(rows, 20)
+        np.testing.assert_allclose(means, batch["means"], rtol=1e-12)
+        np.testing.assert_allclose(stds, batch["stds"], rtol=1e-9)
+
+    def test_non_numeric_and_nan_values_are_skipped(self):
+        """Non-numeric and NaN values are left out without disturbing other fields"""
+        for i in range(12):
+            self.detector.analyze(self._sample(float(i % 3), float(i % 2)))
+        result = self.detector.analyze(self._sample("bad", float("nan"), "1.0"))
+        self.assertEqual(list(result.results["anomalies"]), ["accel_z"])
+        self.assertTrue(np.all(np.isfinite(self.detector.means)))
+
+    def test_analyze_batch_skips_invalid_values(self):
+        """Batch analysis skips missing and non-numeric values like analyze() does"""
+        rng = np.random.default_rng(6)
+        samples = [self._sample(*row.tolist()) for row in rng.normal(0.0, 1.0, (50, 3))]
+        samples[30]["accel_x"] = "abc"
+        for i in (25, 33, 40):
+            del samples[i]["accel_y"]
+
+        batch = self.detector.analyze_batch(samples)
+        self.assertFalse(batch["scored"][30 - 19, 0])
+        self.assertEqual(batch["z_scores"][30 - 19, 0], 0.0)
+        self.assertTrue(batch["scored"][30 - 19, 1])
+        self.assertTrue(np.all(np.isfinite(batch["z_scores"])))
+
+        for i, sample in enumerate(samples):
+            anomalies = self.detector.analyze(sample).results["anomalies"]
+            if i < 19:
+                continue
+            for j, field in enumerate(("accel_x", "accel_y", "accel_z")):
+                self.assertEqual(bool(batch["scored"][i - 19, j]), field in anomalies)
+                if field in anomalies:
+                    self.assertAlmostEqual(batch["z_scores"][i - 19, j], anomalies[field]["z_score"], places=9)
+
+    def test_constant_window_short_circuits(self):
+        """A constant window on every field yields an empty, zero-score result"""
+        for _ in range(25):
+            result = self.detector.analyze(self._sample(0.5, 0.0, 1.0))
+        self.assertEqual(result.anomaly_score, 0.0)
+        self.assertEqual(result.results["anomalies"], {})
+        self.assertIsNone(result.prediction)
+
+    def test_result_pool(self):
+        """With use_result_pool the previous result is recycled on the next call"""
+        detector = AnomalyDetector({**self.config, "use_result_pool": True})
+        for i in range(12):
+            first = detector.analyze(self._sample(float(i % 3)))
+        self.assertIn("accel_x", first.results["anomalies"])
+
+        second = detector.analyze(self._sample(1.0))
+        self.assertIs(second, first)
+        self.assertEqual(second.results["anomalies"]["accel_x"]["value"], 1.0)
+        self.assertIs(second.analysis_metadata, detector._metadata)
+        self.assertIsNot(self.detector.analyze(self._sample(1.0)), self.detector.analyze(self._sample(1.0)))
+
+    def test_reset(self):
+        """Reset clears the windows"""
+        for i in range(15):
+            self.detector.analyze(self._sample(float(i)))
+        self.detector.reset()
+        result = self.detector.analyze(self._sample(1.0))
+        self.assertEqual(result.results["anomalies"], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
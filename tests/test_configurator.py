@@ -5,13 +5,14 @@
 import unittest
 import sys
 import os
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, patch, call
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.plugins.configurators.base_configurator import BaseConfigurator
 from src.plugins.configurators.witmotion_configurator import WitMotionConfigurator
+from src.plugins.configurators.mpu6050_configurator import MPU6050Configurator, _coalesce_plan
 
 
 # Simple configurator implementation for testing
@@ -185,6 +186,62 @@ class TestWitMotionConfigurator(unittest.TestCase):
         for expected, actual in zip(expected_calls, actual_calls):
             self.assertEqual(expected, actual)
     
+    def test_injected_connection_is_reused(self):
+        """An injected connection is used as is and never opened or closed"""
+        connection = MagicMock()
+        self.configurator.set_connection(connection)
+        
+        self.assertTrue(self.configurator.configure())
+        self.assertTrue(self.configurator.reset())
+        
+        self.mock_serial.assert_not_called()
+        connection.close.assert_not_called()
+        self.assertEqual(connection.write.call_count, 3)
+    
+    def test_status_follows_attributes(self):
+        """get_status reflects state changes and returns an independent copy"""
+        self.configurator.set_error("boom")
+        status = self.configurator.get_status()
+        self.assertEqual(status, {"is_configured": False, "error_state": True, "error_message": "boom"})
+        
+        status["error_state"] = False
+        self.configurator.clear_error()
+        self.configurator.is_configured = True
+        self.assertEqual(self.configurator.get_status(),
+                         {"is_configured": True, "error_state": False, "error_message": None})
+    
+    def test_configure_batch_init(self):
+        """Test configure with the init sequence sent in one write"""
+        configurator = WitMotionConfigurator({**self.config, "batch_init": True, "inter_command_delay_ms": 0})
+        
+        result = configurator.configure()
+        
+        self.assertTrue(result)
+        self.mock_serial_instance.write.assert_called_once_with(bytes.fromhex("FF AA 69 FF AA 02 01"))
+    
+    @patch('time.sleep')
+    def test_configure_grouped_init(self, mock_sleep):
+        """Test configure with grouped commands: one write and one delay per group"""
+        configurator = WitMotionConfigurator({**self.config,
+                                              "init_sequence": [["FF AA 69", "FF AA 02 01"], "FF AA 00"]})
+        
+        self.assertTrue(configurator.configure())
+        
+        self.assertEqual(self.mock_serial_instance.write.call_args_list,
+                         [call(bytes.fromhex("FF AA 69 FF AA 02 01")), call(bytes.fromhex("FF AA 00"))])
+        self.assertEqual(self.mock_serial_instance.flush.call_count, 2)
+        self.assertEqual(mock_sleep.call_count, 2)
+    
+    def test_invalid_init_sequence(self):
+        """A bad hex string is reported at construction and configure() fails"""
+        configurator = WitMotionConfigurator({**self.config, "init_sequence": ["FF AA ZZ"]})
+        self.assertTrue(configurator.error_state)
+        
+        self.assertFalse(configurator.configure())
+        self.assertIn("init_sequence", configurator.error_message)
+        self.assertFalse(configurator.is_configured)
+        self.mock_serial.assert_not_called()
+    
     def test_reset(self):
         """Test reset method"""
         # Reset sensor
@@ -242,5 +299,94 @@ class TestWitMotionConfigurator(unittest.TestCase):
         self.assertIn("Test error", self.configurator.error_message)
 
 
+class TestMPU6050Configurator(unittest.TestCase):
+    """Tests for the MPU6050Configurator class"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.config = {
+            "interface": "i2c",
+            "gyro_range": 1,
+            "accel_range": 2,
+            "sample_rate": 7
+        }
+        self.configurator = MPU6050Configurator(self.config)
+        
+        # Mock the smbus module used for I2C
+        self.mock_smbus = MagicMock()
+        self.mock_bus = self.mock_smbus.SMBus.return_value
+        self.smbus_patcher = patch.dict(sys.modules, {'smbus': self.mock_smbus})
+        self.smbus_patcher.start()
+        self.sleep_patcher = patch('time.sleep')
+        self.sleep_patcher.start()
+    
+    def tearDown(self):
+        """Tear down test fixtures"""
+        self.sleep_patcher.stop()
+        self.smbus_patcher.stop()
+    
+    def test_configure_i2c_uses_burst_writes(self):
+        """Adjacent registers are written with one block transfer"""
+        result = self.configurator.configure()
+        
+        self.assertTrue(result)
+        self.assertTrue(self.configurator.is_configured)
+        self.assertEqual(self.mock_bus.write_byte_data.call_args_list, [
+            ((0x68, 0x6B, 0x80),),
+            ((0x68, 0x6B, 0x00),)
+        ])
+        self.mock_bus.write_i2c_block_data.assert_called_once_with(0x68, 0x19, [7, 0x03, 1 << 3, 2 << 3])
+    
+    def test_session_opens_interface_once(self):
+        """reset() and configure() inside a session share one open interface"""
+        with self.configurator.session():
+            self.assertTrue(self.configurator.reset())
+            self.assertTrue(self.configurator.configure())
+            self.assertIsNotNone(self.configurator.i2c_bus)
+        
+        self.mock_smbus.SMBus.assert_called_once_with(1)
+        self.assertIsNone(self.configurator.i2c_bus)
+        self.assertTrue(self.configurator.is_configured)
+    
+    def test_config_plan(self):
+        """The plan follows the configuration and coalesces contiguous registers"""
+        plan = self.configurator._config_plan()
+        self.assertEqual(plan[4:], [(0x19, 7), (0x1A, 0x03), (0x1B, 1 << 3), (0x1C, 2 << 3)])
+        self.assertEqual(_coalesce_plan(plan), [
+            ("write", 0x6B, [0x80]),
+            ("sleep", 0.1),
+            ("write", 0x6B, [0x00]),
+            ("sleep", 0.01),
+            ("write", 0x19, [7, 0x03, 1 << 3, 2 << 3])
+        ])
+        self.assertEqual(_coalesce_plan([(0x1B, 1), (0x1A, 2)]), [("write", 0x1B, [1]), ("write", 0x1A, [2])])
+    
+    @patch('serial.Serial')
+    def test_configure_serial_batches_registers(self, mock_serial):
+        """Over serial the configuration registers go out in one frame"""
+        configurator = MPU6050Configurator({**self.config, "interface": "serial", "address": "COM4"})
+        
+        self.assertTrue(configurator.configure())
+        
+        writes = mock_serial.return_value.write.call_args_list
+        self.assertEqual(writes, [
+            ((bytes([0x6B, 0x80]),),),
+            ((bytes([0x6B, 0x00]),),),
+            ((bytes([0x19, 7, 0x1A, 0x03, 0x1B, 1 << 3, 0x1C, 2 << 3]),),)
+        ])
+    
+    @patch('serial.Serial')
+    def test_injected_serial_connection(self, mock_serial):
+        """A serial connection passed in the config is not opened or closed"""
+        connection = MagicMock()
+        configurator = MPU6050Configurator({**self.config, "interface": "serial", "connection": connection})
+        
+        self.assertTrue(configurator.configure())
+        
+        mock_serial.assert_not_called()
+        connection.close.assert_not_called()
+        self.assertEqual(connection.write.call_count, 3)
+
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
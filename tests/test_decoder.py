@@ -0,0 +1,439 @@
+# File: tests/test_decoder.py
+# Purpose: Unit tests for the Decoder classes
+
+import unittest
+import sys
+import os
+import struct
+import numpy as np
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.plugins.decoders.base_decoder import BaseDecoder
+from src.plugins.decoders.witmotion_decoder import WitMotionDecoder
+from src.plugins.decoders.custom_decoder import CustomDecoder, _struct_to_dtype
+from src.plugins.decoders import csv_batch
+
+
+# Simple decoder implementation for testing
+class SimpleDecoder(BaseDecoder):
+    """Simple decoder for testing"""
+
+    def _decode_impl(self, data):
+        """Decode data"""
+        return {"decoded": data} if data else None
+
+
+def witmotion_packet(frame_marker, x, y, z):
+    """Build a WitMotion packet with a valid checksum"""
+    packet = bytes([0x55, frame_marker]) + struct.pack('<hhhh', x, y, z, 0)
+    return packet + bytes([sum(packet) & 0xFF])
+
+
+class TestBaseDecoder(unittest.TestCase):
+    """Tests for the BaseDecoder class"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.decoder = SimpleDecoder({"max_error_log": 2})
+
+    def test_decode_updates_statistics(self):
+        """decode() counts packets and bytes for every input type"""
+        self.assertEqual(self.decoder.decode(b"abc"), {"decoded": b"abc"})
+        self.decoder.decode("xé")
+        self.decoder.decode(b"")
+
+        status = self.decoder.get_status()
+        self.assertEqual(status["packets_received"], 3)
+        self.assertEqual(status["bytes_received"], 6)
+        self.assertEqual(status["packets_decoded"], 2)
+        self.assertIsNotNone(status["last_decode_time"])
+
+    def test_error_log_is_bounded(self):
+        """Only the most recent max_error_log errors are kept"""
+        for i in range(3):
+            self.decoder.set_error(f"error {i}")
+        self.assertEqual(self.decoder.get_status()["errors"], ["error 1", "error 2"])
+
+        self.decoder.clear_errors()
+        self.assertEqual(self.decoder.get_status()["errors"], [])
+
+    def test_status_rebuilt_only_on_change(self):
+        """get_status rebuilds its cache on change and returns copies callers may modify"""
+        status = self.decoder.get_status()
+        cached = self.decoder._status_cache
+        status["packets_decoded"] = 99
+        status["errors"].append("local")
+        self.assertEqual(self.decoder.get_status(), {**status, "packets_decoded": 0, "errors": []})
+        self.assertIs(self.decoder._status_cache, cached)
+
+        self.decoder.decode(b"abc")
+        self.assertEqual(self.decoder.get_status()["packets_decoded"], 1)
+        self.assertIsNot(self.decoder._status_cache, cached)
+
+        self.decoder.destroy()
+        self.assertFalse(self.decoder.get_status()["is_initialized"])
+
+    def test_logger_cached_per_class(self):
+        """Instances share the logger cached on their class"""
+        self.assertIs(self.decoder.logger, SimpleDecoder({}).logger)
+        self.assertEqual(self.decoder.logger.name, "SimpleDecoder")
+
+    def test_receive_buffer_compaction(self):
+        """The pre-sized buffer is compacted, then grown, only when new data does not fit"""
+        self.decoder._feed(b"")
+        size = len(self.decoder._rx_buf)
+        self.decoder._feed(b"x" * (size - 2))
+        self.decoder._consume(size - 4)
+        self.decoder._feed(b"abcd")
+        self.assertEqual((self.decoder._rx_pos, len(self.decoder._rx_buf)), (0, size))
+        with self.decoder._peek(0, 6) as view:
+            self.assertEqual(bytes(view), b"xxabcd")
+
+        self.decoder._feed(bytes(size))
+        self.assertEqual(len(self.decoder._rx_buf), 2 * size)
+        self.assertEqual(self.decoder._rx_available(), size + 6)
+        self.decoder._consume(size + 6)
+        self.assertEqual((self.decoder._rx_pos, self.decoder._rx_len), (0, 0))
+        self.assertEqual(len(self.decoder._rx_buf), 2 * size)
+
+    def test_receive_buffer_pool(self):
+        """The receive buffer is taken from the pool on first feed and returned on destroy"""
+        decoder = SimpleDecoder()
+        self.assertEqual(len(decoder._rx_buf), 0)
+        decoder._feed(b"abc")
+        buf = decoder._rx_buf
+        decoder.destroy()
+        self.assertIsNot(decoder._rx_buf, buf)
+        other = SimpleDecoder()
+        other._feed(b"d")
+        self.assertIs(other._rx_buf, buf)
+        self.assertEqual(other._rx_available(), 1)
+
+    def test_decoder_overriding_decode(self):
+        """Decoders written against the older API, overriding decode(), still work"""
+        class LegacyDecoder(BaseDecoder):
+            def decode(self, data):
+                super().decode(data)
+                return data.upper()
+
+        decoder = LegacyDecoder()
+        self.assertEqual(decoder.decode("abc"), "ABC")
+        self.assertEqual((decoder.packets_received, decoder.bytes_received), (1, 3))
+        with self.assertRaises(TypeError):
+            type("NoDecoder", (BaseDecoder,), {})()
+
+    def test_init_resets_statistics(self):
+        """init() resets the counters"""
+        self.decoder.decode(b"abc")
+        self.decoder.init({})
+        self.assertEqual(self.decoder.packets_received, 0)
+        self.assertEqual(self.decoder.bytes_received, 0)
+
+
+class TestWitMotionDecoder(unittest.TestCase):
+    """Tests for the WitMotionDecoder class"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.decoder = WitMotionDecoder({"acc_range": 16.0})
+
+    def test_decode_acceleration(self):
+        """An acceleration packet is scaled to g"""
+        result = self.decoder.decode(witmotion_packet(0x51, 16384, -16384, 2048))
+        self.assertAlmostEqual(result.accel_x, 8.0)
+        self.assertAlmostEqual(result.accel_y, -8.0)
+        self.assertAlmostEqual(result.accel_z, 1.0)
+        self.assertEqual(self.decoder.packets_decoded, 1)
+
+    def test_packet_split_across_reads(self):
+        """A packet split across two reads is decoded once complete"""
+        packet = witmotion_packet(0x53, 8192, 0, -8192)
+        self.assertIsNone(self.decoder.decode(b"\x00" + packet[:5]))
+        result = self.decoder.decode(packet[5:])
+        self.assertAlmostEqual(result.roll, 45.0)
+        self.assertAlmostEqual(result.yaw, -45.0)
+
+    def test_garbage_and_queued_packets(self):
+        """Leading garbage is skipped and queued packets are decoded one per call"""
+        stream = b"\x01\x02" + witmotion_packet(0x51, 2048, 0, 0) + witmotion_packet(0x52, 0, 16384, 0)
+        self.assertAlmostEqual(self.decoder.decode(stream).accel_x, 1.0)
+        self.assertAlmostEqual(self.decoder.decode(b"").gyro_y, 1000.0)
+        self.assertEqual(self.decoder._rx_available(), 0)
+
+    def test_bad_checksum_is_skipped(self):
+        """A packet with a bad checksum is dropped"""
+        packet = bytearray(witmotion_packet(0x52, 100, 200, 300))
+        packet[-1] ^= 0xFF
+        self.assertIsNone(self.decoder.decode(bytes(packet)))
+        self.assertEqual(self.decoder.packets_decoded, 0)
+
+
+class TestCustomDecoder(unittest.TestCase):
+    """Tests for the CustomDecoder class"""
+
+    def test_dedup_cache_reuses_parse(self):
+        """A repeated JSON line is parsed once when enable_dedup_cache is set"""
+        decoder = CustomDecoder({"format": "json", "enable_dedup_cache": True,
+                                 "field_mapping": {"ax": "accel_x"}})
+        calls = []
+
+        def parse(data):
+            calls.append(data)
+            return {"ax": 1.5}
+
+        line = '{"ax": 1.5}'
+        self.assertIs(decoder._cached_parse(line, parse), decoder._cached_parse(line, parse))
+        self.assertEqual(len(calls), 1)
+
+        first = decoder.decode(line)
+        second = decoder.decode(line)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.accel_x, 1.5)
+
+    def test_decode_batch_csv(self):
+        """A CSV chunk yields one result per line; a partial line waits for the next chunk"""
+        decoder = CustomDecoder({"format": "csv"})
+        with patch("src.plugins.decoders.csv_batch.PANDAS_AVAILABLE", False):
+            results = decoder.decode_batch("timestamp,accel_x,roll\n1.0,0.5,bad\n2.0,-0.5,")
+            self.assertEqual(len(results), 1)
+            self.assertEqual(results[0].timestamp, 1.0)
+            self.assertEqual(results[0].accel_x, 0.5)
+            self.assertEqual(results[0].additional_values, {"roll": "bad"})
+
+            results = decoder.decode_batch(b"3\n3.0,1.5,4\n")
+        self.assertEqual([r.accel_x for r in results], [-0.5, 1.5])
+        self.assertEqual(results[0].roll, 3.0)
+        self.assertEqual(decoder.packets_decoded, 3)
+
+    def test_decode_batch_numeric_parser(self):
+        """The numpy parser and the Python parser give the same values"""
+        chunk = "timestamp,accel_x,gyro_z\n1.0, 0.5,2\n2.0,-1.5,4\n"
+        with patch("src.plugins.decoders.csv_batch.PANDAS_AVAILABLE", False):
+            fast = CustomDecoder({"format": "csv"}).decode_batch(chunk)
+            with patch("src.plugins.decoders.csv_batch.np.loadtxt", side_effect=ValueError):
+                slow = CustomDecoder({"format": "csv"}).decode_batch(chunk)
+        self.assertEqual([(r.accel_x, r.gyro_z) for r in fast], [(0.5, 2.0), (-1.5, 4.0)])
+        self.assertEqual([r.to_dict()["acceleration"] for r in fast], [r.to_dict()["acceleration"] for r in slow])
+
+    def test_decode_columns(self):
+        """decode_columns returns one array per mapped field"""
+        decoder = CustomDecoder({"format": "csv"})
+        with patch("src.plugins.decoders.csv_batch.PANDAS_AVAILABLE", False):
+            batch = decoder.decode_columns("timestamp,accel_x,yaw\n1.0,0.5,a\n2.0,1.5,b\n")
+        self.assertEqual(len(batch), 2)
+        self.assertEqual(batch.timestamps.tolist(), [1.0, 2.0])
+        self.assertEqual(batch.values["accel_x"].dtype, np.float64)
+        self.assertEqual(batch.values["yaw"].tolist(), ["a", "b"])
+        self.assertEqual([r.accel_x for r in batch.to_processed_data()], [0.5, 1.5])
+        self.assertIsNone(decoder.decode_columns("3.0,2.5"))
+
+    def test_decode_batch_plan_reused(self):
+        """Headerless batches read mapped columns by index with a cached plan"""
+        decoder = CustomDecoder({"format": "csv", "has_header": False,
+                                 "field_mapping": {"field2": "yaw", "field0": "timestamp"}})
+        with patch("src.plugins.decoders.csv_batch.PANDAS_AVAILABLE", False):
+            results = decoder.decode_batch("5,x,1.5,y,z\n6,x,2.5\n")
+            plan = decoder._csv_plan
+            more = decoder.decode_batch("7,x,3.5,y,z\n")
+        self.assertEqual(plan, [(2, "yaw"), (0, "timestamp")])
+        self.assertIs(decoder._csv_plan, plan)
+        self.assertEqual([(r.timestamp, r.yaw) for r in results + more], [(5.0, 1.5), (6.0, 2.5), (7.0, 3.5)])
+
+    def test_decode_csv_row(self):
+        """A header + row message is split directly and the header is reused"""
+        decoder = CustomDecoder({"format": "csv"})
+        result = decoder.decode("timestamp,accel_x,yaw\r\n1.0,0.25,x\r\n")
+        self.assertEqual((result.timestamp, result.accel_x), (1.0, 0.25))
+        self.assertEqual(result.additional_values, {"yaw": "x"})
+        header = decoder._row_header
+        self.assertEqual(decoder.decode(b"timestamp,accel_x,yaw\n2.0,0.5,1").yaw, 1.0)
+        self.assertIs(decoder._row_header, header)
+        self.assertIsNone(decoder.decode("timestamp,accel_x\n"))
+
+        headerless = CustomDecoder({"format": "csv", "has_header": False, "field_mapping": {"field1": "roll"}})
+        self.assertEqual(headerless.decode("0,12.5,3").roll, 12.5)
+
+    def test_decode_csv_row_bytes(self):
+        """Bytes rows are split without decoding the payload; only mapped fields are kept"""
+        decoder = CustomDecoder({"format": "csv", "delimiter": ";",
+                                 "field_mapping": {"t": "timestamp", "ax": "accel_x"}})
+        row = decoder._parse_csv_row(b"t;extra;ax\r\n1.5;skip;-2\r\n")
+        self.assertEqual(row, {"t": "1.5", "ax": "-2"})
+        fields = decoder._row_fields
+        self.assertEqual(decoder.decode(b"t;extra;ax\n3;x").timestamp, 3.0)
+        self.assertIs(decoder._row_fields, fields)
+
+    def test_format_dispatch(self):
+        """The decode method is bound per format, and auto detection rebinds it once"""
+        decoder = CustomDecoder({"format": "json"})
+        self.assertEqual(decoder._decode_format, decoder._decode_json)
+        decoder.init({"format": "xml"})
+        self.assertIsNone(decoder.decode("<a/>"))
+        self.assertIn("Unsupported format: xml", decoder.get_status()["errors"][-1])
+
+        decoder = CustomDecoder({"field_mapping": {"t": "timestamp"}})
+        self.assertEqual(decoder.decode({"t": 4.0}).timestamp, 4.0)
+        self.assertEqual((decoder.format, decoder._decode_format), ("json", decoder._decode_json))
+        decoder.init({"field_mapping": {"t": "timestamp"}})
+        self.assertEqual(decoder._decode_format, decoder._decode_auto)
+        self.assertEqual(decoder.decode("t,x\n2.0,1").timestamp, 2.0)
+        self.assertEqual(decoder.format, "csv")
+
+    def test_reuse_result(self):
+        """With reuse_result one ProcessedData object is reset and filled on every decode"""
+        decoder = CustomDecoder({"format": "json", "reuse_result": True,
+                                 "field_mapping": {"ax": "accel_x", "tag": "tag", "x": "extra"}})
+        first = decoder.decode(b'{"ax": 1.0, "tag": "a", "x": 2}')
+        self.assertEqual((first.accel_x, first.additional_values, first.extra), (1.0, {"tag": "a"}, 2))
+        second = decoder.decode(b'{"ax": 3.0}')
+        self.assertIs(second, first)
+        self.assertEqual((second.accel_x, second.additional_values), (3.0, {}))
+        self.assertFalse(hasattr(second, "extra"))
+        self.assertIsNot(CustomDecoder({"format": "json"}).decode(b"{}"), second)
+
+    def test_quoted_fields(self):
+        """Lines with quotes are split like csv.reader, without any option"""
+        decoder = CustomDecoder({"format": "csv", "delimiter": ";"})
+        self.assertEqual(decoder._split_csv_line('1;"a;b";"say ""hi""";;2'),
+                         ["1", "a;b", 'say "hi"', "", "2"])
+        for data in ('timestamp;"accel_x";yaw\n1.5;"2.5";"a;b"', b'timestamp;accel_x;yaw\n1.5;2.5;"a;b"'):
+            result = decoder.decode(data)
+            self.assertEqual((result.timestamp, result.accel_x), (1.5, 2.5))
+            self.assertEqual(result.additional_values, {"yaw": "a;b"})
+
+        with patch("src.plugins.decoders.csv_batch.PANDAS_AVAILABLE", False):
+            results = decoder.decode_batch(b'timestamp;yaw\n1;"a;b"\n2;c\n')
+        self.assertEqual([r.additional_values["yaw"] for r in results], ["a;b", "c"])
+
+    def test_python_parser_converts_columns(self):
+        """The Python CSV parser converts numeric columns to float arrays in one pass"""
+        decoder = CustomDecoder({"format": "csv", "quoted_fields": True})
+        plan = [(0, "timestamp"), (1, "accel_x"), (2, "mode")]
+        with patch("src.plugins.decoders.csv_batch.PANDAS_AVAILABLE", False):
+            columns = decoder._parse_csv_columns(['1,"0.5",run', '2, 1.5,"st,op"'], plan)
+        self.assertEqual(columns[0].dtype, np.float64)
+        self.assertEqual(columns[1].tolist(), [0.5, 1.5])
+        self.assertEqual(columns[2], ["run", "st,op"])
+
+        results = csv_batch.build_results(plan, columns, 2)
+        self.assertEqual([r.accel_x for r in results], [0.5, 1.5])
+        self.assertEqual(results[1].additional_values, {"mode": "st,op"})
+
+    def test_datetime_timestamps(self):
+        """ISO timestamp columns are parsed per chunk; unparsable rows get the current time"""
+        decoder = CustomDecoder({"format": "csv"})
+        chunk = b"timestamp,accel_x\n1970-01-01T00:00:01.5,1\nbad,2\n1970-01-02 00:00:00,3\n"
+        with patch("src.plugins.decoders.csv_batch.PANDAS_AVAILABLE", False):
+            batch = decoder.decode_columns(chunk)
+            self.assertEqual(batch.timestamps[[0, 2]].tolist(), [1.5, 86400.0])
+            self.assertGreater(batch.timestamps[1], 1e9)
+
+            decoder._reset_csv_stream()
+            results = decoder.decode_batch(chunk)
+        self.assertEqual([results[0].timestamp, results[2].timestamp], [1.5, 86400.0])
+        self.assertGreater(results[1].timestamp, 1e9)
+
+    def test_numeric_timestamps_with_blank_cell(self):
+        """A blank timestamp cell does not send the numeric cells through the date parser"""
+        decoder = CustomDecoder({"format": "csv"})
+        chunk = "timestamp,accel_x\n1.0,0.5\n,0.6\n3.0,0.7\n"
+        with patch("src.plugins.decoders.csv_batch.PANDAS_AVAILABLE", False):
+            results = decoder.decode_batch(chunk)
+            decoder._reset_csv_stream()
+            batch = decoder.decode_columns(chunk)
+        self.assertEqual([results[0].timestamp, results[2].timestamp], [1.0, 3.0])
+        self.assertGreater(results[1].timestamp, 1e9)
+        self.assertEqual(batch.timestamps[[0, 2]].tolist(), [1.0, 3.0])
+        self.assertGreater(batch.timestamps[1], 1e9)
+
+    def test_binary_batch(self):
+        """With binary_batch every complete record is decoded in one call"""
+        decoder = CustomDecoder({"format": "binary", "binary_format": "<10f", "binary_batch": True})
+        records = b"".join(struct.pack("<10f", *range(i, i + 10)) for i in range(3))
+        results = decoder.decode(records + records[:5])
+        self.assertEqual([r.roll for r in results], [1.0, 2.0, 3.0])
+        self.assertEqual(decoder.packets_decoded, 3)
+        self.assertEqual(decoder._rx_available(), 5)
+
+    def test_decode_all(self):
+        """decode_all returns every record of a chunk as a list"""
+        decoder = CustomDecoder({"format": "binary", "binary_format": "<5f"})
+        records = b"".join(struct.pack("<5f", i, i, 0, 0, 0) for i in range(3))
+        self.assertEqual([r.roll for r in decoder.decode_all(records + b"\x00")], [0.0, 1.0, 2.0])
+        self.assertEqual(decoder.packets_decoded, 3)
+        self.assertEqual(decoder.decode_all(b""), [])
+
+        csv_decoder = CustomDecoder({"format": "csv"})
+        self.assertEqual([r.accel_x for r in csv_decoder.decode_all("accel_x\n1\n2\n")], [1.0, 2.0])
+        self.assertEqual(len(CustomDecoder({"format": "json"}).decode_all("{}")), 1)
+        self.assertEqual(SimpleDecoder().decode_all(b""), [])
+
+    def test_decode_all_csv_is_stateless(self):
+        """CSV decode_all decodes a last line without newline and reads the header on every call"""
+        decoder = CustomDecoder({"format": "csv"})
+        result, = decoder.decode_all("timestamp,accel_x\n1.0,0.5")
+        self.assertEqual((result.timestamp, result.accel_x), (1.0, 0.5))
+
+        result, = decoder.decode_all(b"timestamp,accel_x\n2.0,0.75\n")
+        self.assertEqual((result.timestamp, result.accel_x), (2.0, 0.75))
+        self.assertEqual(result.additional_values, {})
+        self.assertEqual(decoder._rx_available(), 0)
+
+    def test_decode_binary_columns(self):
+        """Binary records are read with numpy, matching struct for aligned formats too"""
+        decoder = CustomDecoder({"format": "binary", "binary_format": "<d9f"})
+        records = b"".join(struct.pack("<d9f", 100.0 + i, *range(9)) for i in range(4))
+        batch = decoder.decode_binary_columns(records + records[:3])
+        self.assertEqual(batch.timestamps.tolist(), [100.0, 101.0, 102.0, 103.0])
+        self.assertEqual(batch.values["gyro_z"].tolist(), [8.0] * 4)
+        self.assertEqual(decoder._rx_available(), 3)
+
+        for binary_format in ("@bhd", ">Hx2i", "=?q"):
+            data = bytes(range(1, struct.calcsize(binary_format) + 1))
+            record = np.frombuffer(data, dtype=_struct_to_dtype(binary_format))[0]
+            self.assertEqual(tuple(record.tolist()), struct.unpack(binary_format, data))
+        self.assertIsNone(_struct_to_dtype("<f4s"))
+
+    def test_invalid_binary_format(self):
+        """A bad binary_format is reported, not raised, and only matters for the binary format"""
+        decoder = CustomDecoder({"format": "json", "binary_format": "<zz"})
+        self.assertEqual(decoder.get_status()["errors"], [])
+        self.assertFalse(decoder.init({"format": "binary", "binary_format": "<zz"}))
+        self.assertIsNone(decoder.decode(b"\x00" * 8))
+        self.assertEqual(decoder.decode_all(b"\x00" * 8), [])
+        self.assertIn("binary_format", decoder.get_status()["errors"][-1])
+        self.assertTrue(decoder.init({"format": "binary", "binary_format": "<2f"}))
+
+    def test_nested_json_mapping(self):
+        """Nested mappings are flattened once and applied to each JSON message"""
+        decoder = CustomDecoder({"format": "json", "field_mapping": {
+            "t": "timestamp", "imu": {"acc": {"x": "accel_x"}, "mode": "mode"}}})
+        self.assertEqual(decoder._mapping_plan, [(("t",), "timestamp"), (("imu", "acc", "x"), "accel_x"),
+                                                 (("imu", "mode"), "mode")])
+        result = decoder.decode(b'{"t": 5, "imu": {"acc": {"x": "1.5"}, "mode": "run"}}')
+        self.assertEqual(result.timestamp, 5)
+        self.assertEqual(result.accel_x, 1.5)
+        self.assertEqual(result.additional_values["mode"], "run")
+        self.assertIsNotNone(decoder.decode(b'{"imu": 3}'))
+
+    def test_invalid_json(self):
+        """Invalid JSON sets the error state with either JSON backend"""
+        decoder = CustomDecoder({"format": "json"})
+        self.assertIsNone(decoder.decode(b'{"t": '))
+        self.assertIn("Invalid JSON", decoder.get_status()["errors"][-1])
+        self.assertEqual(decoder.decode(bytearray(b'{"timestamp": 2.0}')).timestamp, 2.0)
+
+    def test_dedup_cache_disabled_by_default(self):
+        """Without enable_dedup_cache every input is parsed"""
+        decoder = CustomDecoder({"format": "json"})
+        calls = []
+        for _ in range(2):
+            decoder._cached_parse(b"{}", calls.append)
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
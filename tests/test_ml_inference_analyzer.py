@@ -0,0 +1,180 @@
+# File: tests/test_ml_inference_analyzer.py
+# Purpose: Unit tests for the MLInferenceAnalyzer analyzer
+
+import unittest
+import sys
+import os
+import pickle
+import tempfile
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.plugins.analyzers.ml_inference_analyzer import MLInferenceAnalyzer
+
+
+class ThresholdClassifier:
+    """Classifier stub: class 1 when the first feature is positive"""
+
+    classes_ = np.array(["still", "moving"])
+
+    def __init__(self):
+        self.calls = []
+
+    def predict_proba(self, features):
+        self.calls.append(np.array(features))
+        moving = (features[:, 0] > 0).astype(np.float64) * 0.8 + 0.1
+        return np.column_stack((1.0 - moving, moving))
+
+
+class SumRegressor:
+    """Regressor stub: sum of the features of each sample"""
+
+    def __init__(self):
+        self.rows = []
+
+    def predict(self, features):
+        self.rows.append(len(features))
+        return features.sum(axis=1)
+
+
+class Int8Regressor(SumRegressor):
+    """Regressor stub with an int8 entry point"""
+
+    def predict_int8(self, features):
+        self.quantized = features
+        return features.sum(axis=1).astype(np.float64)
+
+
+class TestMLInferenceAnalyzer(unittest.TestCase):
+    """Tests for the MLInferenceAnalyzer class"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.config = {
+            "input_fields": ["accel_x", "accel_y"],
+            "batch_size": 3
+        }
+        self.analyzer = MLInferenceAnalyzer(self.config)
+        self.analyzer._bind_model(ThresholdClassifier())
+
+    def _sample(self, x, y=0.0):
+        """Build a processed data dictionary"""
+        return {"id": "proc_1", "sensor_id": "imu_1", "accel_x": x, "accel_y": y}
+
+    def test_waits_for_full_batch(self):
+        """No inference runs until batch_size samples are buffered"""
+        result = self.analyzer.analyze(self._sample(1.0))
+        self.assertEqual(result.results["status"], "waiting_for_batch")
+        self.assertEqual(result.results["batch_progress"], "1/3")
+        self.assertEqual(self.analyzer.model.calls, [])
+
+    def test_classification(self):
+        """The prediction and confidence come from the latest sample"""
+        for x in (-1.0, -1.0, 2.0):
+            result = self.analyzer.analyze(self._sample(x))
+        self.assertEqual(result.prediction, "moving")
+        self.assertAlmostEqual(result.confidence, 0.9)
+        self.assertTrue(result.results["above_threshold"])
+        self.assertNotIn("probabilities", result.results)
+
+    def test_include_probabilities(self):
+        """Per-class probabilities are only reported when requested"""
+        self.analyzer.update_config({"include_probabilities": True})
+        for x in (1.0, 1.0, -1.0):
+            result = self.analyzer.analyze(self._sample(x))
+        self.assertEqual(result.prediction, "still")
+        self.assertEqual(set(result.results["probabilities"]), {"0", "1"})
+        self.assertAlmostEqual(result.results["probabilities"]["0"], 0.9)
+
+    def test_output_labels_without_classes(self):
+        """output_labels name the classes when the model has no classes_"""
+        model = ThresholdClassifier()
+        model.classes_ = None
+        self.analyzer.update_config({"output_labels": [0, "moving"]})
+        self.analyzer._bind_model(model)
+        for x in (1.0, 1.0, -1.0):
+            result = self.analyzer.analyze(self._sample(x))
+        self.assertEqual(result.prediction, "0")
+
+    def test_extract_features(self):
+        """Missing and invalid fields become 0, numeric strings are converted"""
+        batch = [self._sample(1.5, "2.5"), {"accel_x": "bad"}, self._sample(True, None)]
+        features = self.analyzer._extract_features(batch)
+        self.assertEqual(features.dtype, np.float32)
+        self.assertTrue(features.flags["C_CONTIGUOUS"])
+        np.testing.assert_array_equal(features, [[1.5, 2.5], [0.0, 0.0], [1.0, 0.0]])
+
+    def test_extract_features_trusted_numeric(self):
+        """Trusted numeric inputs give the same features without per-value checks"""
+        self.analyzer.update_config({"trusted_numeric_inputs": True})
+        features = self.analyzer._extract_features([self._sample(1.5, 2), {"accel_y": -1.0}])
+        np.testing.assert_array_equal(features[:2], [[1.5, 2.0], [0.0, -1.0]])
+
+    def test_feature_buffer_resized_on_config_change(self):
+        """The feature buffer follows batch_size and input_fields"""
+        self.assertEqual(self.analyzer._feat_buf.shape, (3, 2))
+        self.analyzer.update_config({"batch_size": 2, "input_fields": ["accel_x", "accel_y", "accel_z"]})
+        self.assertEqual(self.analyzer._feat_buf.shape, (2, 3))
+
+    def test_batch_uses_latest_samples(self):
+        """Only the latest batch_size samples reach the model, also after a resize"""
+        for x in (1.0, 2.0, 3.0, 4.0):
+            self.analyzer.analyze(self._sample(x))
+        np.testing.assert_array_equal(self.analyzer.model.calls[-1][:, 0], [2.0, 3.0, 4.0])
+
+        self.analyzer.update_config({"batch_size": 2})
+        self.analyzer.analyze(self._sample(5.0))
+        np.testing.assert_array_equal(self.analyzer.model.calls[-1][:, 0], [4.0, 5.0])
+
+    def test_metadata_follows_config(self):
+        """Metadata is shared between results and rebuilt on config change"""
+        for _ in range(3):
+            first = self.analyzer.analyze(self._sample(1.0))
+        self.assertIs(first.analysis_metadata, self.analyzer.analyze(self._sample(1.0)).analysis_metadata)
+        self.analyzer.update_config({"mode": "regression"})
+        self.assertEqual(first.analysis_metadata["mode"], "classification")
+        self.assertEqual(self.analyzer._metadata["mode"], "regression")
+        self.assertEqual(self.analyzer._metadata["input_fields"], ["accel_x", "accel_y"])
+
+    def test_regression(self):
+        """Regression returns the value predicted for the latest sample"""
+        self.analyzer.update_config({"mode": "regression"})
+        self.analyzer._bind_model(SumRegressor())
+        for x in (1.0, 2.0, 3.0):
+            result = self.analyzer.analyze(self._sample(x, 0.5))
+        self.assertEqual(result.results["value"], 3.5)
+        self.assertEqual(self.analyzer.model.rows, [1])
+
+    def test_feature_dtype(self):
+        """feature_dtype selects the feature buffer precision"""
+        self.analyzer.update_config({"feature_dtype": "float64"})
+        self.assertEqual(self.analyzer._feat_buf.dtype, np.float64)
+
+    def test_int8_inference(self):
+        """Features are quantized when the model has predict_int8 and a scale is set"""
+        self.analyzer.update_config({"mode": "regression", "quant_scale": [0.5, 2.0], "quant_zero_point": 1})
+        self.analyzer._bind_model(Int8Regressor())
+        for x in (1.0, 2.0, 100.0):
+            result = self.analyzer.analyze(self._sample(x, 4.0))
+        np.testing.assert_array_equal(self.analyzer.model.quantized, [[127, 3]])
+        self.assertEqual(self.analyzer.model.quantized.dtype, np.int8)
+        self.assertEqual(result.results["value"], 130.0)
+        self.assertEqual(self.analyzer.model.rows, [])
+
+    def test_load_model_from_file(self):
+        """A pickled model is loaded and its capabilities are cached"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model_path = os.path.join(tmp_dir, "model.pkl")
+            with open(model_path, "wb") as f:
+                pickle.dump(ThresholdClassifier(), f)
+            analyzer = MLInferenceAnalyzer({**self.config, "model_path": model_path})
+
+        self.assertIsInstance(analyzer.model, ThresholdClassifier)
+        self.assertEqual(analyzer._class_labels, ["still", "moving"])
+        self.assertIsNotNone(analyzer._predict_proba)
+
+
+if __name__ == '__main__':
+    unittest.main()